@@ -1,9 +1,26 @@
 import ast
 import re
-from ast import AST, FunctionDef
-from dataclasses import dataclass
+import sys
+import time
+from abc import ABC, abstractmethod
+from ast import AST, AsyncFunctionDef, ClassDef, FunctionDef
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 
 from auto_docstring.docstring_errors import (
     DocstringError,
@@ -11,50 +28,100 @@ from auto_docstring.docstring_errors import (
     MissingArgumentError,
     MissingDocstringError,
 )
+from auto_docstring.positions import (
+    LineOffsetTable,
+    LineRanges,
+    SourcePositions,
+    SourceSpan,
+    overlaps_line_ranges,
+)
+from auto_docstring.stats import FileStats
+from auto_docstring.templates import DEFAULT_STYLE, get_renderer
+from auto_docstring.type_hints import normalize_type_expression, normalize_type_hint
+
+if TYPE_CHECKING:
+    from auto_docstring.symbols import ModuleScope
+
+AnyFunctionDef = Union[FunctionDef, AsyncFunctionDef]
+# Names of arguments with a wrong entry, few even in large projects
+DOCSTRING_ENTRY_CACHE_SIZE = 1 << 10
+# What comes before the name of a function
+FUNCTION_HEAD_PATTERN = re.compile(r"(?:async\s+)?def\s+")
 
 
-@dataclass
+class ArgumentKind(Enum):
+    POSITIONAL_ONLY = "positional_only"
+    POSITIONAL_OR_KEYWORD = "positional_or_keyword"
+    VAR_POSITIONAL = "var_positional"
+    KEYWORD_ONLY = "keyword_only"
+    VAR_KEYWORD = "var_keyword"
+
+
+@dataclass(frozen=True, slots=True)
 class FunctionArgument:
     name: str
     type_hint: Optional[str]
+    kind: ArgumentKind = ArgumentKind.POSITIONAL_OR_KEYWORD
+
+
+class FunctionLocation(ABC):
+    # Where an engine found a function, in whatever form was cheapest to keep. It is
+    # only turned into spans when an error needs one, since most functions have none
+    __slots__ = ()
 
+    @abstractmethod
+    def get_positions(self) -> LineOffsetTable:
+        ...
 
-@dataclass
+    @abstractmethod
+    def get_span(self) -> SourceSpan:
+        ...
+
+    @abstractmethod
+    def get_docstring_span(self) -> SourceSpan:
+        ...
+
+
+@dataclass(frozen=True, slots=True)
 class FunctionParts:
     name: str
     docstring: Optional[str]
     arguments: List[FunctionArgument]
     return_type_hint: Optional[str]
+    # Dotted path like `MyClass.method` or `outer.<locals>.inner`, defaults to `name`
+    qualname: str = ""
+    is_method: bool = False
+    # Only set when the source was at hand, engines keep it in different forms
+    location: Optional[FunctionLocation] = field(
+        default=None, compare=False, repr=False
+    )
 
+    def __post_init__(self):
+        if len(self.qualname) == 0:
+            object.__setattr__(self, "qualname", self.name)
 
-def parse_python_code(code: str) -> AST:
-    return ast.parse(code, type_comments=True)
+    @property
+    def span(self) -> Optional[SourceSpan]:
+        # From the `def` to the end of the name
+        return None if self.location is None else self.location.get_span()
+
+    @property
+    def docstring_span(self) -> Optional[SourceSpan]:
+        # The string literal, without any parentheses around it
+        if self.location is None or self.docstring is None:
+            return None
+        return self.location.get_docstring_span()
 
 
-def find_functions_in_ast(tree: AST) -> List[FunctionDef]:
-    # Currently only finds top level functions
-    return [node for node in ast.walk(tree) if isinstance(node, FunctionDef)]
+def parse_python_code(code: Union[str, bytes]) -> AST:
+    return ast.parse(code, type_comments=True)
 
 
 def stringify_type_expression(type_expression: ast.expr) -> str:
-    if isinstance(type_expression, ast.Name):
-        return type_expression.id
-    elif isinstance(type_expression, ast.Subscript):
-        subscript_name: str = type_expression.value.id  # type: ignore
-        return (
-            subscript_name
-            + "["
-            + stringify_type_expression(type_expression.slice)
-            + "]"
-        )
-    elif isinstance(type_expression, ast.Tuple):
-        tuple_arguments = [stringify_type_expression(e) for e in type_expression.elts]
-        return ", ".join(tuple_arguments)
-    else:
-        raise ValueError(f"did not recognise type {type(type_expression)}.")
+    return normalize_type_expression(type_expression)
 
 
-def get_return_type_hint(function_def: FunctionDef) -> Optional[str]:
+def get_return_type_hint(function_def: AnyFunctionDef) -> Optional[str]:
     return (
         None
         if function_def.returns is None
@@ -62,31 +129,269 @@ def get_return_type_hint(function_def: FunctionDef) -> Optional[str]:
     )
 
 
-def get_function_arguments(function_def: FunctionDef) -> List[FunctionArgument]:
-    return [
-        FunctionArgument(
-            name=a.arg,
-            type_hint=None
-            if a.annotation is None
-            else stringify_type_expression(a.annotation),
-        )
-        for a in function_def.args.args
-    ]
+def make_function_argument(argument: ast.arg, kind: ArgumentKind) -> FunctionArgument:
+    return FunctionArgument(
+        name=sys.intern(argument.arg),
+        type_hint=None
+        if argument.annotation is None
+        else stringify_type_expression(argument.annotation),
+        kind=kind,
+    )
+
+
+def iter_function_arguments(arguments: ast.arguments) -> Iterator[FunctionArgument]:
+    # In signature order
+    for a in arguments.posonlyargs:
+        yield make_function_argument(a, ArgumentKind.POSITIONAL_ONLY)
+    for a in arguments.args:
+        yield make_function_argument(a, ArgumentKind.POSITIONAL_OR_KEYWORD)
+    if arguments.vararg is not None:
+        yield make_function_argument(arguments.vararg, ArgumentKind.VAR_POSITIONAL)
+    for a in arguments.kwonlyargs:
+        yield make_function_argument(a, ArgumentKind.KEYWORD_ONLY)
+    if arguments.kwarg is not None:
+        yield make_function_argument(arguments.kwarg, ArgumentKind.VAR_KEYWORD)
+
+
+def get_function_arguments(function_def: AnyFunctionDef) -> List[FunctionArgument]:
+    return list(iter_function_arguments(function_def.args))
+
+
+def get_function_name(function_def: AnyFunctionDef) -> str:
+    return sys.intern(function_def.name)
+
+
+def get_function_span(
+    function_def: AnyFunctionDef, positions: LineOffsetTable
+) -> SourceSpan:
+    start = positions.get_offset(function_def.lineno, function_def.col_offset)
+    head = FUNCTION_HEAD_PATTERN.match(positions.text, start)
+    name_start = start if head is None else head.end()
+    return positions.get_span(start, name_start + len(function_def.name))
+
 
+def get_docstring_span(
+    function_def: AnyFunctionDef, positions: LineOffsetTable
+) -> SourceSpan:
+    literal = function_def.body[0].value  # type: ignore
+    return positions.get_span(
+        positions.get_offset(literal.lineno, literal.col_offset),
+        positions.get_offset(literal.end_lineno, literal.end_col_offset),
+    )
+
+
+@dataclass(slots=True)
+class DefinitionLocation(FunctionLocation):
+    # The node `ast` found, whose positions count bytes
+    function_def: AnyFunctionDef
+    positions: SourcePositions
+
+    def get_positions(self) -> LineOffsetTable:
+        return self.positions.get_table()
 
-def get_function_name(function_def: FunctionDef) -> str:
-    return function_def.name
+    def get_span(self) -> SourceSpan:
+        return get_function_span(self.function_def, self.positions.get_table())
 
+    def get_docstring_span(self) -> SourceSpan:
+        return get_docstring_span(self.function_def, self.positions.get_table())
 
-def extract_parts_of_function_def(function_def: FunctionDef) -> FunctionParts:
+
+def extract_parts_of_function_def(
+    function_def: AnyFunctionDef,
+    qualname: str = "",
+    is_method: bool = False,
+    location: Optional[FunctionLocation] = None,
+) -> FunctionParts:
     function_name = get_function_name(function_def)
     docstring = ast.get_docstring(function_def)
     arguments = get_function_arguments(function_def)
     return_type = get_return_type_hint(function_def)
-    return FunctionParts(function_name, docstring, arguments, return_type)
+    return FunctionParts(
+        function_name,
+        docstring,
+        arguments,
+        return_type,
+        qualname,
+        is_method,
+        location,
+    )
+
+
+def is_private_name(name: str) -> bool:
+    # Dunder methods like `__init__` are part of the public interface
+    return name.startswith("_") and not (name.startswith("__") and name.endswith("__"))
+
+
+@dataclass(frozen=True)
+class ScopeRules:
+    include_nested: bool = True
+    include_private: bool = True
+    include_methods: bool = True
+    # Functions with these decorators usually share the docstring of another one
+    include_overloads: bool = True
+    include_properties: bool = True
+
+
+OVERLOAD_DECORATORS = frozenset(["overload"])
+# Includes the last part of `@name.setter` and `@name.deleter`
+PROPERTY_DECORATORS = frozenset(
+    ["property", "cached_property", "abstractproperty", "getter", "setter", "deleter"]
+)
+
+
+def get_decorator_name(decorator: ast.expr) -> Optional[str]:
+    # The last name, so `@typing.overload` and `@overload` are the same
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Name):
+        return decorator.id
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr
+    return None
+
+
+def is_exempt_by_decorators(
+    decorator_names: Iterable[Optional[str]], rules: ScopeRules
+) -> bool:
+    for name in decorator_names:
+        if not rules.include_overloads and name in OVERLOAD_DECORATORS:
+            return True
+        if not rules.include_properties and name in PROPERTY_DECORATORS:
+            return True
+    return False
+
+
+# Statement fields that can contain function or class definitions, in source order,
+# expressions are never descended into
+STATEMENT_BLOCK_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+def get_definition_lines(node: Union[AnyFunctionDef, ClassDef]) -> Tuple[int, int]:
+    # Decorators are part of the definition
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    return start, node.end_lineno or node.lineno
+
+
+class FunctionCollector:
+    def __init__(
+        self,
+        rules: ScopeRules,
+        line_ranges: Optional[LineRanges] = None,
+        positions: Optional[SourcePositions] = None,
+    ):
+        self.rules = rules
+        # Only definitions overlapping these lines are collected, all when `None`
+        self.line_ranges = line_ranges
+        # Functions only get spans when the source text is known
+        self.positions = positions
+        self.scope: List[str] = []
+        self.in_class = False
+        self.in_function = False
+        self.function_defs: List[AnyFunctionDef] = []
+        self.functions: List[FunctionParts] = []
+
+    def visit(self, tree: AST) -> None:
+        for node, function in self.iter_functions(tree):
+            self.function_defs.append(node)
+            self.functions.append(function)
+
+    def iter_functions(
+        self, node: AST
+    ) -> Iterator[Tuple[AnyFunctionDef, FunctionParts]]:
+        # Yields each function as soon as it is reached, in source order
+        for field_name in STATEMENT_BLOCK_FIELDS:
+            for child in getattr(node, field_name, ()):
+                if isinstance(child, ClassDef):
+                    yield from self.iter_class(child)
+                elif isinstance(child, (FunctionDef, AsyncFunctionDef)):
+                    yield from self.iter_function(child)
+                else:
+                    yield from self.iter_functions(child)
+
+    def is_outside_line_ranges(self, node: Union[AnyFunctionDef, ClassDef]) -> bool:
+        return self.line_ranges is not None and not overlaps_line_ranges(
+            self.line_ranges, *get_definition_lines(node)
+        )
+
+    def iter_class(
+        self, node: ClassDef
+    ) -> Iterator[Tuple[AnyFunctionDef, FunctionParts]]:
+        if not self.rules.include_private and is_private_name(node.name):
+            return
+        # Everything defined in a class body is a method or part of one
+        if not self.rules.include_methods:
+            return
+        if self.is_outside_line_ranges(node):
+            return
+        yield from self.iter_scope(
+            node, node.name, in_class=True, in_function=self.in_function
+        )
 
+    def iter_function(
+        self, node: AnyFunctionDef
+    ) -> Iterator[Tuple[AnyFunctionDef, FunctionParts]]:
+        if self.in_function and not self.rules.include_nested:
+            return
+        if not self.rules.include_private and is_private_name(node.name):
+            return
+        if len(node.decorator_list) > 0 and is_exempt_by_decorators(
+            map(get_decorator_name, node.decorator_list), self.rules
+        ):
+            return
+        if self.is_outside_line_ranges(node):
+            return
+        qualname = sys.intern(".".join(self.scope + [node.name]))
+        yield node, extract_parts_of_function_def(
+            node,
+            qualname,
+            self.in_class,
+            None
+            if self.positions is None
+            else DefinitionLocation(node, self.positions),
+        )
+        yield from self.iter_scope(
+            node, f"{node.name}.<locals>", in_class=False, in_function=True
+        )
 
-@dataclass
+    def iter_scope(
+        self, node: AST, scope_name: str, in_class: bool, in_function: bool
+    ) -> Iterator[Tuple[AnyFunctionDef, FunctionParts]]:
+        outer_in_class, outer_in_function = self.in_class, self.in_function
+        self.scope.append(scope_name)
+        self.in_class, self.in_function = in_class, in_function
+        yield from self.iter_functions(node)
+        self.in_class, self.in_function = outer_in_class, outer_in_function
+        self.scope.pop()
+
+
+def iter_functions(
+    tree: AST,
+    rules: ScopeRules = ScopeRules(),
+    line_ranges: Optional[LineRanges] = None,
+    positions: Optional[SourcePositions] = None,
+) -> Iterator[FunctionParts]:
+    # Only the function being checked is kept alive, not a list for the whole module
+    collector = FunctionCollector(rules, line_ranges, positions)
+    for _, function in collector.iter_functions(tree):
+        yield function
+
+
+def collect_functions(
+    tree: AST,
+    rules: ScopeRules = ScopeRules(),
+    line_ranges: Optional[LineRanges] = None,
+    positions: Optional[SourcePositions] = None,
+) -> FunctionCollector:
+    collector = FunctionCollector(rules, line_ranges, positions)
+    collector.visit(tree)
+    return collector
+
+
+def find_functions_in_ast(tree: AST) -> List[AnyFunctionDef]:
+    return collect_functions(tree).function_defs
+
+
+@dataclass(frozen=True, slots=True)
 class DocstringParts:
     summary: Optional[str]
     description: Optional[str]
@@ -96,59 +401,105 @@ class DocstringParts:
     yields: Optional[str]
 
 
+# Section headers in the order they must appear, mapped to `DocstringParts` fields
+DOCSTRING_SECTIONS = {
+    "Args:": "args",
+    "Raises:": "raises",
+    "Returns:": "returns",
+    "Yields:": "yields",
+}
+DOCSTRING_SECTION_ORDER = list(DOCSTRING_SECTIONS.values())
+
+
+def join_docstring_lines(lines: List[str]) -> Optional[str]:
+    text = "\n".join(lines).rstrip("\n")
+    return text if len(text) > 0 else None
+
+
 def extract_docstring_parts(docstring: str) -> DocstringParts:
-    pattern = re.compile(
-        "".join(
-            [
-                r"^",  # Start of string
-                r"(?: {0,4})?",  # Optional indentation
-                r"(?P<summary>.+)",  # One line summary
-                r"(?:\n\n(?P<description>(?!Args:)(.|\n)+?))?",  # Optional multi-line description
-                r"(?:\n\nArgs:\n(?P<args>(.|\n)+?))?",  # Optional list of arguments
-                r"(?:\n\nRaises:\n(?P<raises>(.|\n)+))?",  # Optional list of errors raised
-                r"(?:\n\nReturns:\n(?P<returns>(.|\n)+?))?",  # Optional list of return values
-                r"(?:\n\nYields:\n(?P<yields>(.|\n)+))?",  # Optional list of yield values
-                r"\n*",  # Trailing newlines
-                "$",  # End of string
-            ]
-        )
-    )
-    matches = pattern.match(docstring)
-    if matches is None:
+    # A single pass over the lines: a section starts at a known header that follows a
+    # blank line, is followed by some text and comes later in `DOCSTRING_SECTIONS` than
+    # the current section
+    lines = docstring.split("\n")
+    # Up to four spaces of indentation before the summary are ignored
+    summary = lines[0][min(len(lines[0]) - len(lines[0].lstrip(" ")), 4) :]
+    if len(summary) == 0 or (len(lines) > 1 and len(lines[1]) > 0):
         raise ValueError("no matches")
-    else:
-        return DocstringParts(
-            summary=matches.group("summary"),
-            description=matches.group("description"),
-            args=matches.group("args"),
-            raises=matches.group("raises"),
-            returns=matches.group("returns"),
-            yields=matches.group("yields"),
-        )
+
+    sections = {}
+    current_section = "description"
+    current_section_index = -1
+    section_start = 2
+    for i in range(2, len(lines)):
+        section = DOCSTRING_SECTIONS.get(lines[i])
+        if (
+            section is None
+            or len(lines[i - 1]) > 0
+            or i + 1 == len(lines)
+            or (i + 2 == len(lines) and len(lines[i + 1]) == 0)
+            or DOCSTRING_SECTION_ORDER.index(section) <= current_section_index
+        ):
+            continue
+        # Drop the blank line that separates this section from the previous one
+        sections[current_section] = join_docstring_lines(lines[section_start : i - 1])
+        current_section = section
+        current_section_index = DOCSTRING_SECTION_ORDER.index(section)
+        section_start = i + 1
+    sections[current_section] = join_docstring_lines(lines[section_start:])
+
+    return DocstringParts(
+        summary=summary,
+        description=sections.get("description"),
+        args=sections.get("args"),
+        raises=sections.get("raises"),
+        returns=sections.get("returns"),
+        yields=sections.get("yields"),
+    )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocstringFunctionArgument:
     name: str
     type_hint: Optional[str]
     description: str
 
 
+ARGUMENT_PATTERN = re.compile(
+    r"^(?P<name>\w+?) \((?P<type_hint>.+?)\): (?P<description>.+)$"
+)
+# An argument without a type, only read at the indentation of the entries, since
+# deeper lines like `See: other.` continue a description
+UNTYPED_ARGUMENT_PATTERN = re.compile(r"^(?P<name>\w+): (?P<description>.+)$")
+
+
+def get_indentation_width(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def match_argument_entries(lines: List[str]) -> List[Optional[Match[str]]]:
+    # For every line, the match when it starts an entry. Untyped entries are only
+    # read at the indentation of the first entry
+    entry_indentation = next(
+        (get_indentation_width(line) for line in lines if len(line.strip()) > 0), 0
+    )
+    entries = []
+    for line in lines:
+        stripped = line.strip()
+        matches = ARGUMENT_PATTERN.match(stripped)
+        if matches is None and get_indentation_width(line) <= entry_indentation:
+            matches = UNTYPED_ARGUMENT_PATTERN.match(stripped)
+        entries.append(matches)
+    return entries
+
+
 def parse_args_from_docstring(docstring_args: str) -> List[DocstringFunctionArgument]:
-    docstring_args = docstring_args.strip()
+    lines = [line for line in docstring_args.splitlines() if len(line.strip()) > 0]
     args: List[DocstringFunctionArgument] = []
-    argument_pattern = re.compile(
-        r"^(?P<name>\w+?) \((?P<type_hint>.+?)\): (?P<description>.+)$"
-    )
     found_an_arg = False
     name: str = ""
-    type_hint: str = ""
+    type_hint: Optional[str] = None
     description: str = ""
-    for line in docstring_args.splitlines():
-        line = line.strip()
-        if len(line) == 0:
-            continue
-        matches = argument_pattern.match(line)
+    for line, matches in zip(lines, match_argument_entries(lines)):
         if matches:
             if found_an_arg:
                 argument = DocstringFunctionArgument(
@@ -158,12 +509,12 @@ def parse_args_from_docstring(docstring_args: str) -> List[DocstringFunctionArgu
                 found_an_arg = False
 
             name = matches.group("name")
-            type_hint = matches.group("type_hint")
+            type_hint = matches.groupdict().get("type_hint")
             description = matches.group("description")
             found_an_arg = True
         else:
             if found_an_arg:
-                description += "\n" + line
+                description += "\n" + line.strip()
             else:
                 raise ValueError(
                     "Found an argument description without defining an argument."
@@ -177,6 +528,110 @@ def parse_args_from_docstring(docstring_args: str) -> List[DocstringFunctionArgu
     return args
 
 
+def parse_google_docstring_args(docstring: str) -> List[DocstringFunctionArgument]:
+    docstring_parts = extract_docstring_parts(docstring)
+    if docstring_parts.args is None:
+        return []
+    return parse_args_from_docstring(docstring_parts.args)
+
+
+NUMPY_PARAMETER_HEADERS = {"Parameters", "Other Parameters"}
+NUMPY_OPTIONAL_PATTERN = re.compile(r",\s*(?:optional|default\b.*)$")
+
+
+def is_numpy_underline(line: str) -> bool:
+    stripped = line.strip()
+    return len(stripped) >= 3 and stripped == "-" * len(stripped)
+
+
+def get_line_indentation(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def parse_numpy_docstring_args(docstring: str) -> List[DocstringFunctionArgument]:
+    # Entries are `name : type` lines at the header's indentation, followed by a
+    # more indented description, a section ends at the next underlined header
+    lines = docstring.split("\n")
+    args: List[DocstringFunctionArgument] = []
+    in_parameters = False
+    indentation = 0
+    description_lines: List[str] = []
+    for i, line in enumerate(lines):
+        if i + 1 < len(lines) and is_numpy_underline(lines[i + 1]):
+            in_parameters = line.strip() in NUMPY_PARAMETER_HEADERS
+            indentation = get_line_indentation(line)
+            continue
+        if not in_parameters or len(line.strip()) == 0 or is_numpy_underline(line):
+            continue
+        if get_line_indentation(line) > indentation:
+            description_lines.append(line.strip())
+            continue
+        if len(args) > 0 and len(description_lines) > 0:
+            args[-1] = replace(args[-1], description="\n".join(description_lines))
+        description_lines = []
+        names, _, type_hint = line.strip().partition(":")
+        type_hint = NUMPY_OPTIONAL_PATTERN.sub("", type_hint.strip())
+        # Arguments sharing a type and description can be listed together
+        for name in names.split(","):
+            args.append(
+                DocstringFunctionArgument(
+                    name=name.strip().lstrip("*"),
+                    type_hint=type_hint if len(type_hint) > 0 else None,
+                    description="",
+                )
+            )
+    if len(args) > 0 and len(description_lines) > 0:
+        args[-1] = replace(args[-1], description="\n".join(description_lines))
+    return args
+
+
+SPHINX_FIELD_PATTERN = re.compile(
+    r"^:(?P<field>param|parameter|arg|argument|key|keyword|type)\s+(?P<spec>[^:]+):"
+    r"\s*(?P<text>.*)$"
+)
+
+
+def parse_sphinx_docstring_args(docstring: str) -> List[DocstringFunctionArgument]:
+    # `:param name:` entries in order, typed inline as `:param type name:` or by a
+    # separate `:type name:` field
+    descriptions: Dict[str, str] = {}
+    type_hints: Dict[str, str] = {}
+    last_name: Optional[str] = None
+    for line in docstring.split("\n"):
+        match = SPHINX_FIELD_PATTERN.match(line.strip())
+        if match is None:
+            if last_name is not None and line.startswith((" ", "\t")):
+                descriptions[last_name] += "\n" + line.strip()
+            elif line.startswith(":"):
+                last_name = None
+            continue
+        *type_words, name = match.group("spec").split()
+        name = name.lstrip("*")
+        if match.group("field") == "type":
+            type_hints[name] = match.group("text").strip()
+            last_name = None
+            continue
+        descriptions[name] = match.group("text")
+        if len(type_words) > 0:
+            type_hints[name] = " ".join(type_words)
+        last_name = name
+    return [
+        DocstringFunctionArgument(
+            name=name, type_hint=type_hints.get(name), description=description
+        )
+        for name, description in descriptions.items()
+    ]
+
+
+DocstringParser = Callable[[str], List[DocstringFunctionArgument]]
+# Every docstring goes to the one parser of its module's style
+DOCSTRING_PARSERS: Dict[str, DocstringParser] = {
+    "google": parse_google_docstring_args,
+    "numpy": parse_numpy_docstring_args,
+    "sphinx": parse_sphinx_docstring_args,
+}
+
+
 def indent(s: str, n: int) -> str:
     def indent_line(line: str, n: int):
         return (" " * 4 * n) + line
@@ -185,6 +640,9 @@ def indent(s: str, n: int) -> str:
 
 
 def generate_docstring_argument(arg: FunctionArgument) -> str:
+    # Without an annotation there is no type to document, and none is checked
+    if arg.type_hint is None:
+        return f"{arg.name}: _argument_description_"
     return f"{arg.name} ({arg.type_hint}): _argument_description_"
 
 
@@ -192,63 +650,132 @@ def generate_docstring_return(return_type_hint: str) -> str:
     return f"{return_type_hint}: _return_description_"
 
 
-def generate_docstring(function: FunctionParts) -> str:
-    docstring_parts = ["_function_summary_"]
-    if len(function.arguments) > 0:
-        docstring_parts.append(
-            "\n".join(
-                ["Args:"]
-                + [
-                    indent(generate_docstring_argument(a), 1)
-                    for a in function.arguments
-                ]
-            )
-        )
-    if (function.return_type_hint) is not None:
-        docstring_parts.append(
-            "\n".join(
-                [
-                    "Return:",
-                    indent(generate_docstring_return(function.return_type_hint), 4),
-                ]
-            )
-        )
-    return "\n".join(docstring_parts)
+def generate_docstring(function: FunctionParts, style: str = DEFAULT_STYLE) -> str:
+    # In the default style the result parses with `extract_docstring_parts`
+    return get_renderer(style).render(
+        get_documented_arguments(function), function.return_type_hint
+    )
 
 
-def check_docstring(file_path: Path, function: FunctionParts) -> List[DocstringError]:
-    function_name = function.name
+def generate_docstrings(
+    functions: Iterable[FunctionParts], style: str = DEFAULT_STYLE
+) -> List[str]:
+    renderer = get_renderer(style)
+    return [
+        renderer.render(get_documented_arguments(f), f.return_type_hint)
+        for f in functions
+    ]
+
+
+def get_documented_arguments(function: FunctionParts) -> List[FunctionArgument]:
+    # The implicit `self` or `cls` of a method is not documented
+    if (
+        function.is_method
+        and len(function.arguments) > 0
+        and function.arguments[0].name in ("self", "cls")
+    ):
+        return function.arguments[1:]
+    return function.arguments
+
+
+@lru_cache(maxsize=DOCSTRING_ENTRY_CACHE_SIZE)
+def get_docstring_entry_pattern(name: str) -> Pattern[str]:
+    # The line documenting an argument in any style: `name (type):`, `name : type`,
+    # `other, name : type` or `:param type name:`
+    return re.compile(
+        r"^[ \t]*(?::param[ \t]+(?:[^:\r\n]*[ \t])?|(?:\*{0,2}\w+[ \t]*,[ \t]*)*)"
+        rf"\*{{0,2}}(?P<name>{re.escape(name)})(?=[ \t]*(?:[(:,]|\r?$))",
+        re.MULTILINE,
+    )
+
+
+def get_docstring_entry_span(
+    function: FunctionParts, name: str
+) -> Optional[SourceSpan]:
+    # Falls back to the whole docstring when the entry cannot be found
+    location = function.location
+    if location is None or function.docstring is None:
+        return None
+    positions = location.get_positions()
+    span = location.get_docstring_span()
+    # The summary on the first line is never an entry
+    match = get_docstring_entry_pattern(name).search(
+        positions.text,
+        positions.line_offsets[span.line],
+        positions.get_position_offset(span.end_line, span.end_column),
+    )
+    if match is None:
+        return span
+    return positions.get_span(match.start("name"), match.end("name"))
+
+
+def iter_docstring_errors(
+    file_path: Path,
+    function: FunctionParts,
+    stats: Optional[FileStats] = None,
+    docstring_style: str = DEFAULT_STYLE,
+    scope: Optional["ModuleScope"] = None,
+) -> Iterator[DocstringError]:
+    function_name = function.qualname
     docstring = function.docstring
-    docstring_errors: List[DocstringError] = []
 
     # No docstring obviously fails
     if docstring is None:
-        docstring_errors.append(MissingDocstringError(file_path, function_name))
+        yield MissingDocstringError(file_path, function_name, span=function.span)
 
     else:
-        docstring_parts = extract_docstring_parts(docstring)
+        start = time.perf_counter() if stats is not None else 0.0
+        docstring_args = DOCSTRING_PARSERS[docstring_style](docstring)
 
         # Compare the docstring to the function definition
 
-        if docstring_parts.args is None:
-            docstring_args = []
-        else:
-            docstring_args = parse_args_from_docstring(docstring_parts.args)
+        if stats is not None:
+            stats.lap("docstring_parsing", start)
 
-        for function_arg, docstring_arg in zip(function.arguments, docstring_args):
+        for function_arg, docstring_arg in zip(
+            get_documented_arguments(function), docstring_args
+        ):
             if function_arg.name != docstring_arg.name:
-                docstring_errors.append(
-                    MissingArgumentError(file_path, function_name, function_arg.name)
+                yield MissingArgumentError(
+                    file_path,
+                    function_name,
+                    function_arg.name,
+                    span=get_docstring_entry_span(function, docstring_arg.name),
                 )
 
             if (
                 function_arg.name == docstring_arg.name
-                and function_arg.type_hint != docstring_arg.type_hint
-            ):
-                docstring_errors.append(
-                    IncorrectArgumentTypehintError(
-                        file_path, function_name, function_arg.name
+                and function_arg.type_hint
+                != (
+                    None
+                    if docstring_arg.type_hint is None
+                    else normalize_type_hint(docstring_arg.type_hint)
+                )
+                # Names are only resolved for hints that differ as written
+                and (
+                    scope is None
+                    or function_arg.type_hint is None
+                    or docstring_arg.type_hint is None
+                    or not scope.hints_match(
+                        function_arg.type_hint, docstring_arg.type_hint
                     )
                 )
+            ):
+                yield IncorrectArgumentTypehintError(
+                    file_path,
+                    function_name,
+                    function_arg.name,
+                    span=get_docstring_entry_span(function, docstring_arg.name),
+                )
+
 
-    return docstring_errors
+def check_docstring(
+    file_path: Path,
+    function: FunctionParts,
+    stats: Optional[FileStats] = None,
+    docstring_style: str = DEFAULT_STYLE,
+    scope: Optional["ModuleScope"] = None,
+) -> List[DocstringError]:
+    return list(
+        iter_docstring_errors(file_path, function, stats, docstring_style, scope)
+    )
@@ -1,24 +1,42 @@
-from auto_docstring import (
-    check_docstring,
-    extract_parts_of_function_def,
-    find_functions_in_ast,
-    parse_python_code,
-)
-from auto_docstring.cli import get_cli_arguments
+import sys
 
-file_paths = get_cli_arguments()
-for file_path in file_paths:
-    print(file_path)
-    with open(file_path, "r") as f:
-        test_code = f.read()
-    the_ast = parse_python_code(test_code)
-    functions = find_functions_in_ast(the_ast)
-    functions = [extract_parts_of_function_def(f) for f in functions]
-    for function in functions:
-        print(function.name)
-        docstring_errors = check_docstring(file_path, function)
-        if len(docstring_errors) > 0:
-            for docstring_error in docstring_errors:
-                print(docstring_error.get_message())
-        else:
-            print(f"Function `{function.name}` is good!")
+from auto_docstring.cli import CliArguments, get_cli_arguments, get_merge_arguments
+from auto_docstring.daemon_client import query_daemon
+from auto_docstring.runner import run, run_merge
+
+
+def run_client(arguments: CliArguments) -> int:
+    if arguments.stop_daemon:
+        request = {"command": "stop"}
+    else:
+        request = {
+            # The daemon may run in another directory
+            "paths": [str(p.absolute()) for p in arguments.file_paths],
+            "format": arguments.output_format,
+            "show_passing": arguments.show_passing,
+        }
+    try:
+        response = query_daemon(arguments.socket_path, request)
+    except (OSError, ValueError) as e:
+        # No daemon, or one that went away before answering
+        print(f"cannot reach a daemon on {arguments.socket_path}: {e}", file=sys.stderr)
+        return 2
+    sys.stdout.write(response["output"])
+    for failure in response["failures"]:
+        print(failure, file=sys.stderr)
+    return response["exit_code"]
+
+
+def main() -> int:
+    # A path named `merge` can still be checked as `./merge`
+    if sys.argv[1:2] == ["merge"]:
+        return run_merge(get_merge_arguments(sys.argv[2:]))
+    arguments = get_cli_arguments()
+    if arguments.client or arguments.stop_daemon:
+        return run_client(arguments)
+    return run(arguments)
+
+
+# The guard keeps worker processes that re-import this module from re-running it
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import FrozenSet, List, Optional, Set
+
+from auto_docstring.engine import FileResult, FunctionResult
+from auto_docstring.reporters import get_error_code
+
+# Bump the trailing version whenever the fingerprint or the file layout changes
+BASELINE_HEADER = b"auto-docstring-baseline\n\x01"
+FINGERPRINT_BYTES = 8
+# Fingerprints are stored as unsigned 64-bit little-endian integers
+FINGERPRINT_TYPECODE = "Q"
+
+
+def get_baseline_root(baseline_path: Path) -> str:
+    # Files are recorded relative to the baseline, so it works from any directory
+    return os.path.dirname(os.path.realpath(baseline_path))
+
+
+def get_relative_path(file_path: Path, root: str) -> str:
+    return Path(os.path.relpath(os.path.realpath(file_path), root)).as_posix()
+
+
+def get_fingerprint(key: str) -> int:
+    digest = hashlib.blake2b(
+        key.encode(errors="surrogateescape"), digest_size=FINGERPRINT_BYTES
+    )
+    return int.from_bytes(digest.digest(), "little")
+
+
+def get_fingerprints(result: FileResult, root: str) -> Optional[List[List[int]]]:
+    # One fingerprint per error, in the same nesting as `result.functions`
+    if all(len(f.errors) == 0 for f in result.functions):
+        return None
+    relative_path = get_relative_path(result.file_path, root)
+    # Line numbers are left out so unrelated edits do not invalidate the baseline,
+    # instead repeated errors are told apart by how often they occurred before
+    occurrences: Counter = Counter()
+    fingerprints = []
+    for function in result.functions:
+        function_fingerprints = []
+        for error in function.errors:
+            key = "\0".join(
+                [
+                    relative_path,
+                    error.function_name,
+                    get_error_code(error),
+                    getattr(error, "argument_name", ""),
+                ]
+            )
+            occurrences[key] += 1
+            function_fingerprints.append(get_fingerprint(f"{key}\0{occurrences[key]}"))
+        fingerprints.append(function_fingerprints)
+    return fingerprints
+
+
+class Baseline:
+    def __init__(self, fingerprints: FrozenSet[int], root: str):
+        self.fingerprints = fingerprints
+        self.root = root
+
+    @classmethod
+    def load(cls, baseline_path: Path) -> "Baseline":
+        data = baseline_path.read_bytes()
+        if (
+            not data.startswith(BASELINE_HEADER)
+            or (len(data) - len(BASELINE_HEADER)) % FINGERPRINT_BYTES != 0
+        ):
+            raise ValueError(f"{baseline_path} is not a valid baseline file")
+        fingerprints = array(FINGERPRINT_TYPECODE)
+        fingerprints.frombytes(data[len(BASELINE_HEADER) :])
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        return cls(frozenset(fingerprints), get_baseline_root(baseline_path))
+
+    def filter(self, result: FileResult) -> FileResult:
+        # Removes the errors recorded in the baseline, one set lookup per error
+        fingerprints = get_fingerprints(result, self.root)
+        if fingerprints is None:
+            return result
+        functions = [
+            FunctionResult(
+                f.name,
+                [e for e, p in zip(f.errors, ps) if p not in self.fingerprints],
+            )
+            for f, ps in zip(result.functions, fingerprints)
+        ]
+        return FileResult(result.file_path, functions, result.stats, result.failure)
+
+
+class BaselineWriter:
+    def __init__(self, baseline_path: Path):
+        self.baseline_path = baseline_path
+        self.root = get_baseline_root(baseline_path)
+        self.fingerprints: Set[int] = set()
+
+    def add(self, result: FileResult) -> None:
+        fingerprints = get_fingerprints(result, self.root)
+        if fingerprints is not None:
+            self.fingerprints.update(p for ps in fingerprints for p in ps)
+
+    def write(self) -> int:
+        # Sorted, so the same errors always give the same file
+        fingerprints = array(FINGERPRINT_TYPECODE, sorted(self.fingerprints))
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        self.baseline_path.write_bytes(BASELINE_HEADER + fingerprints.tobytes())
+        return len(self.fingerprints)
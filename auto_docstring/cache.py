@@ -0,0 +1,121 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path(".auto_docstring_cache")
+DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+# Bump whenever the pickled layout or the meaning of cached results changes
+CACHE_FORMAT_VERSION = 5
+
+
+def get_tool_version() -> str:
+    # Imported here because it is slow to import and only needed once per run
+    from importlib import metadata
+
+    try:
+        return metadata.version("auto-docstring")
+    except metadata.PackageNotFoundError:
+        return "0.0.0"
+
+
+def create_cache_directory(directory: Path) -> None:
+    if not directory.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / ".gitignore").write_text("*\n")
+
+
+class ResultCache:
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        settings: str = "",
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Options that change the results of a check are part of every key
+        self.salt = f"{get_tool_version()}:{CACHE_FORMAT_VERSION}:{settings}:".encode()
+
+    def get_key(self, source: bytes, settings: bytes = b"") -> str:
+        # `settings` are options that differ between files
+        digest = hashlib.blake2b(self.salt, digest_size=20)
+        digest.update(settings)
+        digest.update(source)
+        return digest.hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        # Fan out over subdirectories so no single directory gets too large
+        return self.directory / key[:2] / key[2:]
+
+    def load(self, key: str) -> Optional[Any]:
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                value = pickle.load(f)
+            # Refresh the modification time so eviction drops the least recently used entries
+            os.utime(entry_path)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # Missing, truncated or written by an incompatible version
+            return None
+        return value
+
+    def store(self, key: str, value: Any) -> None:
+        entry_path = self.get_entry_path(key)
+        try:
+            self.ensure_directory(entry_path.parent)
+            # Write to a temporary file and rename it into place, so concurrent readers
+            # either see the previous entry or the complete new one
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=entry_path.parent, prefix=".tmp-"
+            )
+            try:
+                with os.fdopen(file_descriptor, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary_path, entry_path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+        except OSError:
+            # A read-only or full disk should never fail the check itself
+            pass
+
+    def ensure_directory(self, directory: Path) -> None:
+        create_cache_directory(self.directory)
+        directory.mkdir(exist_ok=True)
+
+    def list_entries(self) -> List[Tuple[float, int, Path]]:
+        entries: List[Tuple[float, int, Path]] = []
+        try:
+            subdirectories = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for subdirectory in subdirectories:
+            if not subdirectory.is_dir():
+                continue
+            for entry in os.scandir(subdirectory.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Evicted by a concurrent run
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return entries
+
+    def evict(self) -> None:
+        entries = self.list_entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        if total_bytes <= self.max_bytes:
+            return
+        # Shrink a bit below the limit so the next few runs do not evict again
+        target_bytes = self.max_bytes * 3 // 4
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= target_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
@@ -1,10 +1,315 @@
 import argparse
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
+from auto_docstring import ScopeRules
+from auto_docstring.cache import DEFAULT_CACHE_DIR
+from auto_docstring.daemon_client import DEFAULT_POLL_INTERVAL, DEFAULT_SOCKET_PATH
+from auto_docstring.engine import DEFAULT_ENGINE, DEFAULT_READ_THREADS, ENGINES
+from auto_docstring.reporters import REPORTERS
+from auto_docstring.styles import AUTO_STYLE, DOCSTRING_STYLES
 
-def get_cli_arguments() -> List[Path]:
+SHARD_PATTERN = re.compile(r"(?P<index>[0-9]+)/(?P<count>[0-9]+)")
+
+
+@dataclass
+class CliArguments:
+    file_paths: List[Path]
+    exclude: List[str]
+    jobs: int
+    read_threads: int
+    cache_dir: Optional[Path]
+    rules: ScopeRules
+    config_path: Optional[Path]
+    engine: str
+    docstring_style: str
+    resolve_imports: bool
+    diff_base: Optional[str]
+    baseline: Optional[Path]
+    write_baseline: bool
+    shard: Optional[Tuple[int, int]]
+    shard_timings: List[Path]
+    results_json: Optional[Path]
+    output_format: str
+    show_passing: bool
+    fix: bool
+    stats: bool
+    stats_json: Optional[Path]
+    daemon: bool
+    client: bool
+    stop_daemon: bool
+    socket_path: Path
+    poll_interval: float
+
+
+@dataclass
+class MergeArguments:
+    results_paths: List[Path]
+    output_format: str
+    show_passing: bool
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    match = SHARD_PATTERN.fullmatch(value)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"expected K/N, got `{value}`")
+    index, count = int(match["index"]), int(match["count"])
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"K has to be between 1 and N, got `{value}`")
+    return index, count
+
+
+def get_cli_arguments() -> CliArguments:
     parser = argparse.ArgumentParser()
-    parser.add_argument("file_paths", nargs="*")
+    parser.add_argument(
+        "file_paths",
+        nargs="*",
+        type=Path,
+        help="Python files to check, directories are searched for `.py` files.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Gitignore-style pattern of paths to skip inside directories, can be repeated.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 uses every core.",
+    )
+    parser.add_argument(
+        "--read-threads",
+        type=int,
+        default=DEFAULT_READ_THREADS,
+        metavar="N",
+        help="Number of threads reading files ahead of the checks.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for cached results of unchanged files.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Check every file from scratch without reading or writing the cache.",
+    )
+    parser.add_argument(
+        "--skip-nested",
+        action="store_true",
+        help="Do not check functions defined inside other functions.",
+    )
+    parser.add_argument(
+        "--skip-private",
+        action="store_true",
+        help="Do not check functions and classes whose names start with an underscore.",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        metavar="FILE",
+        help="pyproject.toml with a [tool.auto-docstring] section, by default the closest one.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="How functions are found, `scanner` avoids building a tree of every function body.",
+    )
+    parser.add_argument(
+        "--docstring-style",
+        choices=[AUTO_STYLE, *DOCSTRING_STYLES],
+        default=AUTO_STYLE,
+        help="Docstring style of the project, `auto` detects it for each module.",
+    )
+    parser.add_argument(
+        "--resolve-imports",
+        action="store_true",
+        help="Resolve imports and type aliases from the whole project when comparing type hints.",
+    )
+    parser.add_argument(
+        "--diff-base",
+        metavar="REV",
+        help="Only check functions whose lines differ from REV in the git working tree.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        metavar="FILE",
+        help="Only report errors that are not recorded in the baseline FILE.",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="Record every current error in the --baseline FILE and exit successfully.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="K/N",
+        help="Only check the K-th of N parts of the files, balanced by their size.",
+    )
+    parser.add_argument(
+        "--shard-timings",
+        action="append",
+        default=[],
+        type=Path,
+        metavar="FILE",
+        help="Balance --shard by the timings in a --results-json FILE of an earlier run, can be repeated.",
+    )
+    parser.add_argument(
+        "--results-json",
+        type=Path,
+        metavar="FILE",
+        help="Also write the results and timings of every file to FILE, for `merge`.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(REPORTERS),
+        default="text",
+        help="Output format.",
+    )
+    parser.add_argument(
+        "--show-passing",
+        action="store_true",
+        help="Also report functions without any errors.",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Insert skeleton docstrings and document missing arguments in place.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print file, function and per-stage timing statistics to stderr.",
+    )
+    parser.add_argument(
+        "--stats-json",
+        type=Path,
+        metavar="FILE",
+        help="Write the statistics as JSON to FILE.",
+    )
+    daemon_group = parser.add_argument_group("daemon")
+    daemon_mode = daemon_group.add_mutually_exclusive_group()
+    daemon_mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep results for the given paths in memory and serve them over a socket.",
+    )
+    daemon_mode.add_argument(
+        "--client",
+        action="store_true",
+        help="Ask a running daemon for the results of the given paths, or all of them.",
+    )
+    daemon_mode.add_argument(
+        "--stop-daemon", action="store_true", help="Stop a running daemon."
+    )
+    daemon_group.add_argument(
+        "--socket",
+        type=Path,
+        default=DEFAULT_SOCKET_PATH,
+        help="Unix socket the daemon listens on.",
+    )
+    daemon_group.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between the daemon's scans for changed files.",
+    )
     arguments = parser.parse_args()
-    return arguments.file_paths
+    if arguments.write_baseline and arguments.baseline is None:
+        parser.error("--write-baseline requires --baseline FILE")
+    if arguments.write_baseline and arguments.diff_base is not None:
+        # The baseline would only contain the errors in changed functions
+        parser.error("--write-baseline cannot be combined with --diff-base")
+    if arguments.resolve_imports and arguments.daemon:
+        parser.error("--resolve-imports cannot be combined with --daemon")
+    if arguments.write_baseline and arguments.shard is not None:
+        # Each shard would overwrite the baseline with its own errors
+        parser.error("--write-baseline cannot be combined with --shard")
+    if len(arguments.shard_timings) > 0 and arguments.shard is None:
+        parser.error("--shard-timings requires --shard K/N")
+    # The daemon serves every client the same results, so nothing that filters,
+    # splits or rewrites them for one run applies
+    daemon_flag = (
+        "--daemon" if arguments.daemon else "--client" if arguments.client else None
+    )
+    for flag, is_set in [
+        ("--baseline", arguments.baseline is not None),
+        ("--diff-base", arguments.diff_base is not None),
+        ("--fix", arguments.fix),
+        ("--shard", arguments.shard is not None),
+        ("--results-json", arguments.results_json is not None),
+    ]:
+        if daemon_flag is not None and is_set:
+            parser.error(f"{flag} cannot be combined with {daemon_flag}")
+    return CliArguments(
+        file_paths=arguments.file_paths,
+        exclude=arguments.exclude,
+        jobs=arguments.jobs,
+        read_threads=max(1, arguments.read_threads),
+        cache_dir=None if arguments.no_cache else arguments.cache_dir,
+        rules=ScopeRules(
+            include_nested=not arguments.skip_nested,
+            include_private=not arguments.skip_private,
+        ),
+        config_path=arguments.config,
+        engine=arguments.engine,
+        docstring_style=arguments.docstring_style,
+        resolve_imports=arguments.resolve_imports,
+        diff_base=arguments.diff_base,
+        baseline=arguments.baseline,
+        write_baseline=arguments.write_baseline,
+        shard=arguments.shard,
+        shard_timings=arguments.shard_timings,
+        results_json=arguments.results_json,
+        output_format=arguments.format,
+        show_passing=arguments.show_passing,
+        fix=arguments.fix,
+        stats=arguments.stats,
+        stats_json=arguments.stats_json,
+        daemon=arguments.daemon,
+        client=arguments.client,
+        stop_daemon=arguments.stop_daemon,
+        socket_path=arguments.socket,
+        poll_interval=arguments.poll_interval,
+    )
+
+
+def get_merge_arguments(argv: Sequence[str]) -> MergeArguments:
+    parser = argparse.ArgumentParser(
+        prog="auto_docstring merge",
+        description="Report the results of every shard of a run as one.",
+    )
+    parser.add_argument(
+        "results_paths",
+        nargs="+",
+        type=Path,
+        metavar="FILE",
+        help="--results-json files written by the shards.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(REPORTERS),
+        default="text",
+        help="Output format.",
+    )
+    parser.add_argument(
+        "--show-passing",
+        action="store_true",
+        help="Also report functions without any errors.",
+    )
+    arguments = parser.parse_args(argv)
+    return MergeArguments(
+        results_paths=arguments.results_paths,
+        output_format=arguments.format,
+        show_passing=arguments.show_passing,
+    )
@@ -0,0 +1,130 @@
+import sys
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from auto_docstring import ScopeRules
+from auto_docstring.discovery import PathClassifier
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+PYPROJECT_FILE_NAME = "pyproject.toml"
+CONFIG_SECTION = "auto-docstring"
+# `include-methods = false` sets `ScopeRules.include_methods`
+SCOPE_RULE_KEYS = {f.name.replace("_", "-"): f.name for f in fields(ScopeRules)}
+# Gitignore-style patterns relative to the directory of the pyproject.toml
+PATTERN_KEYS = ("include", "exclude")
+OVERRIDES_KEY = "overrides"
+OVERRIDE_PATHS_KEY = "paths"
+
+Config = Dict[str, Any]
+
+
+def find_pyproject(directory: Path) -> Optional[Path]:
+    # The closest one, like other tools reading `[tool.*]` sections
+    for parent in [directory, *directory.parents]:
+        path = parent / PYPROJECT_FILE_NAME
+        if path.is_file():
+            return path
+    return None
+
+
+def validate_patterns(patterns: Any, where: str) -> None:
+    if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+        raise ValueError(f"{where} must be a list of strings.")
+    for pattern in patterns:
+        if pattern.startswith("!"):
+            raise ValueError(f"{where} cannot negate patterns, `{pattern}` given.")
+
+
+def validate_scope_rules(table: Config, where: str, allowed_keys: List[str]) -> None:
+    for key, value in table.items():
+        if key in allowed_keys:
+            continue
+        if key not in SCOPE_RULE_KEYS:
+            raise ValueError(f"Unknown key `{key}` in {where}.")
+        if not isinstance(value, bool):
+            raise ValueError(f"`{key}` in {where} must be true or false.")
+
+
+def validate_config(config: Config) -> None:
+    where = f"[tool.{CONFIG_SECTION}]"
+    validate_scope_rules(config, where, [*PATTERN_KEYS, OVERRIDES_KEY])
+    for key in PATTERN_KEYS:
+        if key in config:
+            validate_patterns(config[key], f"`{key}` in {where}")
+    overrides = config.get(OVERRIDES_KEY, [])
+    if not isinstance(overrides, list) or not all(
+        isinstance(o, dict) for o in overrides
+    ):
+        raise ValueError(f"[[tool.{CONFIG_SECTION}.{OVERRIDES_KEY}]] must be tables.")
+    for override in overrides:
+        where = f"[[tool.{CONFIG_SECTION}.{OVERRIDES_KEY}]]"
+        if OVERRIDE_PATHS_KEY not in override:
+            raise ValueError(f"Every {where} needs `{OVERRIDE_PATHS_KEY}`.")
+        validate_patterns(override[OVERRIDE_PATHS_KEY], f"`paths` in {where}")
+        validate_scope_rules(override, where, [OVERRIDE_PATHS_KEY])
+
+
+def load_config(path: Path) -> Config:
+    with path.open("rb") as f:
+        content = f.read()
+    try:
+        pyproject = tomllib.loads(content.decode())
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ValueError(f"Invalid {path}: {e}") from None
+    config = pyproject.get("tool", {}).get(CONFIG_SECTION, {})
+    validate_config(config)
+    return config
+
+
+def get_scope_rules(config: Config, rules: ScopeRules = ScopeRules()) -> ScopeRules:
+    # Command line flags only skip more, so a scope is checked if both include it
+    return replace(
+        rules,
+        **{
+            name: getattr(rules, name) and config[key]
+            for key, name in SCOPE_RULE_KEYS.items()
+            if key in config
+        },
+    )
+
+
+@dataclass(frozen=True)
+class PathRules:
+    classifier: PathClassifier
+    # Indexed by what `PathClassifier.classify` returns
+    rules: List[ScopeRules]
+
+    def get_rules(self, file_path: Path) -> Optional[ScopeRules]:
+        # None for excluded files, which discovery usually drops before
+        if len(self.rules) == 1:
+            # Without overrides there is nothing to look up
+            return self.rules[0]
+        index = self.classifier.classify(str(file_path))
+        return None if index is None else self.rules[index]
+
+
+def get_path_rules(
+    config: Config, root: Path, rules: ScopeRules = ScopeRules()
+) -> Optional[PathRules]:
+    # None when the configuration does not depend on paths
+    overrides = config.get(OVERRIDES_KEY, [])
+    if all(len(config.get(key, [])) == 0 for key in PATTERN_KEYS) and not overrides:
+        return None
+    scope_rules = {k: v for k, v in config.items() if k in SCOPE_RULE_KEYS}
+    classifier = PathClassifier(
+        root,
+        config.get("include", []),
+        config.get("exclude", []),
+        [o[OVERRIDE_PATHS_KEY] for o in overrides],
+    )
+    # Overrides start from the rest of the section, the command line still wins
+    return PathRules(
+        classifier,
+        [get_scope_rules(scope_rules, rules)]
+        + [get_scope_rules({**scope_rules, **o}, rules) for o in overrides],
+    )
@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from auto_docstring import ScopeRules
+from auto_docstring.cache import ResultCache
+from auto_docstring.config import PathRules
+from auto_docstring.daemon_client import (
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SOCKET_PATH,
+    query_daemon,
+)
+from auto_docstring.discovery import discover_python_files
+from auto_docstring.engine import DEFAULT_ENGINE, FILE_ERRORS, FileResult, check_file
+from auto_docstring.reporters import REPORTERS
+from auto_docstring.styles import AUTO_STYLE
+
+# Modification time and size, a file is re-checked whenever either changes
+StatKey = Tuple[int, int]
+
+
+def get_stat_key(path: str) -> Optional[StatKey]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ProjectState:
+    def __init__(
+        self,
+        roots: Sequence[Path],
+        exclude: Sequence[str] = (),
+        rules: ScopeRules = ScopeRules(),
+        cache: Optional[ResultCache] = None,
+        engine: str = DEFAULT_ENGINE,
+        docstring_style: str = AUTO_STYLE,
+        path_rules: Optional[PathRules] = None,
+    ):
+        self.roots = roots
+        self.exclude = exclude
+        self.rules = rules
+        self.cache = cache
+        self.engine = engine
+        self.docstring_style = docstring_style
+        self.path_rules = path_rules
+        self.classifier = None if path_rules is None else path_rules.classifier
+        self.lock = threading.Lock()
+        # Keyed by absolute path, in the order files were first discovered
+        self.entries: Dict[str, Tuple[StatKey, FileResult]] = {}
+        self.failures: Dict[str, str] = {}
+
+    def refresh_file(self, path: Path) -> Optional[FileResult]:
+        key = os.path.abspath(path)
+        stat_key = get_stat_key(key)
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry[0] == stat_key:
+            return entry[1]
+        if stat_key is None:
+            self.forget(key)
+            return None
+        try:
+            result = check_file(
+                path,
+                self.cache,
+                self.rules,
+                engine=self.engine,
+                docstring_style=self.docstring_style,
+                path_rules=self.path_rules,
+            )
+        except FILE_ERRORS as e:
+            # A file that is being edited is often broken, keep serving the rest
+            with self.lock:
+                self.entries.pop(key, None)
+                self.failures[key] = f"{path}: {e}"
+            return None
+        with self.lock:
+            self.entries[key] = (stat_key, result)
+            self.failures.pop(key, None)
+        return result
+
+    def forget(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+            self.failures.pop(key, None)
+
+    def refresh_all(self) -> None:
+        seen = set()
+        for path in discover_python_files(self.roots, self.exclude, self.classifier):
+            seen.add(os.path.abspath(path))
+            self.refresh_file(path)
+        with self.lock:
+            removed = (set(self.entries) | set(self.failures)) - seen
+        for key in removed:
+            self.forget(key)
+
+    def query(self, paths: Sequence[Path]) -> Tuple[List[FileResult], List[str]]:
+        # Requested files are re-validated first, so results are never stale
+        if len(paths) == 0:
+            with self.lock:
+                return [r for _, r in self.entries.values()], list(
+                    self.failures.values()
+                )
+        results = []
+        failures = []
+        for path in discover_python_files(paths, self.exclude, self.classifier):
+            result = self.refresh_file(path)
+            if result is not None:
+                results.append(result)
+            else:
+                with self.lock:
+                    failure = self.failures.get(os.path.abspath(path))
+                if failure is not None:
+                    failures.append(failure)
+        return results, failures
+
+
+def render_results(
+    results: List[FileResult], output_format: str, show_passing: bool
+) -> Tuple[str, int]:
+    stream = io.StringIO()
+    reporter = REPORTERS[output_format](stream, show_passing=show_passing)
+    for result in results:
+        reporter.report(result)
+    reporter.finish()
+    return stream.getvalue(), reporter.n_errors
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server = self.server
+        assert isinstance(server, DaemonServer)
+        request = json.loads(self.rfile.readline())
+        if request.get("command") == "ping":
+            self.send({"output": "", "failures": [], "exit_code": 0})
+            return
+        if request.get("command") == "stop":
+            self.send({"output": "", "failures": [], "exit_code": 0})
+            threading.Thread(target=server.shutdown, daemon=True).start()
+            return
+        results, failures = server.state.query(
+            [Path(p) for p in request.get("paths", [])]
+        )
+        output, n_errors = render_results(
+            results, request.get("format", "text"), request.get("show_passing", False)
+        )
+        self.send(
+            {
+                "output": output,
+                "failures": failures,
+                "exit_code": 1 if n_errors > 0 or len(failures) > 0 else 0,
+            }
+        )
+
+    def send(self, response: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, state: ProjectState):
+        self.state = state
+        super().__init__(str(socket_path), DaemonRequestHandler)
+
+
+def poll_for_changes(
+    state: ProjectState, interval: float, stopped: threading.Event
+) -> None:
+    # Portable fallback for filesystem notifications: re-stat every file each interval
+    while not stopped.wait(interval):
+        state.refresh_all()
+
+
+def remove_stale_socket(socket_path: Path) -> None:
+    if not socket_path.exists():
+        return
+    try:
+        query_daemon(socket_path, {"command": "ping"})
+    except OSError:
+        socket_path.unlink()
+        return
+    raise RuntimeError(f"a daemon is already listening on {socket_path}")
+
+
+def run_daemon(
+    state: ProjectState,
+    socket_path: Path = DEFAULT_SOCKET_PATH,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> None:
+    remove_stale_socket(socket_path)
+    state.refresh_all()
+    stopped = threading.Event()
+    poller = threading.Thread(
+        target=poll_for_changes, args=(state, poll_interval, stopped), daemon=True
+    )
+    poller.start()
+    try:
+        with DaemonServer(socket_path, state) as server:
+            server.serve_forever()
+    finally:
+        stopped.set()
+        if socket_path.exists():
+            socket_path.unlink()
@@ -0,0 +1,16 @@
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict
+
+# Kept apart from the daemon itself so the client starts without importing the checker
+DEFAULT_SOCKET_PATH = Path(".auto_docstring.sock")
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def query_daemon(socket_path: Path, request: Dict[str, Any]) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
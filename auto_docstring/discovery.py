@@ -0,0 +1,308 @@
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+# Never worth descending into, whatever the ignore files say
+DEFAULT_EXCLUDED_DIRECTORIES = frozenset(
+    {
+        ".auto_docstring_cache",
+        ".eggs",
+        ".git",
+        ".hg",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".svn",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+        "venv",
+    }
+)
+# A directory containing this file is a virtual environment
+VIRTUAL_ENVIRONMENT_MARKER = "pyvenv.cfg"
+PYTHON_FILE_SUFFIX = ".py"
+
+
+def is_anchored_glob(pattern: str) -> bool:
+    # Patterns without a slash, other than a trailing one, match at any depth
+    return "/" in pattern.rstrip("/")
+
+
+def translate_glob(pattern: str) -> str:
+    # Translates one gitignore-style glob into a regex matching a relative POSIX path
+    anchored = is_anchored_glob(pattern)
+    return ("" if anchored else "(?:.*/)?") + translate_glob_body(pattern.strip("/"))
+
+
+def translate_glob_body(pattern: str) -> str:
+    parts: List[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            character_class = pattern[i + 1 : end]
+            if character_class.startswith("!"):
+                character_class = "^" + character_class[1:]
+            parts.append("[" + character_class.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    # All patterns become one alternation, so each path is matched in a single call
+    regexes = [translate_glob(p) for p in patterns]
+    if len(regexes) == 0:
+        return None
+    return re.compile("(?:" + "|".join(regexes) + ")")
+
+
+class IgnoreMatcher:
+    def __init__(self, patterns: Sequence[str]):
+        # Negated patterns re-include paths, directory-only patterns end in a slash
+        positive = [p for p in patterns if not p.startswith("!")]
+        negative = [p[1:] for p in patterns if p.startswith("!")]
+        self.directory_pattern = compile_globs(positive)
+        self.file_pattern = compile_globs(p for p in positive if not p.endswith("/"))
+        self.negated_directory_pattern = compile_globs(negative)
+        self.negated_file_pattern = compile_globs(
+            p for p in negative if not p.endswith("/")
+        )
+
+    def matches(self, relative_path: str, is_directory: bool) -> bool:
+        if is_directory:
+            pattern, negated_pattern = (
+                self.directory_pattern,
+                self.negated_directory_pattern,
+            )
+        else:
+            pattern, negated_pattern = self.file_pattern, self.negated_file_pattern
+        return (
+            pattern is not None
+            and pattern.fullmatch(relative_path) is not None
+            and (
+                negated_pattern is None
+                or negated_pattern.fullmatch(relative_path) is None
+            )
+        )
+
+
+def translate_path_glob(pattern: str) -> str:
+    # Also matches everything below a matching directory, directory-only patterns
+    # only match below it
+    suffix = "/.*" if pattern.endswith("/") else "(?:/.*)?"
+    return translate_glob(pattern) + suffix
+
+
+def join_regexes(regexes: Iterable[str]) -> str:
+    return "(?:" + "|".join(regexes) + ")"
+
+
+def translate_directory_prefix_glob(pattern: str) -> str:
+    # Matches the directories a walk passes through to reach a match, and those
+    # below a match. Only the leading segments without `**` narrow it down
+    if not is_anchored_glob(pattern):
+        return ".*"
+    segments = []
+    for segment in pattern.strip("/").split("/"):
+        if "**" in segment:
+            break
+        segments.append(translate_glob_body(segment))
+    if len(segments) == 0:
+        return ".*"
+    # `a(?:/b(?:/.*)?)?` for the segments `a` and `b`
+    regex = "(?:/.*)?"
+    for segment in reversed(segments[1:]):
+        regex = f"(?:/{segment}{regex})?"
+    return segments[0] + regex
+
+
+class PathClassifier:
+    # Sorts paths below `root` into excluded ones, ones in none of the groups and ones
+    # in one of the groups, with a single match against one regex. Alternatives are
+    # tried in order, so exclusion comes first and later groups win over earlier ones
+    def __init__(
+        self,
+        root: Path,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        groups: Sequence[Sequence[str]] = (),
+    ):
+        self.root = os.path.abspath(root)
+        self.has_include = len(include) > 0
+        alternatives = []
+        if len(exclude) > 0:
+            alternatives.append(
+                f"(?P<exclude>{join_regexes(translate_path_glob(p) for p in exclude)})"
+            )
+        # Groups only apply to included paths
+        include_regex = join_regexes(translate_path_glob(p) for p in include)
+        lookahead = f"(?={include_regex}\\Z)" if self.has_include else ""
+        for i in reversed(range(len(groups))):
+            if len(groups[i]) > 0:
+                group_regex = join_regexes(translate_path_glob(p) for p in groups[i])
+                alternatives.append(f"(?P<group{i + 1}>{lookahead}{group_regex})")
+        if self.has_include:
+            alternatives.append(f"(?P<group0>{include_regex})")
+        self.pattern = (
+            None if len(alternatives) == 0 else re.compile("|".join(alternatives))
+        )
+        # Directories that can hold included files, so the walk skips the others
+        self.include_directory_pattern = (
+            re.compile(
+                join_regexes(translate_directory_prefix_glob(p) for p in include)
+            )
+            if self.has_include
+            else None
+        )
+
+    def get_relative_path(self, path: str) -> Optional[str]:
+        path = os.path.abspath(path)
+        if not path.startswith(self.root + os.sep):
+            return None
+        relative_path = path[len(self.root) + 1 :]
+        if os.sep != "/":
+            relative_path = relative_path.replace(os.sep, "/")
+        return relative_path
+
+    def classify(self, path: str) -> Optional[int]:
+        # None when excluded, otherwise 0 or one more than the index of the group
+        relative_path = self.get_relative_path(path)
+        if relative_path is None or self.pattern is None:
+            # Outside the project nothing applies
+            return 0
+        match = self.pattern.fullmatch(relative_path)
+        if match is None:
+            return None if self.has_include else 0
+        group = match.lastgroup
+        assert group is not None, "every alternative of the pattern is a named group"
+        if group == "exclude":
+            return None
+        return int(group[len("group") :])
+
+    def excludes_directory(self, path: str) -> bool:
+        # True when no file below the directory can be classified as anything but
+        # excluded, either because it is excluded or because no include can match
+        relative_path = self.get_relative_path(path)
+        if relative_path is None or self.pattern is None:
+            return False
+        if (
+            self.include_directory_pattern is not None
+            and self.include_directory_pattern.fullmatch(relative_path) is None
+        ):
+            return True
+        match = self.pattern.fullmatch(relative_path + "/")
+        return match is not None and match.lastgroup == "exclude"
+
+
+def read_gitignore(gitignore_path: str) -> List[str]:
+    try:
+        with open(gitignore_path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    patterns = []
+    for line in lines:
+        line = line.rstrip()
+        if len(line) == 0 or line.startswith("#"):
+            continue
+        patterns.append(line)
+    return patterns
+
+
+# An ignore matcher together with the directory its patterns are relative to
+ScopedMatcher = Tuple[str, IgnoreMatcher]
+
+
+def is_ignored(
+    path: str, is_directory: bool, matchers: Sequence[ScopedMatcher]
+) -> bool:
+    for base, matcher in matchers:
+        # Paths are always built by joining onto `base`, so slicing is enough
+        relative_path = path[len(base) + 1 :]
+        if os.sep != "/":
+            relative_path = relative_path.replace(os.sep, "/")
+        if matcher.matches(relative_path, is_directory):
+            return True
+    return False
+
+
+def walk_directory(
+    directory: str,
+    matchers: List[ScopedMatcher],
+    classifier: Optional[PathClassifier] = None,
+) -> Iterator[Path]:
+    try:
+        with os.scandir(directory) as scanned:
+            entries = sorted(scanned, key=lambda e: e.name)
+    except OSError:
+        return
+    names = {e.name for e in entries}
+    if VIRTUAL_ENVIRONMENT_MARKER in names:
+        return
+    if ".gitignore" in names:
+        patterns = read_gitignore(os.path.join(directory, ".gitignore"))
+        if len(patterns) > 0:
+            matchers = matchers + [(directory, IgnoreMatcher(patterns))]
+
+    subdirectories = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            # Pruned before descending, so ignored trees are never listed
+            if (
+                entry.name not in DEFAULT_EXCLUDED_DIRECTORIES
+                and not is_ignored(entry.path, True, matchers)
+                and (
+                    classifier is None or not classifier.excludes_directory(entry.path)
+                )
+            ):
+                subdirectories.append(entry.path)
+        elif (
+            entry.name.endswith(PYTHON_FILE_SUFFIX)
+            and not is_ignored(entry.path, False, matchers)
+            and (classifier is None or classifier.classify(entry.path) is not None)
+        ):
+            yield Path(entry.path)
+    for subdirectory in subdirectories:
+        yield from walk_directory(subdirectory, matchers, classifier)
+
+
+def discover_python_files(
+    paths: Iterable[Path],
+    exclude: Sequence[str] = (),
+    classifier: Optional[PathClassifier] = None,
+) -> Iterator[Path]:
+    # Files named explicitly are checked unless the project configuration excludes
+    # them, directories are walked lazily
+    for path in paths:
+        if not path.is_dir():
+            if classifier is None or classifier.classify(str(path)) is not None:
+                yield path
+            continue
+        if classifier is not None and classifier.excludes_directory(str(path)):
+            continue
+        matchers: List[ScopedMatcher] = []
+        if len(exclude) > 0:
+            matchers.append((str(path), IgnoreMatcher(exclude)))
+        yield from walk_directory(str(path), matchers, classifier)
@@ -1,92 +1,87 @@
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
 
+from auto_docstring.positions import SourceSpan
 
+
+# Results for a whole repository are kept in memory for reporting, so errors are
+# slotted and share their file path and function name with the rest of the run
+@dataclass(frozen=True, slots=True)
 class DocstringError:
-    def __init__(self, file_path: Path, function_name: str):
-        self.function_name = function_name
-        self.file_path = file_path
-        # line_number: int  # TODO: implement
+    file_path: Path
+    function_name: str
+    # Shared by the errors of a function, left out of comparisons so an error stays
+    # the same when unrelated edits move it
+    span: Optional[SourceSpan] = field(default=None, kw_only=True, compare=False)
 
+    def get_message(self) -> str:
+        return ""
 
+
+@dataclass(frozen=True, slots=True)
 class IncorrectArgumentTypehintError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str, argument_name: str):
-        super().__init__(file_path, function_name)
-        self.argument_name = argument_name
+    argument_name: str
 
     def get_message(self) -> str:
         return f"Function `{self.function_name}` argument `{self.argument_name}` has the wrong type hint."
 
 
+@dataclass(frozen=True, slots=True)
 class IncorrectReturnTypehintError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str):
-        super().__init__(file_path, function_name)
-
     def get_message(self) -> str:
         return ""
 
 
+@dataclass(frozen=True, slots=True)
 class MissingArgsSectionError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str):
-        super().__init__(file_path, function_name)
-
     def get_message(self) -> str:
         return ""
 
 
+@dataclass(frozen=True, slots=True)
 class MissingArgumentTypehintError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str, argument_name: str):
-        super().__init__(file_path, function_name)
-        self.argument_name = argument_name
+    argument_name: str
 
     def get_message(self) -> str:
         return f"Function `{self.function_name}` argument `{self.argument_name}` did not have a type hint."
 
 
+@dataclass(frozen=True, slots=True)
 class MissingArgumentError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str, argument_name: str):
-        super().__init__(file_path, function_name)
-        self.argument_name = argument_name
+    argument_name: str
 
     def get_message(self) -> str:
         return f"Function `{self.function_name}` argument `{self.argument_name}` did not have a type hint."
 
 
+@dataclass(frozen=True, slots=True)
 class MissingDocstringError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str):
-        super().__init__(file_path, function_name)
-
     def get_message(self) -> str:
         return f"Function `{self.function_name}` is missing a docstring."
 
 
+@dataclass(frozen=True, slots=True)
 class MissingReturnTypehintError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str):
-        super().__init__(file_path, function_name)
-
     def get_message(self) -> str:
         return ""
 
 
+@dataclass(frozen=True, slots=True)
 class MissingReturnsSectionError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str):
-        super().__init__(file_path, function_name)
-
     def get_message(self) -> str:
         return ""
 
 
+@dataclass(frozen=True, slots=True)
 class MissingSummaryError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str):
-        super().__init__(file_path, function_name)
-
     def get_message(self) -> str:
         return ""
 
 
+@dataclass(frozen=True, slots=True)
 class UndocumentedArgumentError(DocstringError):
-    def __init__(self, file_path: Path, function_name: str, argument_name: str):
-        super().__init__(file_path, function_name)
-        self.argument_name = argument_name
+    argument_name: str
 
     def get_message(self) -> str:
         return ""
@@ -0,0 +1,495 @@
+import mmap
+import os
+import time
+import tokenize
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from functools import lru_cache, partial
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from auto_docstring import (
+    FunctionParts,
+    ScopeRules,
+    check_docstring,
+    iter_functions,
+    parse_python_code,
+)
+from auto_docstring.cache import ResultCache
+from auto_docstring.config import PathRules
+from auto_docstring.docstring_errors import DocstringError
+from auto_docstring.git_diff import ChangedLines
+from auto_docstring.positions import LineRanges, SourcePositions
+from auto_docstring.scanner import scan_functions
+from auto_docstring.stats import FileStats
+from auto_docstring.styles import AUTO_STYLE, resolve_docstring_style
+from auto_docstring.symbols import (
+    ModuleScope,
+    SymbolIndex,
+    get_worker_symbol_index,
+    set_worker_symbol_index,
+)
+
+# Every function definition, including `async def`, contains this keyword
+FUNCTION_KEYWORD = b"def"
+# An encoding cookie has to be on the first or second line
+COOKIE_SEARCH_BYTES = 4096
+# Reads mostly wait on the filesystem, so more threads than cores pay off on
+# network filesystems
+DEFAULT_READ_THREADS = 8
+# Files are read and sent to workers in batches, amortising the cost of each hand-off
+BATCH_SIZE = 8
+# Batches read or checked ahead of the output per job, bounding what is held in memory
+PIPELINE_DEPTH_PER_JOB = 4
+# What a broken or unreadable file raises, reported for that file while the rest of
+# the run goes on
+FILE_ERRORS = (SyntaxError, ValueError, OSError)
+
+
+@dataclass(frozen=True, slots=True)
+class FunctionResult:
+    name: str
+    errors: List[DocstringError]
+
+
+@dataclass(frozen=True, slots=True)
+class FileResult:
+    file_path: Path
+    functions: List[FunctionResult]
+    # Only collected when timing is switched on
+    stats: Optional[FileStats] = None
+    # Why the file could not be checked, its functions are then empty
+    failure: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def is_ascii_compatible(encoding: str) -> bool:
+    try:
+        return FUNCTION_KEYWORD.decode(encoding) == "def"
+    except (LookupError, UnicodeError):
+        return False
+
+
+def may_define_functions(source: Union[bytes, mmap.mmap]) -> bool:
+    # False only when the file certainly has no `def`, anything unusual is left for
+    # `ast.parse` to handle or report
+    if source.find(FUNCTION_KEYWORD) >= 0:
+        return True
+    lines = iter(source[:COOKIE_SEARCH_BYTES].splitlines(keepends=True))
+    try:
+        encoding, _ = tokenize.detect_encoding(lambda: next(lines, b""))
+    except SyntaxError:
+        return True
+    # In an encoding like UTF-16 the keyword would not appear as these bytes
+    return not is_ascii_compatible(encoding)
+
+
+def read_checkable_source(file_path: Path) -> Optional[bytes]:
+    # Scans the mapped file first, so files without functions are never copied,
+    # decoded or parsed
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if not may_define_functions(mapped):
+                return None
+            # `ast.parse` decodes bytes itself, honouring any encoding cookie
+            return mapped[:]
+
+
+def extract_functions_with_ast(
+    source: bytes,
+    rules: ScopeRules,
+    stats: Optional[FileStats],
+    line_ranges: Optional[LineRanges] = None,
+    positions: Optional[SourcePositions] = None,
+) -> Iterator[FunctionParts]:
+    # With timing off every hook is a single `is not None` check
+    start = time.perf_counter() if stats is not None else 0.0
+    tree = parse_python_code(source)
+    if stats is not None:
+        stats.lap("parse", start)
+    # Functions are found while they are checked, so that time counts as collecting
+    return iter_functions(tree, rules, line_ranges, positions)
+
+
+def extract_functions_with_scanner(
+    source: bytes,
+    rules: ScopeRules,
+    stats: Optional[FileStats],
+    line_ranges: Optional[LineRanges] = None,
+    positions: Optional[SourcePositions] = None,
+) -> Iterator[FunctionParts]:
+    # Scanning and parsing are interleaved, so all of it counts as collecting
+    start = time.perf_counter() if stats is not None else 0.0
+    functions = scan_functions(source, rules, line_ranges, positions)
+    if stats is not None:
+        stats.lap("collect", start)
+    return iter(functions)
+
+
+Engine = Callable[
+    [
+        bytes,
+        ScopeRules,
+        Optional[FileStats],
+        Optional[LineRanges],
+        Optional[SourcePositions],
+    ],
+    Iterator[FunctionParts],
+]
+# Front ends that find the functions in a file, both give the same `FunctionParts`
+ENGINES: Dict[str, Engine] = {
+    "ast": extract_functions_with_ast,
+    "scanner": extract_functions_with_scanner,
+}
+DEFAULT_ENGINE = "ast"
+
+
+def iter_checked_functions(
+    file_path: Path,
+    source: bytes,
+    rules: ScopeRules = ScopeRules(),
+    stats: Optional[FileStats] = None,
+    engine: str = DEFAULT_ENGINE,
+    line_ranges: Optional[LineRanges] = None,
+    docstring_style: str = AUTO_STYLE,
+    scope: Optional[ModuleScope] = None,
+) -> Iterator[Tuple[FunctionParts, List[DocstringError]]]:
+    docstring_style = resolve_docstring_style(docstring_style, source)
+    # Decoded and split into lines by the first error that needs a span, if any
+    positions = SourcePositions(source)
+    functions = ENGINES[engine](source, rules, stats, line_ranges, positions)
+    start = time.perf_counter() if stats is not None else 0.0
+    for f in functions:
+        if stats is not None:
+            start = stats.lap("collect", start)
+        errors = check_docstring(file_path, f, stats, docstring_style, scope)
+        if stats is not None:
+            function_start, start = start, stats.lap("check", start)
+            stats.function_seconds.append((f.qualname, start - function_start))
+        yield f, errors
+
+
+def check_source(
+    file_path: Path,
+    source: bytes,
+    rules: ScopeRules = ScopeRules(),
+    stats: Optional[FileStats] = None,
+    engine: str = DEFAULT_ENGINE,
+    line_ranges: Optional[LineRanges] = None,
+    docstring_style: str = AUTO_STYLE,
+    scope: Optional[ModuleScope] = None,
+) -> FileResult:
+    function_results = [
+        FunctionResult(name=f.qualname, errors=errors)
+        for f, errors in iter_checked_functions(
+            file_path, source, rules, stats, engine, line_ranges, docstring_style, scope
+        )
+    ]
+    return FileResult(file_path, function_results, stats)
+
+
+def rebind_file_path(
+    functions: List[FunctionResult], file_path: Path
+) -> List[FunctionResult]:
+    # Entries are shared between files with identical contents
+    return [
+        FunctionResult(f.name, [replace(e, file_path=file_path) for e in f.errors])
+        for f in functions
+    ]
+
+
+@dataclass(slots=True)
+class FileTask:
+    # A file that was read but still has to be checked
+    file_path: Path
+    source: bytes
+    line_ranges: Optional[LineRanges]
+    # Only set when the result should be stored in the cache
+    cache_key: Optional[str]
+    stats: Optional[FileStats]
+    # Only set when the rules for this path differ from the ones of the run
+    rules: Optional[ScopeRules] = None
+    # With a symbol index, the key is only known once the check has recorded the
+    # modules it looked names up in. These are stored under `modules_key`, and
+    # the result under a key from `cache_settings` and those modules
+    modules_key: Optional[str] = None
+    cache_settings: bytes = b""
+
+
+def load_file(
+    file_path: Path,
+    cache: Optional[ResultCache] = None,
+    collect_stats: bool = False,
+    changed_lines: Optional[ChangedLines] = None,
+    path_rules: Optional[PathRules] = None,
+    symbols: Optional[SymbolIndex] = None,
+) -> Union[FileResult, FileTask]:
+    # Everything that waits on the filesystem, the result when no checking is needed
+    stats = FileStats() if collect_stats else None
+    start = time.perf_counter() if stats is not None else 0.0
+    source = read_checkable_source(file_path)
+    if stats is not None:
+        stats.n_bytes = 0 if source is None else len(source)
+        stats.skipped = source is None
+        start = stats.lap("read", start)
+    if source is None:
+        return FileResult(file_path, [], stats)
+    line_ranges = None
+    if changed_lines is not None:
+        # Files missing from a diff have not changed at all
+        line_ranges = changed_lines.get(os.path.realpath(file_path), [])
+    rules = None if path_rules is None else path_rules.get_rules(file_path)
+    if cache is None or line_ranges is not None:
+        # Results for part of a file are never cached
+        return FileTask(file_path, source, line_ranges, None, stats, rules)
+
+    settings = b"" if rules is None else repr(rules).encode()
+    modules_key = None
+    functions = None
+    if symbols is None:
+        key: Optional[str] = cache.get_key(source, settings)
+    else:
+        # Relative imports resolve differently in another module
+        settings += f":{symbols.get_file_module_name(file_path)}:".encode()
+        modules_key = cache.get_key(source, settings + b"modules")
+        used_modules = cache.load(modules_key)
+        key = (
+            None
+            if used_modules is None
+            else cache.get_key(
+                source, settings + symbols.get_modules_fingerprint(used_modules)
+            )
+        )
+    if key is not None:
+        functions = cache.load(key)
+    if stats is not None:
+        stats.lap("cache", start)
+    if functions is not None:
+        if stats is not None:
+            stats.from_cache = True
+        return FileResult(file_path, rebind_file_path(functions, file_path), stats)
+    return FileTask(file_path, source, None, key, stats, rules, modules_key, settings)
+
+
+def check_task(
+    task: FileTask,
+    cache: Optional[ResultCache] = None,
+    rules: ScopeRules = ScopeRules(),
+    engine: str = DEFAULT_ENGINE,
+    docstring_style: str = AUTO_STYLE,
+    symbols: Optional[SymbolIndex] = None,
+) -> FileResult:
+    stats = task.stats
+    if symbols is None:
+        # Worker processes get the index once, when they start
+        symbols = get_worker_symbol_index()
+    scope = None if symbols is None else symbols.get_scope(task.file_path)
+    result = check_source(
+        task.file_path,
+        task.source,
+        rules if task.rules is None else task.rules,
+        stats,
+        engine,
+        task.line_ranges,
+        docstring_style,
+        scope,
+    )
+    if cache is not None and task.modules_key is not None and scope is not None:
+        assert symbols is not None
+        start = time.perf_counter() if stats is not None else 0.0
+        used_modules = sorted(scope.used_modules)
+        cache.store(task.modules_key, used_modules)
+        cache.store(
+            cache.get_key(
+                task.source,
+                task.cache_settings + symbols.get_modules_fingerprint(used_modules),
+            ),
+            result.functions,
+        )
+        if stats is not None:
+            stats.lap("cache", start)
+    elif cache is not None and task.cache_key is not None:
+        start = time.perf_counter() if stats is not None else 0.0
+        cache.store(task.cache_key, result.functions)
+        if stats is not None:
+            stats.lap("cache", start)
+    return result
+
+
+def check_file(
+    file_path: Path,
+    cache: Optional[ResultCache] = None,
+    rules: ScopeRules = ScopeRules(),
+    collect_stats: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    changed_lines: Optional[ChangedLines] = None,
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+    symbols: Optional[SymbolIndex] = None,
+) -> FileResult:
+    loaded = load_file(
+        file_path, cache, collect_stats, changed_lines, path_rules, symbols
+    )
+    if isinstance(loaded, FileResult):
+        return loaded
+    return check_task(loaded, cache, rules, engine, docstring_style, symbols)
+
+
+def resolve_jobs(jobs: int) -> int:
+    # Zero or a negative number means "use every core"
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def get_chunksize(n_files: int, jobs: int) -> int:
+    # A few chunks per worker amortises the IPC cost without starving the pool
+    # when some files are much bigger than others
+    return max(1, n_files // (jobs * 4))
+
+
+@dataclass(slots=True)
+class LoadedBatch:
+    loaded: List[Union[FileResult, FileTask]]
+    # Results for the tasks in `loaded` when they are checked by worker processes
+    checked: Optional["Future[List[FileResult]]"] = None
+
+
+def get_failed_result(
+    file_path: Path, error: Exception, stats: Optional[FileStats] = None
+) -> FileResult:
+    return FileResult(file_path, [], stats, f"{file_path}: {error}")
+
+
+def check_tasks(
+    tasks: List[FileTask],
+    cache: Optional[ResultCache] = None,
+    rules: ScopeRules = ScopeRules(),
+    engine: str = DEFAULT_ENGINE,
+    docstring_style: str = AUTO_STYLE,
+    symbols: Optional[SymbolIndex] = None,
+) -> List[FileResult]:
+    results = []
+    for task in tasks:
+        try:
+            result = check_task(task, cache, rules, engine, docstring_style, symbols)
+        except FILE_ERRORS as e:
+            result = get_failed_result(task.file_path, e, task.stats)
+        results.append(result)
+    return results
+
+
+def try_load(
+    load: Callable[[Path], Union[FileResult, FileTask]], file_path: Path
+) -> Union[FileResult, FileTask]:
+    try:
+        return load(file_path)
+    except FILE_ERRORS as e:
+        return get_failed_result(file_path, e)
+
+
+def load_batch(
+    file_paths: List[Path],
+    load: Callable[[Path], Union[FileResult, FileTask]],
+    check: Callable[[List[FileTask]], List[FileResult]],
+    workers: Optional[ProcessPoolExecutor],
+) -> LoadedBatch:
+    loaded = [try_load(load, p) for p in file_paths]
+    tasks = [t for t in loaded if isinstance(t, FileTask)]
+    if workers is None or len(tasks) == 0:
+        return LoadedBatch(loaded)
+    # Checked as soon as it is read, regardless of its place in the output
+    return LoadedBatch(loaded, workers.submit(check, tasks))
+
+
+def finish_batch(
+    batch: LoadedBatch, check: Callable[[List[FileTask]], List[FileResult]]
+) -> Iterator[FileResult]:
+    checked = iter([] if batch.checked is None else batch.checked.result())
+    for loaded in batch.loaded:
+        if not isinstance(loaded, FileTask):
+            yield loaded
+        elif batch.checked is not None:
+            yield next(checked)
+        else:
+            yield from check([loaded])
+
+
+def check_files(
+    file_paths: Iterable[Path],
+    jobs: int = 1,
+    cache: Optional[ResultCache] = None,
+    rules: ScopeRules = ScopeRules(),
+    collect_stats: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    changed_lines: Optional[ChangedLines] = None,
+    read_threads: int = DEFAULT_READ_THREADS,
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+    symbols: Optional[SymbolIndex] = None,
+) -> Generator[FileResult, None, None]:
+    # Threads read batches of files ahead while the checks run, in worker processes
+    # or here with a single job, and results come out in input order. A file that
+    # cannot be read or parsed gives a result with a `failure` instead of an exception
+    # Closing the generator early shuts the pools down
+    jobs = resolve_jobs(jobs)
+    load = partial(
+        load_file,
+        cache=cache,
+        collect_stats=collect_stats,
+        changed_lines=changed_lines,
+        path_rules=path_rules,
+        symbols=symbols,
+    )
+    check = partial(
+        check_tasks,
+        cache=cache,
+        rules=rules,
+        engine=engine,
+        docstring_style=docstring_style,
+        # Sent to worker processes once instead of with every batch
+        symbols=symbols if jobs == 1 else None,
+    )
+    file_paths = iter(file_paths)
+    with ExitStack() as stack:
+        readers = stack.enter_context(ThreadPoolExecutor(max_workers=read_threads))
+        workers = (
+            None
+            if jobs == 1
+            else stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=jobs,
+                    initializer=set_worker_symbol_index,
+                    initargs=(symbols,),
+                )
+            )
+        )
+        # Files are only read once there is room, so memory stays flat however
+        # many files are queued and however slow the consumer is
+        max_pending = read_threads + jobs * PIPELINE_DEPTH_PER_JOB
+        pending: Deque["Future[LoadedBatch]"] = deque()
+        while True:
+            batch = list(islice(file_paths, BATCH_SIZE))
+            if len(batch) == 0:
+                break
+            if len(pending) >= max_pending:
+                yield from finish_batch(pending.popleft().result(), check)
+            pending.append(readers.submit(load_batch, batch, load, check, workers))
+        while len(pending) > 0:
+            yield from finish_batch(pending.popleft().result(), check)
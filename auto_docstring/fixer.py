@@ -0,0 +1,395 @@
+import ast
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from auto_docstring import (
+    AnyFunctionDef,
+    FunctionArgument,
+    FunctionParts,
+    ScopeRules,
+    collect_functions,
+    extract_docstring_parts,
+    generate_docstring,
+    generate_docstring_argument,
+    get_documented_arguments,
+    get_indentation_width,
+    match_argument_entries,
+    parse_args_from_docstring,
+    parse_python_code,
+)
+from auto_docstring.config import PathRules
+from auto_docstring.engine import (
+    FILE_ERRORS,
+    get_chunksize,
+    read_checkable_source,
+    resolve_jobs,
+)
+from auto_docstring.positions import (
+    LINE_BREAK_PATTERN,
+    LineChange,
+    LineOffsetTable,
+    decode_source,
+)
+from auto_docstring.styles import AUTO_STYLE, resolve_docstring_style
+
+INDENT = "    "
+
+
+@dataclass
+class Edit:
+    start: int
+    end: int
+    text: str
+
+
+def apply_edits(text: str, edits: List[Edit]) -> str:
+    # All edits are spliced into the original text in one pass
+    parts = []
+    position = 0
+    for edit in sorted(edits, key=lambda e: e.start):
+        parts.append(text[position : edit.start])
+        parts.append(edit.text)
+        position = edit.end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def count_line_breaks(text: str) -> int:
+    return len(LINE_BREAK_PATTERN.findall(text))
+
+
+def get_line_changes(text: str, edits: List[Edit]) -> List[LineChange]:
+    # Edits on the same line are one change, as lines are what a diff compares
+    table = LineOffsetTable(text)
+    merged: List[List[int]] = []
+    for edit in sorted(edits, key=lambda e: e.start):
+        first = table.get_position(edit.start)[0]
+        last = table.get_position(edit.end)[0]
+        added = count_line_breaks(edit.text)
+        added -= count_line_breaks(text[edit.start : edit.end])
+        if len(merged) > 0 and first <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], last)
+            merged[-1][2] += added
+        else:
+            merged.append([first, last, added])
+    return [
+        (first, last - first + 1, last - first + 1 + added)
+        for first, last, added in merged
+    ]
+
+
+def format_docstring_literal(docstring: str, indentation: str, newline: str) -> str:
+    lines = ['"""']
+    lines.extend(
+        indentation + line if len(line) > 0 else "" for line in docstring.split("\n")
+    )
+    lines.append(indentation + '"""')
+    return newline.join(lines)
+
+
+def get_statement_start(statement: ast.stmt) -> Tuple[int, int]:
+    # Decorators come before the `def` or `class` line
+    decorators = getattr(statement, "decorator_list", [])
+    if len(decorators) > 0:
+        return decorators[0].lineno, decorators[0].col_offset - 1
+    return statement.lineno, statement.col_offset
+
+
+def get_cleaned_line_offset(lines: List[str]) -> int:
+    # How many lines of a literal `ast.get_docstring` drops before the docstring,
+    # the same way as `inspect.cleandoc`
+    lines = [line.expandtabs() for line in lines]
+    margin = min(
+        (get_indentation_width(line) for line in lines[1:] if len(line.strip()) > 0),
+        default=0,
+    )
+    cleaned = [lines[0].lstrip()] + [line[margin:] for line in lines[1:]]
+    return next((i for i, line in enumerate(cleaned) if len(line) > 0), 0)
+
+
+def find_section_line(lines: List[str], header: str, section: str) -> Optional[int]:
+    # The header whose section `extract_docstring_parts` returned as `section`
+    n_lines = section.count("\n") + 1
+    for i, line in enumerate(lines):
+        if line == header and "\n".join(lines[i + 1 : i + 1 + n_lines]) == section:
+            return i
+    return None
+
+
+# Undocumented arguments and the docstring line they go after
+Insertion = Tuple[int, List[FunctionArgument]]
+
+
+def get_entry_insertions(
+    arguments: List[FunctionArgument], args: str, lines: List[str]
+) -> Optional[Tuple[List[Insertion], int]]:
+    # Each argument lands at its place in the signature, since entries are checked
+    # in order. Also the line of the first entry, whose indentation new ones copy
+    header = find_section_line(lines, "Args:", args)
+    if header is None:
+        return None
+    n_lines = args.count("\n") + 1
+    entry_lines = {}
+    for i, matches in enumerate(
+        match_argument_entries(lines[header + 1 : header + 1 + n_lines])
+    ):
+        if matches is not None:
+            entry_lines.setdefault(matches.group("name"), header + 1 + i)
+    if len(entry_lines) == 0:
+        return None
+    insertions: List[Insertion] = []
+    missing: List[FunctionArgument] = []
+    for argument in arguments:
+        if argument.name not in entry_lines:
+            missing.append(argument)
+        elif len(missing) > 0:
+            # Before the entry of the next documented argument
+            insertions.append((entry_lines[argument.name] - 1, missing))
+            missing = []
+    if len(missing) > 0:
+        insertions.append((header + n_lines, missing))
+    return insertions, min(entry_lines.values())
+
+
+class FixContext:
+    def __init__(self, text: str, positions: Optional[LineOffsetTable] = None):
+        self.text = text
+        self.positions = LineOffsetTable(text) if positions is None else positions
+        self.line_offsets = self.positions.line_offsets
+        self.newline = "\r\n" if "\r\n" in text[: self.line_offsets[1]] else "\n"
+
+    def get_offset(self, lineno: int, col_offset: int) -> int:
+        return self.positions.get_offset(lineno, col_offset)
+
+    def get_indentation(self, lineno: int) -> str:
+        line = self.text[self.line_offsets[lineno - 1] : self.line_offsets[lineno]]
+        return line[: len(line) - len(line.lstrip(" \t"))]
+
+    def insert_docstring(self, node: AnyFunctionDef, docstring: str) -> Edit:
+        lineno, col_offset = get_statement_start(node.body[0])
+        line_start = self.line_offsets[lineno - 1]
+        start = self.get_offset(lineno, col_offset)
+        if self.text[line_start:start].strip() == "":
+            # The body starts on its own line, put the docstring on the line above
+            indentation = self.text[line_start:start]
+            literal = format_docstring_literal(docstring, indentation, self.newline)
+            return Edit(line_start, line_start, indentation + literal + self.newline)
+        # The body follows the colon, as in `def f(): pass`
+        indentation = self.get_indentation(node.lineno) + INDENT
+        literal = format_docstring_literal(docstring, indentation, self.newline)
+        colon_end = len(self.text[:start].rstrip(" \t"))
+        return Edit(
+            colon_end,
+            start,
+            self.newline + indentation + literal + self.newline + indentation,
+        )
+
+    def get_line_end(self, lineno: int) -> int:
+        # Before the line break
+        line = self.text[self.line_offsets[lineno - 1] : self.line_offsets[lineno]]
+        return self.line_offsets[lineno - 1] + len(line.rstrip("\r\n"))
+
+    def complete_docstring(
+        self, node: AnyFunctionDef, function: FunctionParts
+    ) -> List[Edit]:
+        # Splices entries for undocumented arguments into the literal, indented like
+        # the entries already there. Every other character is left as it was
+        assert function.docstring is not None
+        literal_node = node.body[0]
+        assert literal_node.end_lineno is not None
+        assert literal_node.end_col_offset is not None
+        start = self.get_offset(literal_node.lineno, literal_node.col_offset)
+        end = self.get_offset(literal_node.end_lineno, literal_node.end_col_offset)
+        literal_source = self.text[start:end]
+        # Only a plain triple-quoted literal can be rewritten faithfully, not one with
+        # a prefix, escapes or implicit concatenation
+        if (
+            len(literal_source) < 6
+            or not literal_source.startswith('"""')
+            or not literal_source.endswith('"""')
+            or '"""' in literal_source[3:-3]
+            or "\\" in literal_source
+        ):
+            return []
+        try:
+            parts = extract_docstring_parts(function.docstring)
+            documented = parse_args_from_docstring(parts.args or "")
+        except ValueError:
+            return []
+        documented_names = {a.name for a in documented}
+        arguments = get_documented_arguments(function)
+        if all(a.name in documented_names for a in arguments):
+            return []
+        lines = function.docstring.split("\n")
+        literal_lines = LINE_BREAK_PATTERN.split(literal_source[3:-3])
+        # Docstring lines are counted from the line the first one is on
+        first_line = literal_node.lineno + get_cleaned_line_offset(literal_lines)
+        header_lines: List[str] = []
+        if parts.args is not None:
+            found = get_entry_insertions(arguments, parts.args, lines)
+            if found is None:
+                return []
+            insertions, first_entry = found
+            entry_indentation = self.get_indentation(first_line + first_entry)
+        else:
+            # A new section goes before the first one that must follow it, or last
+            after = len(lines) - 1
+            # At the margin `ast.get_docstring` removed, so the header is read as one
+            header_indentation = min(
+                (
+                    line[: get_indentation_width(line)]
+                    for line in literal_lines[1:]
+                    if len(line.strip()) > 0
+                ),
+                key=len,
+                default=self.get_indentation(literal_node.lineno),
+            )
+            for header, section in [
+                ("Raises:", parts.raises),
+                ("Returns:", parts.returns),
+                ("Yields:", parts.yields),
+            ]:
+                i = (
+                    None
+                    if section is None
+                    else find_section_line(lines, header, section)
+                )
+                if i is not None:
+                    after = i - 2
+                    header_indentation = self.get_indentation(first_line + i)
+                    break
+            insertions = [(after, arguments)]
+            entry_indentation = header_indentation + INDENT
+            header_lines = ["", header_indentation + "Args:"]
+        edits = []
+        for after, missing in insertions:
+            # The closing quotes may share the line, the entries then go before them
+            position = min(self.get_line_end(first_line + after), end - 3)
+            new_lines = header_lines + [
+                entry_indentation + generate_docstring_argument(a) for a in missing
+            ]
+            edits.append(
+                Edit(
+                    position,
+                    position,
+                    "".join(self.newline + line for line in new_lines),
+                )
+            )
+        return edits
+
+
+def get_fix_edits(
+    text: str,
+    tree: ast.AST,
+    rules: ScopeRules = ScopeRules(),
+    docstring_style: str = AUTO_STYLE,
+) -> List[Edit]:
+    context = FixContext(text)
+    docstring_style = resolve_docstring_style(docstring_style, text)
+    collector = collect_functions(tree, rules)
+    edits = []
+    for node, function in zip(collector.function_defs, collector.functions):
+        if function.docstring is None:
+            docstring = generate_docstring(function, docstring_style)
+            edits.append(context.insert_docstring(node, docstring))
+            continue
+        if docstring_style != "google":
+            # Only Google docstrings are completed in place
+            continue
+        edits.extend(context.complete_docstring(node, function))
+    return edits
+
+
+def fix_source_lines(
+    source: bytes, rules: ScopeRules = ScopeRules(), docstring_style: str = AUTO_STYLE
+) -> Tuple[bytes, List[LineChange]]:
+    text, encoding = decode_source(source)
+    edits = get_fix_edits(text, parse_python_code(source), rules, docstring_style)
+    if len(edits) == 0:
+        return source, []
+    return apply_edits(text, edits).encode(encoding), get_line_changes(text, edits)
+
+
+def fix_source(
+    source: bytes, rules: ScopeRules = ScopeRules(), docstring_style: str = AUTO_STYLE
+) -> bytes:
+    return fix_source_lines(source, rules, docstring_style)[0]
+
+
+def write_atomically(file_path: Path, data: bytes) -> None:
+    # Readers see either the old or the new file, never a partial write
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}."
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(data)
+        os.chmod(temporary_path, os.stat(file_path).st_mode)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def fix_file(
+    file_path: Path,
+    rules: ScopeRules = ScopeRules(),
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+) -> List[LineChange]:
+    # The lines the fix changed, none when the file is left as it is
+    if path_rules is not None:
+        rules = path_rules.get_rules(file_path) or rules
+    source = read_checkable_source(file_path)
+    if source is None:
+        return []
+    fixed, changes = fix_source_lines(source, rules, docstring_style)
+    if len(changes) > 0:
+        write_atomically(file_path, fixed)
+    return changes
+
+
+def try_fix_file(
+    file_path: Path,
+    rules: ScopeRules = ScopeRules(),
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+) -> List[LineChange]:
+    # A broken file is left as it is, the check that follows reports it
+    try:
+        return fix_file(file_path, rules, docstring_style, path_rules)
+    except FILE_ERRORS:
+        return []
+
+
+def fix_files(
+    file_paths: Iterable[Path],
+    jobs: int = 1,
+    rules: ScopeRules = ScopeRules(),
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+) -> Iterator[Tuple[Path, List[LineChange]]]:
+    jobs = resolve_jobs(jobs)
+    if jobs == 1:
+        for file_path in file_paths:
+            yield file_path, try_fix_file(file_path, rules, docstring_style, path_rules)
+        return
+
+    file_paths = list(file_paths)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        changed = executor.map(
+            partial(
+                try_fix_file,
+                rules=rules,
+                docstring_style=docstring_style,
+                path_rules=path_rules,
+            ),
+            file_paths,
+            chunksize=get_chunksize(len(file_paths), jobs),
+        )
+        yield from zip(file_paths, changed)
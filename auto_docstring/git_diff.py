@@ -0,0 +1,94 @@
+import ast
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from auto_docstring.positions import LineRanges, merge_line_ranges
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+NEW_FILE_PREFIX = "+++ "
+DELETED_FILE = "/dev/null"
+
+# Changed lines by real path, `None` when the whole file is new
+ChangedLines = Dict[str, Optional[LineRanges]]
+
+
+def run_git(arguments: Sequence[str]) -> str:
+    try:
+        completed = subprocess.run(
+            ["git", *arguments],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+    except OSError as e:
+        raise RuntimeError(f"could not run git: {e}") from e
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"`git {' '.join(arguments)}` failed: {completed.stderr.strip()}"
+        )
+    return completed.stdout
+
+
+def unquote_path(path: str) -> str:
+    # Git writes unusual paths as C-style strings with octal escapes for each byte
+    if not path.startswith('"'):
+        return path
+    return ast.literal_eval("b" + path).decode("utf-8", errors="surrogateescape")
+
+
+def get_hunk_lines(start: int, length: int) -> Tuple[int, int]:
+    # A hunk without new lines is a deletion after `start`, which still changes the
+    # definition that line belongs to
+    if length == 0:
+        return max(start, 1), max(start, 1)
+    return start, start + length - 1
+
+
+def parse_diff(diff: str, root: str) -> ChangedLines:
+    changed: Dict[str, List[Tuple[int, int]]] = {}
+    ranges: Optional[List[Tuple[int, int]]] = None
+    for line in diff.splitlines():
+        if line.startswith(NEW_FILE_PREFIX):
+            path = unquote_path(line[len(NEW_FILE_PREFIX) :])
+            if path == DELETED_FILE:
+                ranges = None
+                continue
+            # Paths are relative to the repository root, after a `b/` prefix
+            ranges = changed.setdefault(os.path.join(root, path[2:]), [])
+            continue
+        match = HUNK_HEADER_PATTERN.match(line)
+        if match is not None and ranges is not None:
+            length = 1 if match.group(2) is None else int(match.group(2))
+            ranges.append(get_hunk_lines(int(match.group(1)), length))
+    return {os.path.realpath(path): merge_line_ranges(r) for path, r in changed.items()}
+
+
+def get_changed_lines(base: str, paths: Sequence[Path] = ()) -> ChangedLines:
+    # Compares `base` with the working tree, so uncommitted edits count as changes
+    root = run_git(["rev-parse", "--show-toplevel"]).strip()
+    pathspec = ["--", *[str(p) for p in paths]]
+    # Prefixes are explicit, since a user's config can change or remove them
+    diff = run_git(
+        [
+            "diff",
+            "--no-color",
+            "--no-ext-diff",
+            "--unified=0",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            base,
+            *pathspec,
+        ]
+    )
+    changed = parse_diff(diff, root)
+    untracked = run_git(
+        ["ls-files", "--others", "--exclude-standard", "--full-name", "-z", *pathspec]
+    )
+    for path in untracked.split("\0"):
+        if len(path) > 0:
+            changed[os.path.realpath(os.path.join(root, path))] = None
+    return changed
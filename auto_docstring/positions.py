@@ -0,0 +1,112 @@
+import re
+import tokenize
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Iterable, List, Optional, Tuple
+
+LINE_BREAK_PATTERN = re.compile(r"\r\n|\r|\n")
+
+# Sorted, non-overlapping and inclusive ranges of 1-based line numbers
+LineRanges = List[Tuple[int, int]]
+
+# Lines replaced in a file, as the first line, the number of lines replaced and the
+# number of lines replacing them
+LineChange = Tuple[int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class SourceSpan:
+    # 1-based lines and columns counting characters, the end column is exclusive
+    line: int
+    column: int
+    end_line: int
+    end_column: int
+
+
+class LineOffsetTable:
+    # Offsets of the first character of every line, built once per file, so a
+    # position is found with a binary search instead of rescanning the text
+    def __init__(self, text: str):
+        self.text = text
+        # Only the line breaks the tokenizer knows, unlike `str.splitlines`
+        self.line_offsets = [0] + [m.end() for m in LINE_BREAK_PATTERN.finditer(text)]
+        # Past the end, so the last line ends like every other
+        self.line_offsets.append(len(text) + 1)
+
+    def get_offset(self, lineno: int, col_offset: int) -> int:
+        # `ast` columns count UTF-8 bytes, so only non-ASCII lines need converting
+        line_start = self.line_offsets[lineno - 1]
+        line = self.text[line_start : self.line_offsets[lineno]]
+        if line.isascii():
+            return line_start + col_offset
+        return line_start + len(line.encode("utf-8")[:col_offset].decode("utf-8"))
+
+    def get_position(self, offset: int) -> Tuple[int, int]:
+        i = bisect_right(self.line_offsets, offset) - 1
+        return i + 1, offset - self.line_offsets[i] + 1
+
+    def get_position_offset(self, line: int, column: int) -> int:
+        return self.line_offsets[line - 1] + column - 1
+
+    def get_span(self, start: int, end: int) -> SourceSpan:
+        return SourceSpan(*self.get_position(start), *self.get_position(end))
+
+
+class SourcePositions:
+    # The line table of a file, only decoded and built when the first span is
+    # needed, since most files have no errors
+    def __init__(self, source: bytes):
+        self.source = source
+        self.table: Optional[LineOffsetTable] = None
+
+    def get_table(self) -> LineOffsetTable:
+        if self.table is None:
+            self.table = LineOffsetTable(decode_source(self.source)[0])
+        return self.table
+
+
+def decode_source(source: bytes) -> Tuple[str, str]:
+    # Honours encoding cookies and byte order marks, so the file is written back as read
+    encoding, _ = tokenize.detect_encoding(BytesIO(source).readline)
+    return source.decode(encoding), encoding
+
+
+def merge_line_ranges(ranges: Iterable[Tuple[int, int]]) -> LineRanges:
+    merged: LineRanges = []
+    for start, end in sorted(ranges):
+        if len(merged) > 0 and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def overlaps_line_ranges(ranges: LineRanges, start: int, end: int) -> bool:
+    # The first range that ends at or after `start` is the only candidate
+    i = bisect_left(ranges, start, key=lambda r: r[1])
+    return i < len(ranges) and ranges[i][0] <= end
+
+
+def shift_line(line: int, changes: List[LineChange]) -> int:
+    delta = 0
+    for first, old_count, new_count in changes:
+        if line < first:
+            break
+        if line < first + old_count:
+            # Replaced lines map to the start of their replacement
+            return first + delta
+        delta += new_count - old_count
+    return line + delta
+
+
+def shift_line_ranges(ranges: LineRanges, changes: List[LineChange]) -> LineRanges:
+    # Maps ranges of a file onto the file after sorted `changes`, whose replacing
+    # lines are added as changed too
+    shifted = [(shift_line(s, changes), shift_line(e, changes)) for s, e in ranges]
+    delta = 0
+    for first, old_count, new_count in changes:
+        if new_count > 0:
+            shifted.append((first + delta, first + delta + new_count - 1))
+        delta += new_count - old_count
+    return merge_line_ranges(shifted)
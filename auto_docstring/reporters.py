@@ -0,0 +1,176 @@
+import io
+import json
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, TextIO, Type
+
+from auto_docstring.cache import get_tool_version
+from auto_docstring.docstring_errors import DocstringError
+
+if TYPE_CHECKING:
+    from auto_docstring.engine import FileResult
+
+OUTPUT_BUFFER_SIZE = 1 << 16
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+def get_output_stream() -> TextIO:
+    # One large buffer in front of stdout instead of a write per line
+    return io.TextIOWrapper(
+        io.BufferedWriter(
+            io.FileIO(sys.stdout.fileno(), "w", closefd=False),
+            buffer_size=OUTPUT_BUFFER_SIZE,
+        ),
+        encoding=sys.stdout.encoding,
+        errors="backslashreplace",
+    )
+
+
+def get_error_code(error: DocstringError) -> str:
+    return type(error).__name__
+
+
+def error_to_dict(error: DocstringError) -> Dict[str, Any]:
+    span = error.span
+    return {
+        "file": str(error.file_path),
+        "function": error.function_name,
+        "error": get_error_code(error),
+        "argument": getattr(error, "argument_name", None),
+        "message": error.get_message(),
+        # One-based characters, the end is exclusive
+        "line": None if span is None else span.line,
+        "column": None if span is None else span.column,
+        "end_line": None if span is None else span.end_line,
+        "end_column": None if span is None else span.end_column,
+    }
+
+
+def get_sarif_physical_location(error: DocstringError) -> Dict[str, Any]:
+    location: Dict[str, Any] = {"artifactLocation": {"uri": error.file_path.as_posix()}}
+    if error.span is not None:
+        # SARIF columns count characters and end exclusively too
+        location["region"] = {
+            "startLine": error.span.line,
+            "startColumn": error.span.column,
+            "endLine": error.span.end_line,
+            "endColumn": error.span.end_column,
+        }
+    return location
+
+
+class Reporter:
+    def __init__(self, stream: TextIO, show_passing: bool = False):
+        self.stream = stream
+        self.show_passing = show_passing
+        self.n_errors = 0
+
+    def report(self, result: "FileResult") -> None:
+        self.n_errors += sum(len(f.errors) for f in result.functions)
+
+    def finish(self) -> None:
+        self.stream.flush()
+
+
+class TextReporter(Reporter):
+    def report(self, result: "FileResult") -> None:
+        super().report(result)
+        # Everything for a file goes out in a single write
+        lines: List[str] = []
+        for function in result.functions:
+            if len(function.errors) > 0:
+                lines.append(function.name)
+                lines.extend(e.get_message() for e in function.errors)
+            elif self.show_passing:
+                lines.append(function.name)
+                lines.append(f"Function `{function.name}` is good!")
+        if len(lines) > 0 or self.show_passing:
+            lines.insert(0, str(result.file_path))
+            lines.append("")
+            self.stream.write("\n".join(lines))
+
+
+class JsonLinesReporter(Reporter):
+    def report(self, result: "FileResult") -> None:
+        super().report(result)
+        lines: List[str] = []
+        for function in result.functions:
+            for error in function.errors:
+                lines.append(json.dumps(error_to_dict(error)))
+            if len(function.errors) == 0 and self.show_passing:
+                lines.append(
+                    json.dumps(
+                        {
+                            "file": str(result.file_path),
+                            "function": function.name,
+                            "error": None,
+                        }
+                    )
+                )
+        if len(lines) > 0:
+            lines.append("")
+            self.stream.write("\n".join(lines))
+
+
+class SarifReporter(Reporter):
+    # A SARIF log is one JSON document, so results are collected and written at the end
+    def __init__(self, stream: TextIO, show_passing: bool = False):
+        super().__init__(stream, show_passing)
+        self.results: List[Dict[str, Any]] = []
+        self.rules: Dict[str, Dict[str, Any]] = {}
+
+    def report(self, result: "FileResult") -> None:
+        super().report(result)
+        for function in result.functions:
+            for error in function.errors:
+                code = get_error_code(error)
+                if code not in self.rules:
+                    self.rules[code] = {
+                        "id": code,
+                        "shortDescription": {"text": code},
+                    }
+                self.results.append(
+                    {
+                        "ruleId": code,
+                        "level": "warning",
+                        "message": {"text": error.get_message() or code},
+                        "locations": [
+                            {
+                                "physicalLocation": get_sarif_physical_location(error),
+                                "logicalLocations": [
+                                    {
+                                        "fullyQualifiedName": error.function_name,
+                                        "kind": "function",
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                )
+
+    def finish(self) -> None:
+        log = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": "auto-docstring",
+                            "version": get_tool_version(),
+                            "rules": [self.rules[c] for c in sorted(self.rules)],
+                        }
+                    },
+                    "results": self.results,
+                }
+            ],
+        }
+        json.dump(log, self.stream, indent=2)
+        self.stream.write("\n")
+        super().finish()
+
+
+REPORTERS: Dict[str, Type[Reporter]] = {
+    "text": TextReporter,
+    "jsonl": JsonLinesReporter,
+    "sarif": SarifReporter,
+}
@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from auto_docstring.baseline import Baseline, BaselineWriter
+from auto_docstring.cache import ResultCache
+from auto_docstring.cli import CliArguments, MergeArguments
+from auto_docstring.config import (
+    find_pyproject,
+    get_path_rules,
+    get_scope_rules,
+    load_config,
+)
+from auto_docstring.daemon import ProjectState, run_daemon
+from auto_docstring.discovery import discover_python_files
+from auto_docstring.engine import check_files
+from auto_docstring.fixer import fix_files
+from auto_docstring.git_diff import get_changed_lines
+from auto_docstring.positions import shift_line_ranges
+from auto_docstring.reporters import REPORTERS, get_output_stream
+from auto_docstring.shards import (
+    ResultsWriter,
+    get_file_weights,
+    get_shard_indices,
+    load_timings,
+    merge_results,
+)
+from auto_docstring.stats import RunStats
+from auto_docstring.symbols import SYMBOL_INDEX_FILE_NAME, load_symbol_index
+
+
+def run(arguments: CliArguments) -> int:
+    config_path = arguments.config_path or find_pyproject(Path.cwd())
+    path_rules = None
+    if config_path is not None:
+        try:
+            config = load_config(config_path)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+        arguments = replace(arguments, rules=get_scope_rules(config, arguments.rules))
+        # Patterns are relative to the directory of the pyproject.toml
+        path_rules = get_path_rules(config, config_path.parent, arguments.rules)
+    classifier = None if path_rules is None else path_rules.classifier
+
+    symbols = None
+    settings = f"{arguments.rules!r}:{arguments.engine}:{arguments.docstring_style}"
+    if arguments.resolve_imports:
+        # Every module is indexed before the first check, including the ones a diff
+        # or a shard leaves out, since their names are imported by the rest
+        symbols = load_symbol_index(
+            discover_python_files(arguments.file_paths, arguments.exclude, classifier),
+            None
+            if arguments.cache_dir is None
+            else arguments.cache_dir / SYMBOL_INDEX_FILE_NAME,
+        )
+        # Each result is also keyed on the modules it looked names up in
+        settings += ":resolve-imports"
+    cache = (
+        None
+        if arguments.cache_dir is None
+        else ResultCache(arguments.cache_dir, settings=settings)
+    )
+    if arguments.daemon:
+        state = ProjectState(
+            arguments.file_paths,
+            arguments.exclude,
+            arguments.rules,
+            cache,
+            arguments.engine,
+            arguments.docstring_style,
+            path_rules,
+        )
+        try:
+            run_daemon(state, arguments.socket_path, arguments.poll_interval)
+        except (OSError, RuntimeError) as e:
+            print(e, file=sys.stderr)
+            return 2
+        return 0
+
+    baseline = None
+    baseline_writer = None
+    if arguments.write_baseline and arguments.baseline is not None:
+        baseline_writer = BaselineWriter(arguments.baseline)
+    elif arguments.baseline is not None:
+        try:
+            baseline = Baseline.load(arguments.baseline)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    timings = None
+    if len(arguments.shard_timings) > 0:
+        try:
+            timings = load_timings(arguments.shard_timings)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    reporter = REPORTERS[arguments.output_format](
+        get_output_stream(), show_passing=arguments.show_passing
+    )
+    stats = RunStats() if arguments.stats or arguments.stats_json is not None else None
+    results_writer = (
+        None
+        if arguments.results_json is None
+        else ResultsWriter(arguments.results_json, arguments.shard or (1, 1))
+    )
+    file_paths = discover_python_files(
+        arguments.file_paths, arguments.exclude, classifier
+    )
+    changed_lines = None
+    if arguments.diff_base is not None:
+        try:
+            changed_lines = get_changed_lines(arguments.diff_base, arguments.file_paths)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+        file_paths = (p for p in file_paths if os.path.realpath(p) in changed_lines)
+    # Positions among all files, so merged shards report in the unsharded order
+    file_indices = None
+    if arguments.shard is not None:
+        file_paths = list(file_paths)
+        file_indices = get_shard_indices(
+            get_file_weights(file_paths, timings), arguments.shard
+        )
+        file_paths = [file_paths[i] for i in file_indices]
+    if arguments.fix:
+        # Fixed files are then checked like any other, so remaining errors are reported
+        file_paths = list(file_paths)
+        for file_path, changes in fix_files(
+            file_paths,
+            arguments.jobs,
+            arguments.rules,
+            arguments.docstring_style,
+            path_rules,
+        ):
+            if len(changes) == 0:
+                continue
+            print(f"Fixed {file_path}", file=sys.stderr)
+            if changed_lines is not None:
+                # Inserted docstrings move the lines that follow them
+                real_path = os.path.realpath(file_path)
+                ranges = changed_lines[real_path]
+                if ranges is not None:
+                    changed_lines[real_path] = shift_line_ranges(ranges, changes)
+    if stats is not None:
+        file_paths = stats.time_iterator("discover", file_paths)
+    results = check_files(
+        file_paths,
+        jobs=arguments.jobs,
+        cache=cache,
+        rules=arguments.rules,
+        # Results files record how long each file took, for balancing later shards
+        collect_stats=stats is not None or results_writer is not None,
+        engine=arguments.engine,
+        changed_lines=changed_lines,
+        read_threads=arguments.read_threads,
+        docstring_style=arguments.docstring_style,
+        path_rules=path_rules,
+        symbols=symbols,
+    )
+    n_failures = 0
+    for i, result in enumerate(results):
+        if result.failure is not None:
+            # Reported like the daemon does, the rest of the files are still checked
+            n_failures += 1
+            print(result.failure, file=sys.stderr)
+        if baseline_writer is not None:
+            baseline_writer.add(result)
+        if baseline is not None:
+            result = baseline.filter(result)
+        if results_writer is not None:
+            results_writer.add(result, i if file_indices is None else file_indices[i])
+        if stats is None or result.stats is None:
+            reporter.report(result)
+            continue
+        start = time.perf_counter()
+        reporter.report(result)
+        result.stats.lap("report", start)
+        stats.add_file(
+            result.file_path,
+            len(result.functions),
+            sum(len(f.errors) for f in result.functions),
+            result.stats,
+        )
+    reporter.finish()
+    if results_writer is not None:
+        results_writer.write()
+    if cache is not None:
+        cache.evict()
+
+    if stats is not None:
+        stats.finish()
+        if arguments.stats:
+            stats.write_summary(sys.stderr)
+        if arguments.stats_json is not None:
+            with open(arguments.stats_json, "w") as f:
+                stats.write_json(f)
+    if baseline_writer is not None:
+        n_errors = baseline_writer.write()
+        print(f"Wrote {n_errors} errors to {arguments.baseline}", file=sys.stderr)
+        return 1 if n_failures > 0 else 0
+    return 1 if reporter.n_errors > 0 or n_failures > 0 else 0
+
+
+def run_merge(arguments: MergeArguments) -> int:
+    try:
+        results = merge_results(arguments.results_paths)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    reporter = REPORTERS[arguments.output_format](
+        get_output_stream(), show_passing=arguments.show_passing
+    )
+    n_failures = 0
+    for result in results:
+        if result.failure is not None:
+            n_failures += 1
+            print(result.failure, file=sys.stderr)
+        reporter.report(result)
+    reporter.finish()
+    return 1 if reporter.n_errors > 0 or n_failures > 0 else 0
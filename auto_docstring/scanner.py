@@ -0,0 +1,311 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from auto_docstring import (
+    FunctionLocation,
+    FunctionParts,
+    ScopeRules,
+    extract_parts_of_function_def,
+    is_exempt_by_decorators,
+    is_private_name,
+    parse_python_code,
+)
+from auto_docstring.positions import (
+    LineOffsetTable,
+    LineRanges,
+    SourcePositions,
+    SourceSpan,
+    decode_source,
+    overlaps_line_ranges,
+)
+
+# A front end that finds functions without building a tree for the whole module. Only
+# logical line starts, brackets, strings and comments are scanned, then the headers and
+# first statements of the functions found are parsed together as one small module.
+
+STRING = (
+    r"'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*(?:'''|\Z)"
+    r'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*(?:"""|\Z)'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'?"
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"?'
+)
+# Lines start after a newline, so the source is scanned with one prepended
+LINE_PATTERN = re.compile(
+    r"(?P<line>\n[ \t\f]*(?=[^ \t\f\r\n#\\]))"
+    rf"|(?P<string>{STRING})"
+    r"|(?P<comment>#[^\n]*)"
+    r"|(?P<open>[(\[{])"
+    r"|(?P<close>[)\]}])"
+    r"|(?P<continuation>\\\r?\n)",
+    re.DOTALL,
+)
+# The dotted name of a decorator, its last part is compared like `get_decorator_name`
+# does, more complex expressions give no name
+DECORATOR_PATTERN = re.compile(
+    r"@[ \t]*(?:\w+[ \t]*\.[ \t]*)*(?P<name>\w+)[ \t]*(?=[(#\r\n]|$)"
+)
+HEAD_PATTERN = re.compile(r"(?:async[ \t]+)?(?P<keyword>def|class)[ \t]+(?P<name>\w+)")
+STATEMENT_PATTERN = re.compile(
+    rf"(?P<string>{STRING})"
+    r"|(?P<comment>#[^\n]*)"
+    r"|(?P<open>[(\[{])"
+    r"|(?P<close>[)\]}])"
+    r"|(?P<continuation>\\\r?\n)"
+    r"|(?P<end>[:;\n])",
+    re.DOTALL,
+)
+BODY_START_PATTERN = re.compile(r"(?:[ \t\f]|\\\r?\n|#[^\n]*|\r?\n)*")
+NEWLINE_PATTERN = re.compile(r"\n")
+# Only a string literal can be a docstring, parentheses are allowed around it
+DOCSTRING_START_PATTERN = re.compile(r"[rRuUbBfF]{0,2}['\"]|\(")
+STRING_PREFIX_CHARACTERS = "rRuUbBfF"
+
+
+@dataclass(slots=True)
+class ScannedFunction:
+    qualname: str
+    is_method: bool
+    header: str
+    first_statement: Optional[str]
+    # Offsets of the first decorator and just after the last code in the body, the
+    # end is only known once the body has been scanned
+    start: int
+    # Offsets of the `def` or `async`, just after the name and of the first statement
+    head_start: int
+    name_end: int
+    statement_start: int
+    end: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Scope:
+    indentation: int
+    name: str
+    is_class: bool
+    in_function: bool
+    skipped: bool
+    function: Optional[ScannedFunction] = None
+
+
+def find_statement_end(text: str, position: int, end_characters: str) -> int:
+    # Index of the first of `end_characters` outside strings, comments and brackets
+    depth = 0
+    while True:
+        match = STATEMENT_PATTERN.search(text, position)
+        if match is None:
+            return len(text)
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth = max(0, depth - 1)
+        elif kind == "end" and depth == 0 and match.group() in end_characters:
+            return match.start()
+
+
+def find_first_statement(text: str, header_end: int) -> Tuple[Optional[str], int, int]:
+    # The possible docstring, where it starts and where scanning resumes, a docstring
+    # is never re-scanned
+    body_start = BODY_START_PATTERN.match(text, header_end + 1)
+    # Every repetition is optional, so the pattern matches anywhere, if only emptily
+    assert body_start is not None, "BODY_START_PATTERN must match the empty string"
+    start = body_start.end()
+    if DOCSTRING_START_PATTERN.match(text, start) is None:
+        return None, start, header_end + 1
+    end = find_statement_end(text, start, ";\n")
+    return text[start:end].rstrip(), start, end
+
+
+def find_string_bounds(text: str, position: int) -> Tuple[int, int]:
+    # From the prefix of the first string literal of a statement to the end of the
+    # last, like the positions `ast` gives an implicitly concatenated docstring
+    start = end = position
+    depth = 0
+    while True:
+        match = STATEMENT_PATTERN.search(text, position)
+        if match is None:
+            break
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "string":
+            if end == start:
+                start = match.start()
+                while text[start - 1] in STRING_PREFIX_CHARACTERS:
+                    start -= 1
+            end = match.end()
+        elif kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth = max(0, depth - 1)
+        elif kind == "end" and depth == 0 and match.group() in ";\n":
+            break
+    return start, end
+
+
+def get_indentation(indentation: str) -> int:
+    return len(indentation.expandtabs(8))
+
+
+def scan_functions_in_text(
+    text: str,
+    rules: ScopeRules = ScopeRules(),
+    line_ranges: Optional[LineRanges] = None,
+) -> List[ScannedFunction]:
+    text = "\n" + text
+    functions: List[ScannedFunction] = []
+    scopes: List[Scope] = []
+    depth = 0
+    position = 0
+    # Where the last token that is not a comment ended, and so where a block ends
+    code_end = 0
+    decorator_starts: List[int] = []
+    while True:
+        match = LINE_PATTERN.search(text, position)
+        if match is None:
+            break
+        position = match.end()
+        kind = match.lastgroup
+        if kind != "line" or depth > 0:
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth = max(0, depth - 1)
+            if kind != "comment":
+                code_end = position
+            continue
+
+        # A logical line ends every block indented at least as far as it
+        indentation = get_indentation(match.group()[1:])
+        while len(scopes) > 0 and scopes[-1].indentation >= indentation:
+            end_scope(scopes.pop(), code_end)
+        code_end = position
+        head = HEAD_PATTERN.match(text, position)
+        if head is None:
+            if not text.startswith("@", position):
+                decorator_starts = []
+            else:
+                decorator_starts.append(position)
+            continue
+        start = head.start() if len(decorator_starts) == 0 else decorator_starts[0]
+        name = head.group("name")
+        parent = scopes[-1] if len(scopes) > 0 else None
+        in_function = parent is not None and parent.in_function
+        is_class = head.group("keyword") == "class"
+        skipped = (
+            (parent is not None and parent.skipped)
+            or (not rules.include_private and is_private_name(name))
+            or (is_class and not rules.include_methods)
+            or (not is_class and in_function and not rules.include_nested)
+            or (
+                not is_class
+                and len(decorator_starts) > 0
+                and is_exempt_by_decorators(
+                    (get_decorator_name(text, p) for p in decorator_starts), rules
+                )
+            )
+        )
+        decorator_starts = []
+        if is_class:
+            scopes.append(Scope(indentation, name, True, in_function, skipped))
+            position = code_end = head.end()
+            continue
+        header_end = find_statement_end(text, head.end(), ":")
+        first_statement, statement_start, position = find_first_statement(
+            text, header_end
+        )
+        code_end = position
+        function = ScannedFunction(
+            qualname=".".join([s.name for s in scopes] + [name]),
+            is_method=parent is not None and parent.is_class,
+            header=text[head.start() : header_end],
+            first_statement=first_statement,
+            start=start,
+            head_start=head.start(),
+            name_end=head.end(),
+            statement_start=statement_start,
+        )
+        if not skipped:
+            functions.append(function)
+        scopes.append(
+            Scope(indentation, f"{name}.<locals>", False, True, skipped, function)
+        )
+
+    for scope in scopes:
+        end_scope(scope, code_end)
+    if line_ranges is None:
+        return functions
+    # Each newline before an offset starts a line, the prepended one starts line 1
+    newlines = [m.start() for m in NEWLINE_PATTERN.finditer(text)]
+    return [
+        f
+        for f in functions
+        if overlaps_line_ranges(
+            line_ranges, bisect_left(newlines, f.start), bisect_left(newlines, f.end)
+        )
+    ]
+
+
+def get_decorator_name(text: str, position: int) -> Optional[str]:
+    match = DECORATOR_PATTERN.match(text, position)
+    return None if match is None else match.group("name")
+
+
+def end_scope(scope: Scope, code_end: int) -> None:
+    if scope.function is not None:
+        scope.function.end = code_end
+
+
+def build_stub_module(functions: List[ScannedFunction]) -> str:
+    # Every function becomes a top-level stub whose body is only its first statement
+    lines: List[str] = []
+    for function in functions:
+        if function.first_statement is None:
+            lines.append(f"{function.header}: pass\n")
+        else:
+            lines.append(f"{function.header}:\n {function.first_statement}\n")
+    return "".join(lines)
+
+
+def scan_functions(
+    source: bytes,
+    rules: ScopeRules = ScopeRules(),
+    line_ranges: Optional[LineRanges] = None,
+    positions: Optional[SourcePositions] = None,
+) -> List[FunctionParts]:
+    text = decode_source(source)[0]
+    scanned = scan_functions_in_text(text, rules, line_ranges)
+    stubs = parse_python_code(build_stub_module(scanned)).body  # type: ignore
+    return [
+        extract_parts_of_function_def(
+            stub,
+            function.qualname,
+            function.is_method,
+            None if positions is None else ScannedLocation(function, positions),
+        )
+        for stub, function in zip(stubs, scanned)
+    ]
+
+
+@dataclass(slots=True)
+class ScannedLocation(FunctionLocation):
+    # Scanned offsets count characters and the prepended newline
+    function: ScannedFunction
+    positions: SourcePositions
+
+    def get_positions(self) -> LineOffsetTable:
+        return self.positions.get_table()
+
+    def get_span(self) -> SourceSpan:
+        return self.positions.get_table().get_span(
+            self.function.head_start - 1, self.function.name_end - 1
+        )
+
+    def get_docstring_span(self) -> SourceSpan:
+        positions = self.positions.get_table()
+        start, end = find_string_bounds(
+            positions.text, self.function.statement_start - 1
+        )
+        return positions.get_span(start, end)
@@ -0,0 +1,188 @@
+import heapq
+import json
+import os
+from dataclasses import astuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from auto_docstring.docstring_errors import DocstringError
+from auto_docstring.engine import FileResult, FunctionResult
+from auto_docstring.positions import SourceSpan
+from auto_docstring.reporters import get_error_code
+
+# Bump whenever the layout of results files changes
+RESULTS_VERSION = 3
+ERROR_TYPES = {cls.__name__: cls for cls in DocstringError.__subclasses__()}
+
+# One-based index and number of shards, as in `--shard 2/4`
+Shard = Tuple[int, int]
+
+
+def get_file_weights(
+    file_paths: Sequence[Path], timings: Optional[Dict[str, float]] = None
+) -> List[float]:
+    # Seconds recorded by earlier runs where there are any, the size otherwise,
+    # scaled by the seconds per byte of the recorded files
+    sizes: List[float] = []
+    for file_path in file_paths:
+        try:
+            sizes.append(float(os.stat(file_path).st_size))
+        except OSError:
+            sizes.append(0.0)
+    if timings is None or len(timings) == 0:
+        return sizes
+    timed = [
+        (timings[str(p)], size)
+        for p, size in zip(file_paths, sizes)
+        if str(p) in timings
+    ]
+    timed_bytes = sum(size for _, size in timed)
+    seconds_per_byte = (
+        sum(seconds for seconds, _ in timed) / timed_bytes if timed_bytes > 0 else 1.0
+    )
+    return [
+        timings.get(str(p), size * seconds_per_byte)
+        for p, size in zip(file_paths, sizes)
+    ]
+
+
+def get_shard_indices(weights: Sequence[float], shard: Shard) -> List[int]:
+    # Heaviest files first, each onto the lightest shard so far. Ties are broken by
+    # position, so every runner computes the same partition from the same files
+    index, count = shard
+    order = sorted(range(len(weights)), key=lambda i: (-weights[i], i))
+    loads = [(0.0, s) for s in range(1, count + 1)]
+    selected = []
+    for i in order:
+        load, s = heapq.heappop(loads)
+        if s == index:
+            selected.append(i)
+        heapq.heappush(loads, (load + weights[i], s))
+    # Checked and reported in the order they were discovered
+    return sorted(selected)
+
+
+def get_recorded_seconds(result: FileResult) -> Optional[float]:
+    # Cache hits take next to no time, so they would make the file look light to
+    # every later run that checks it for real
+    if result.stats is None or result.stats.from_cache:
+        return None
+    return result.stats.get_seconds()
+
+
+def result_to_dict(result: FileResult, index: int) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "file": str(result.file_path),
+        "seconds": get_recorded_seconds(result),
+        "failure": result.failure,
+        "functions": [
+            {
+                "name": f.name,
+                "errors": [
+                    {
+                        "error": get_error_code(e),
+                        "argument": getattr(e, "argument_name", None),
+                        "span": None if e.span is None else astuple(e.span),
+                    }
+                    for e in f.errors
+                ],
+            }
+            for f in result.functions
+        ],
+    }
+
+
+def result_from_dict(entry: Dict[str, Any]) -> FileResult:
+    file_path = Path(entry["file"])
+    functions = []
+    for function in entry["functions"]:
+        errors = []
+        for error in function["errors"]:
+            error_type = ERROR_TYPES[error["error"]]
+            span = None if error["span"] is None else SourceSpan(*error["span"])
+            # Errors about an argument take its name after the function's
+            arguments = [file_path, function["name"]]
+            if error["argument"] is not None:
+                arguments.append(error["argument"])
+            errors.append(error_type(*arguments, span=span))
+        functions.append(FunctionResult(function["name"], errors))
+    return FileResult(file_path, functions, failure=entry["failure"])
+
+
+class ResultsWriter:
+    # Everything a run checked, so shards can be merged and their timings reused
+    def __init__(self, path: Path, shard: Shard = (1, 1)):
+        self.path = path
+        self.shard = shard
+        self.files: List[Dict[str, Any]] = []
+
+    def add(self, result: FileResult, index: int) -> None:
+        self.files.append(result_to_dict(result, index))
+
+    def write(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump(
+                {
+                    "version": RESULTS_VERSION,
+                    "shard": list(self.shard),
+                    "files": self.files,
+                },
+                f,
+            )
+            f.write("\n")
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with open(path) as f:
+        try:
+            results = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} is not a results file: {e}") from None
+    if not isinstance(results, dict) or results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a results file of this version.")
+    return results
+
+
+def load_timings(paths: Sequence[Path]) -> Dict[str, float]:
+    timings = {}
+    for path in paths:
+        for entry in load_results(path)["files"]:
+            if entry["seconds"] is not None:
+                timings[entry["file"]] = entry["seconds"]
+    return timings
+
+
+def merge_results(paths: Sequence[Path]) -> List[FileResult]:
+    # Every shard of one run exactly once, in the order an unsharded run reports
+    shards = set()
+    count = None
+    entries = []
+    for path in paths:
+        results = load_results(path)
+        index, shard_count = results["shard"]
+        if count is not None and shard_count != count:
+            raise ValueError(
+                f"{path} is from a run with {shard_count} shards, not {count}."
+            )
+        if index in shards:
+            raise ValueError(f"Shard {index}/{shard_count} is given more than once.")
+        count = shard_count
+        shards.add(index)
+        entries.extend(results["files"])
+    missing = [] if count is None else sorted(set(range(1, count + 1)) - shards)
+    if len(missing) > 0:
+        raise ValueError(
+            f"Missing shards {', '.join(f'{i}/{count}' for i in missing)}."
+        )
+    try:
+        entries.sort(key=lambda e: e["index"])
+        # Runners that partitioned different file lists would drop or repeat files
+        if [e["index"] for e in entries] != list(range(len(entries))):
+            raise ValueError(
+                "The shards did not partition the same files, run every shard "
+                "with the same files and timings."
+            )
+        return [result_from_dict(e) for e in entries]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid results file: {e!r}") from None
@@ -0,0 +1,151 @@
+import heapq
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_N_SLOWEST = 10
+# Stages in pipeline order, `docstring_parsing` is part of `check`
+STAGES = ["discover", "read", "cache", "parse", "collect", "check", "report"]
+SUB_STAGES = {"check": ["docstring_parsing"]}
+
+
+@dataclass
+class FileStats:
+    # Collected inside a worker and sent back with the file's result
+    n_bytes: int = 0
+    from_cache: bool = False
+    # No `def` anywhere in the file, so it was never parsed
+    skipped: bool = False
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    function_seconds: List[Tuple[str, float]] = field(default_factory=list)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def lap(self, stage: str, start: float) -> float:
+        # Adds the time since `start` to `stage` and returns the new start time
+        now = time.perf_counter()
+        self.add(stage, now - start)
+        return now
+
+    def get_seconds(self) -> float:
+        # Sub-stages are already part of their stage
+        return sum(s for stage, s in self.stage_seconds.items() if stage in STAGES)
+
+
+class RunStats:
+    def __init__(self, n_slowest: int = DEFAULT_N_SLOWEST):
+        self.n_slowest = n_slowest
+        self.start = time.perf_counter()
+        self.wall_seconds = 0.0
+        self.n_files = 0
+        self.n_cached_files = 0
+        self.n_skipped_files = 0
+        self.n_functions = 0
+        self.n_bytes = 0
+        self.n_errors = 0
+        self.stage_seconds: Dict[str, float] = {}
+        # Min-heaps of the slowest entries seen so far
+        self.slowest_files: List[Tuple[float, str]] = []
+        self.slowest_functions: List[Tuple[float, str]] = []
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def push_slowest(
+        self, heap: List[Tuple[float, str]], seconds: float, name: str
+    ) -> None:
+        if len(heap) < self.n_slowest:
+            heapq.heappush(heap, (seconds, name))
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, (seconds, name))
+
+    def add_file(
+        self, file_path: Path, n_functions: int, n_errors: int, file_stats: FileStats
+    ) -> None:
+        self.n_files += 1
+        self.n_cached_files += file_stats.from_cache
+        self.n_skipped_files += file_stats.skipped
+        self.n_functions += n_functions
+        self.n_errors += n_errors
+        self.n_bytes += file_stats.n_bytes
+        for stage, seconds in file_stats.stage_seconds.items():
+            self.add(stage, seconds)
+        self.push_slowest(self.slowest_files, file_stats.get_seconds(), str(file_path))
+        for qualname, seconds in file_stats.function_seconds:
+            self.push_slowest(
+                self.slowest_functions, seconds, f"{file_path}::{qualname}"
+            )
+
+    def time_iterator(self, stage: str, iterable: Iterable[T]) -> Iterator[T]:
+        # Charges the time spent producing each item, e.g. by a lazy walk, to `stage`
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - start)
+                return
+            self.add(stage, time.perf_counter() - start)
+            yield item
+
+    def finish(self) -> None:
+        self.wall_seconds = time.perf_counter() - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": self.wall_seconds,
+            "files": self.n_files,
+            "cached_files": self.n_cached_files,
+            "skipped_files": self.n_skipped_files,
+            "functions": self.n_functions,
+            "bytes": self.n_bytes,
+            "errors": self.n_errors,
+            "stage_seconds": self.stage_seconds,
+            "slowest_files": [
+                {"file": n, "seconds": s} for s, n in sorted(self.slowest_files)[::-1]
+            ],
+            "slowest_functions": [
+                {"function": n, "seconds": s}
+                for s, n in sorted(self.slowest_functions)[::-1]
+            ],
+        }
+
+    def write_json(self, stream: TextIO) -> None:
+        json.dump(self.to_dict(), stream, indent=2)
+        stream.write("\n")
+
+    def write_summary(self, stream: TextIO) -> None:
+        lines = [
+            f"Files:     {self.n_files} ({self.n_cached_files} from cache,"
+            f" {self.n_skipped_files} without functions)",
+            f"Functions: {self.n_functions}",
+            f"Bytes:     {self.n_bytes}",
+            f"Errors:    {self.n_errors}",
+            f"Wall time: {self.wall_seconds:.3f}s",
+            "",
+            # Worker stages add up across processes, so can exceed the wall time
+            "Stage                  Seconds",
+        ]
+        for stage in STAGES:
+            if stage in self.stage_seconds:
+                lines.append(f"{stage:<20} {self.stage_seconds[stage]:>9.3f}")
+            for sub_stage in SUB_STAGES.get(stage, []):
+                if sub_stage in self.stage_seconds:
+                    lines.append(
+                        f"  {sub_stage:<18} {self.stage_seconds[sub_stage]:>9.3f}"
+                    )
+        for title, heap in [
+            ("Slowest files", self.slowest_files),
+            ("Slowest functions", self.slowest_functions),
+        ]:
+            if len(heap) > 0:
+                lines.extend(["", f"{title}:"])
+                lines.extend(f"{s:>9.4f}  {n}" for s, n in sorted(heap)[::-1])
+        lines.append("")
+        stream.write("\n".join(lines))
@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from auto_docstring import FunctionParts, ScopeRules
+from auto_docstring.config import PathRules
+from auto_docstring.discovery import discover_python_files
+from auto_docstring.docstring_errors import DocstringError
+from auto_docstring.engine import (
+    DEFAULT_ENGINE,
+    iter_checked_functions,
+    read_checkable_source,
+)
+from auto_docstring.positions import LineRanges
+from auto_docstring.styles import AUTO_STYLE
+
+FunctionError = Tuple[Path, FunctionParts, DocstringError]
+
+
+def iter_source_errors(
+    file_path: Path,
+    source: bytes,
+    rules: ScopeRules = ScopeRules(),
+    engine: str = DEFAULT_ENGINE,
+    line_ranges: Optional[LineRanges] = None,
+    docstring_style: str = AUTO_STYLE,
+) -> Iterator[FunctionError]:
+    # The same checks as `check_source`, flattened to one item per error
+    for function, errors in iter_checked_functions(
+        file_path, source, rules, None, engine, line_ranges, docstring_style
+    ):
+        for error in errors:
+            yield file_path, function, error
+
+
+def iter_file_errors(
+    file_paths: Iterable[Path],
+    rules: ScopeRules = ScopeRules(),
+    engine: str = DEFAULT_ENGINE,
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+) -> Iterator[FunctionError]:
+    # Only the current file's source, tree and function are kept alive, so memory
+    # does not grow with the number of files
+    for file_path in file_paths:
+        source = read_checkable_source(file_path)
+        if source is None:
+            continue
+        file_rules = None if path_rules is None else path_rules.get_rules(file_path)
+        yield from iter_source_errors(
+            file_path, source, file_rules or rules, engine, None, docstring_style
+        )
+
+
+def iter_errors(
+    paths: Iterable[Path],
+    exclude: Sequence[str] = (),
+    rules: ScopeRules = ScopeRules(),
+    engine: str = DEFAULT_ENGINE,
+    docstring_style: str = AUTO_STYLE,
+    path_rules: Optional[PathRules] = None,
+) -> Iterator[FunctionError]:
+    # Files and directories like the command line takes them
+    classifier = None if path_rules is None else path_rules.classifier
+    return iter_file_errors(
+        discover_python_files(paths, exclude, classifier),
+        rules,
+        engine,
+        docstring_style,
+        path_rules,
+    )
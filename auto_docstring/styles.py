@@ -0,0 +1,39 @@
+import re
+from collections import Counter
+from typing import Union
+
+AUTO_STYLE = "auto"
+# The names in `DOCSTRING_PARSERS` and `templates.TEMPLATES`
+DOCSTRING_STYLES = ["google", "numpy", "sphinx"]
+FALLBACK_STYLE = "google"
+
+# One pass over the source counts the section markers of every style
+STYLE_MARKER_PATTERN = re.compile(
+    rb"^[ \t]*(?:"
+    rb"(?P<google>(?:Args|Arguments|Returns|Yields|Raises):[ \t]*\r?$)"
+    rb"|(?P<numpy>(?:Parameters|Returns|Yields|Raises)[ \t]*\r?\n[ \t]*---+[ \t]*\r?$)"
+    rb"|(?P<sphinx>:(?:param|type|returns?|rtype|raises)\b)"
+    rb")",
+    re.MULTILINE,
+)
+# Markers of the other styles, without them the regular expression is not needed
+NON_FALLBACK_MARKERS = (b"---", b":param", b":type", b":return", b":rtype")
+
+
+def detect_docstring_style(source: Union[bytes, str]) -> str:
+    # Decided once for a whole module, by the style most of its sections use
+    if isinstance(source, str):
+        source = source.encode(errors="surrogateescape")
+    if not any(marker in source for marker in NON_FALLBACK_MARKERS):
+        return FALLBACK_STYLE
+    counts = Counter(m.lastgroup for m in STYLE_MARKER_PATTERN.finditer(source))
+    if len(counts) == 0:
+        return FALLBACK_STYLE
+    # Ties go to the style listed first
+    return max(DOCSTRING_STYLES, key=lambda style: counts[style])
+
+
+def resolve_docstring_style(docstring_style: str, source: Union[bytes, str]) -> str:
+    if docstring_style == AUTO_STYLE:
+        return detect_docstring_style(source)
+    return docstring_style
@@ -0,0 +1,448 @@
+import ast
+import hashlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from auto_docstring.cache import create_cache_directory
+from auto_docstring.type_hints import (
+    LITERAL_NAMES,
+    get_subscript_name,
+    render_type_expression,
+)
+
+SYMBOL_INDEX_FILE_NAME = "symbols.pickle"
+# Bump whenever the pickled layout or the meaning of the index changes
+SYMBOL_INDEX_VERSION = 1
+# Docstrings name these without their module, like `Optional` for `typing.Optional`
+IMPLICIT_MODULES = ("builtins", "collections.abc", "typing", "typing_extensions")
+TYPE_ALIAS_NAMES = frozenset({"TypeAlias"})
+# Bounds chains of re-exports and aliases, which could otherwise be cyclic
+MAX_RESOLVE_DEPTH = 8
+# Dotted names and single characters, so hints can be compared name by name
+HINT_TOKEN_PATTERN = re.compile(r"[\w.]+|\S")
+
+# Modification time and size, a module is collected again whenever either changes
+StatKey = Tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleSymbols:
+    # Local names to the dotted names they were imported as, like `t` to `typing`
+    imports: Dict[str, str] = field(default_factory=dict)
+    # Type aliases at module level, as the source of their value
+    aliases: Dict[str, str] = field(default_factory=dict)
+
+
+@lru_cache(maxsize=None)
+def get_package_parts(directory: str) -> Tuple[str, ...]:
+    # Packages are the directories with an `__init__.py` above a module
+    if not os.path.isfile(os.path.join(directory, "__init__.py")):
+        return ()
+    parent = os.path.dirname(directory)
+    if parent == directory:
+        return ()
+    return get_package_parts(parent) + (os.path.basename(directory),)
+
+
+def get_module_name(file_path: str) -> Tuple[str, bool]:
+    # The dotted name the module is imported as and whether it is a package
+    file_path = os.path.abspath(file_path)
+    directory, file_name = os.path.split(file_path)
+    package_parts = get_package_parts(directory)
+    stem = os.path.splitext(file_name)[0]
+    if stem == "__init__" and len(package_parts) > 0:
+        return ".".join(package_parts), True
+    return ".".join(package_parts + (stem,)), False
+
+
+def resolve_relative_import(
+    module_name: str, is_package: bool, level: int, imported: Optional[str]
+) -> str:
+    parts = module_name.split(".")
+    if not is_package:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[: len(parts) - (level - 1)]
+    if imported is not None:
+        parts.append(imported)
+    return ".".join(parts)
+
+
+def is_type_alias_value(value: ast.expr) -> bool:
+    # `UserId = int` and `Users = List[User]`, but not constants or calls
+    return isinstance(value, (ast.Name, ast.Attribute, ast.Subscript)) or (
+        isinstance(value, ast.BinOp) and isinstance(value.op, ast.BitOr)
+    )
+
+
+def iter_module_statements(statements: List[ast.stmt]) -> Iterable[ast.stmt]:
+    # Includes the branches of `if TYPE_CHECKING:` and `try: import ...`
+    for statement in statements:
+        if isinstance(statement, ast.If):
+            yield from iter_module_statements(statement.body)
+            yield from iter_module_statements(statement.orelse)
+        elif isinstance(statement, ast.Try):
+            yield from iter_module_statements(statement.body)
+            for handler in statement.handlers:
+                yield from iter_module_statements(handler.body)
+        else:
+            yield statement
+
+
+def collect_module_symbols(
+    tree: ast.Module, module_name: str, is_package: bool = False
+) -> ModuleSymbols:
+    symbols = ModuleSymbols()
+    for statement in iter_module_statements(tree.body):
+        if isinstance(statement, ast.Import):
+            for alias in statement.names:
+                if alias.asname is not None:
+                    symbols.imports[alias.asname] = alias.name
+                else:
+                    # `import a.b` binds `a`
+                    head = alias.name.partition(".")[0]
+                    symbols.imports[head] = head
+        elif isinstance(statement, ast.ImportFrom):
+            module = statement.module
+            if statement.level > 0:
+                module = resolve_relative_import(
+                    module_name, is_package, statement.level, module
+                )
+            for alias in statement.names:
+                if alias.name != "*" and module is not None:
+                    symbols.imports[alias.asname or alias.name] = (
+                        f"{module}.{alias.name}" if len(module) > 0 else alias.name
+                    )
+        elif (
+            isinstance(statement, ast.Assign)
+            and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+            and is_type_alias_value(statement.value)
+        ):
+            symbols.aliases[statement.targets[0].id] = ast.unparse(statement.value)
+        elif (
+            isinstance(statement, ast.AnnAssign)
+            and isinstance(statement.target, ast.Name)
+            and statement.value is not None
+            and get_subscript_name(statement.annotation) in TYPE_ALIAS_NAMES
+        ):
+            symbols.aliases[statement.target.id] = ast.unparse(statement.value)
+        elif sys.version_info >= (3, 12) and isinstance(statement, ast.TypeAlias):
+            # `type Users = List[User]`
+            symbols.aliases[statement.name.id] = ast.unparse(statement.value)
+    return symbols
+
+
+def get_dotted_name(expression: ast.expr) -> Optional[str]:
+    if isinstance(expression, ast.Name):
+        return expression.id
+    if isinstance(expression, ast.Attribute):
+        value = get_dotted_name(expression.value)
+        return None if value is None else f"{value}.{expression.attr}"
+    return None
+
+
+def strip_implicit_module(name: str) -> str:
+    for module in IMPLICIT_MODULES:
+        if name.startswith(module + ".") and "." not in name[len(module) + 1 :]:
+            return name[len(module) + 1 :]
+    return name
+
+
+class RecordedModules(Mapping[str, ModuleSymbols]):
+    # The modules of an index, remembering every name looked up in them, whether
+    # it is indexed or not
+    def __init__(self, modules: Mapping[str, ModuleSymbols], used: Set[str]):
+        self.modules = modules
+        self.used = used
+
+    def __getitem__(self, module_name: str) -> ModuleSymbols:
+        self.used.add(module_name)
+        return self.modules[module_name]
+
+    def __contains__(self, module_name: object) -> bool:
+        if isinstance(module_name, str):
+            self.used.add(module_name)
+        return module_name in self.modules
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.modules)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+
+class SymbolIndex:
+    def __init__(
+        self,
+        modules: Mapping[str, ModuleSymbols],
+        module_names: Optional[Dict[str, Tuple[str, bool]]] = None,
+    ):
+        self.modules = modules
+        # Absolute file paths to their module names
+        self.module_names = module_names or {}
+        self.module_digests: Dict[str, str] = {}
+
+    def split_module(self, name: str) -> Optional[Tuple[str, str]]:
+        # The longest prefix that is an indexed module, and the rest of the name
+        module, rest = name, ""
+        while len(module) > 0:
+            if module in self.modules:
+                return module, rest
+            module, _, last = module.rpartition(".")
+            rest = last if len(rest) == 0 else f"{last}.{rest}"
+        return None
+
+    def follow_imports(self, name: str) -> str:
+        # `package.User` re-exported from `package.models` becomes `package.models.User`
+        for _ in range(MAX_RESOLVE_DEPTH):
+            split = self.split_module(name)
+            if split is None or len(split[1]) == 0:
+                break
+            module, rest = split
+            head, _, tail = rest.partition(".")
+            imported = self.modules[module].imports.get(head)
+            if imported is None:
+                break
+            name = imported if len(tail) == 0 else f"{imported}.{tail}"
+        return name
+
+    def qualify(self, module_name: str, name: str) -> str:
+        head, _, tail = name.partition(".")
+        symbols = self.modules.get(module_name)
+        if symbols is not None and head in symbols.imports:
+            name = symbols.imports[head] + ("" if len(tail) == 0 else f".{tail}")
+        elif symbols is not None and head in symbols.aliases:
+            name = f"{module_name}.{name}"
+        return self.follow_imports(name)
+
+    def get_alias(self, name: str) -> Optional[Tuple[str, str]]:
+        split = self.split_module(name)
+        if split is None:
+            return None
+        module, rest = split
+        source = self.modules[module].aliases.get(rest)
+        return None if source is None else (module, source)
+
+    def resolve_expression(
+        self, module_name: str, expression: ast.expr, depth: int = 0
+    ) -> ast.expr:
+        name = get_dotted_name(expression)
+        if name is not None:
+            qualified = self.qualify(module_name, name)
+            alias = self.get_alias(qualified)
+            if alias is not None and depth < MAX_RESOLVE_DEPTH:
+                try:
+                    value = ast.parse(alias[1], mode="eval").body
+                except SyntaxError:
+                    return expression
+                return self.resolve_expression(alias[0], value, depth + 1)
+            # Kept as a single dotted name, which renders as it is
+            return ast.Name(id=strip_implicit_module(qualified))
+        if isinstance(expression, ast.Constant) and isinstance(expression.value, str):
+            # A forward reference like `"User"`
+            try:
+                value = ast.parse(expression.value.strip(), mode="eval").body
+            except SyntaxError:
+                return expression
+            return self.resolve_expression(module_name, value, depth)
+        if isinstance(expression, ast.Subscript):
+            value = self.resolve_expression(module_name, expression.value, depth)
+            if get_subscript_name(value) in LITERAL_NAMES:
+                # Literal values are not types
+                return ast.Subscript(value=value, slice=expression.slice)
+            return ast.Subscript(
+                value=value,
+                slice=self.resolve_expression(module_name, expression.slice, depth),
+            )
+        if isinstance(expression, ast.BinOp):
+            return ast.BinOp(
+                left=self.resolve_expression(module_name, expression.left, depth),
+                op=expression.op,
+                right=self.resolve_expression(module_name, expression.right, depth),
+            )
+        if isinstance(expression, (ast.Tuple, ast.List)):
+            return type(expression)(
+                elts=[
+                    self.resolve_expression(module_name, e, depth)
+                    for e in expression.elts
+                ]
+            )
+        return expression
+
+    def resolve_hint(self, module_name: str, type_hint: str) -> str:
+        # Every name imported or aliased in the project is replaced by what it refers to
+        try:
+            expression = ast.parse(type_hint.strip(), mode="eval").body
+        except SyntaxError:
+            return type_hint
+        return render_type_expression(self.resolve_expression(module_name, expression))
+
+    def get_file_module_name(self, file_path: Path) -> str:
+        key = os.path.abspath(file_path)
+        return (self.module_names.get(key) or get_module_name(key))[0]
+
+    def get_scope(self, file_path: Path) -> "ModuleScope":
+        return ModuleScope(self, self.get_file_module_name(file_path))
+
+    def get_module_digest(self, module_name: str) -> str:
+        # Changes whenever the imports or aliases of the module do, or it appears
+        # or disappears
+        digest = self.module_digests.get(module_name)
+        if digest is None:
+            symbols = self.modules.get(module_name)
+            digest = (
+                ""
+                if symbols is None
+                else hashlib.blake2b(
+                    repr(
+                        (
+                            sorted(symbols.imports.items()),
+                            sorted(symbols.aliases.items()),
+                        )
+                    ).encode(errors="surrogateescape"),
+                    digest_size=20,
+                ).hexdigest()
+            )
+            self.module_digests[module_name] = digest
+        return digest
+
+    def get_modules_fingerprint(self, module_names: Iterable[str]) -> bytes:
+        # Part of a cache key, so a result is only reused while every module it
+        # looked names up in is unchanged
+        return "".join(
+            f"{m}={self.get_module_digest(m)};" for m in module_names
+        ).encode(errors="surrogateescape")
+
+
+def names_match(expected: str, actual: str) -> bool:
+    # A docstring may leave out the modules, like `User` for `package.models.User`
+    return expected == actual or expected.endswith("." + actual)
+
+
+class ModuleScope:
+    # The names of one module, for comparing hints written in it. The modules
+    # looked up are recorded, since they are all a check of the module depends on
+    def __init__(self, index: SymbolIndex, module_name: str):
+        self.used_modules: Set[str] = set()
+        self.index = SymbolIndex(
+            RecordedModules(index.modules, self.used_modules), index.module_names
+        )
+        self.module_name = module_name
+
+    def hints_match(self, function_hint: str, docstring_hint: str) -> bool:
+        expected = HINT_TOKEN_PATTERN.findall(
+            self.index.resolve_hint(self.module_name, function_hint)
+        )
+        actual = HINT_TOKEN_PATTERN.findall(
+            self.index.resolve_hint(self.module_name, docstring_hint)
+        )
+        return len(expected) == len(actual) and all(
+            names_match(e, a) for e, a in zip(expected, actual)
+        )
+
+
+def get_stat_key(path: str) -> Optional[StatKey]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def collect_file_symbols(
+    file_path: str, module_name: str, is_package: bool
+) -> ModuleSymbols:
+    # Modules that cannot be read or parsed define nothing
+    try:
+        with open(file_path, "rb") as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return ModuleSymbols()
+    return collect_module_symbols(tree, module_name, is_package)
+
+
+# An entry of the persisted index for each file
+IndexEntry = Tuple[StatKey, Tuple[str, bool], ModuleSymbols]
+
+
+def read_index_entries(index_path: Path) -> Dict[str, IndexEntry]:
+    try:
+        with open(index_path, "rb") as f:
+            version, entries = pickle.load(f)
+    except (
+        OSError,
+        EOFError,
+        ValueError,
+        pickle.UnpicklingError,
+        AttributeError,
+        ImportError,
+    ):
+        return {}
+    return entries if version == SYMBOL_INDEX_VERSION else {}
+
+
+def write_index_entries(index_path: Path, entries: Dict[str, IndexEntry]) -> None:
+    try:
+        create_cache_directory(index_path.parent)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=index_path.parent, prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(
+                    (SYMBOL_INDEX_VERSION, entries), f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(temporary_path, index_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+    except OSError:
+        # Like the result cache, a read-only disk only costs time on the next run
+        pass
+
+
+def load_symbol_index(
+    file_paths: Iterable[Path], index_path: Optional[Path] = None
+) -> SymbolIndex:
+    # Only files that changed since the persisted index was written are parsed
+    previous = {} if index_path is None else read_index_entries(index_path)
+    entries: Dict[str, IndexEntry] = {}
+    n_collected = 0
+    for file_path in file_paths:
+        key = os.path.abspath(file_path)
+        stat_key = get_stat_key(key)
+        if stat_key is None:
+            continue
+        entry = previous.get(key)
+        if entry is None or entry[0] != stat_key:
+            module_name = get_module_name(key)
+            entry = (stat_key, module_name, collect_file_symbols(key, *module_name))
+            n_collected += 1
+        entries[key] = entry
+    if index_path is not None and (n_collected > 0 or len(entries) != len(previous)):
+        write_index_entries(index_path, entries)
+    return SymbolIndex(
+        {module_name[0]: symbols for _, module_name, symbols in entries.values()},
+        {key: module_name for key, (_, module_name, _) in entries.items()},
+    )
+
+
+# Set in each worker process when it starts, so the index is not sent with every batch
+worker_symbol_index: Optional[SymbolIndex] = None
+
+
+def set_worker_symbol_index(index: Optional[SymbolIndex]) -> None:
+    global worker_symbol_index
+    worker_symbol_index = index
+
+
+def get_worker_symbol_index() -> Optional[SymbolIndex]:
+    return worker_symbol_index
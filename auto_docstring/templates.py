@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence
+
+if TYPE_CHECKING:
+    from auto_docstring import FunctionArgument
+
+DEFAULT_STYLE = "google"
+ARGUMENT_FIELDS = ("name", "type_hint")
+UNTYPED_ARGUMENT_FIELDS = ("name",)
+RETURN_FIELDS = ("type_hint",)
+
+
+@dataclass(frozen=True, slots=True)
+class DocstringTemplate:
+    summary: str
+    # Between the summary and the first section
+    summary_separator: str
+    # Between two sections
+    section_separator: str
+    # Followed by one line per argument, empty when arguments need no header
+    args_header: str
+    # The lines for one argument, with `{name}` and `{type_hint}` fields
+    argument: str
+    # The lines for an argument without an annotation, with a `{name}` field
+    untyped_argument: str
+    # The whole section with a `{type_hint}` field
+    returns: str
+
+
+TEMPLATES: Dict[str, DocstringTemplate] = {
+    "google": DocstringTemplate(
+        summary="_function_summary_",
+        summary_separator="\n\n",
+        section_separator="\n\n",
+        args_header="Args:",
+        argument="    {name} ({type_hint}): _argument_description_",
+        untyped_argument="    {name}: _argument_description_",
+        returns="Returns:\n    {type_hint}: _return_description_",
+    ),
+    "numpy": DocstringTemplate(
+        summary="_function_summary_",
+        summary_separator="\n\n",
+        section_separator="\n\n",
+        args_header="Parameters\n----------",
+        argument="{name} : {type_hint}\n    _argument_description_",
+        untyped_argument="{name}\n    _argument_description_",
+        returns="Returns\n-------\n{type_hint}\n    _return_description_",
+    ),
+    "sphinx": DocstringTemplate(
+        summary="_function_summary_",
+        summary_separator="\n\n",
+        # Fields form a single list
+        section_separator="\n",
+        args_header="",
+        argument=":param {name}: _argument_description_\n:type {name}: {type_hint}",
+        untyped_argument=":param {name}: _argument_description_",
+        returns=":returns: _return_description_\n:rtype: {type_hint}",
+    ),
+}
+
+
+def compile_template(template: str, fields: Sequence[str]) -> Callable[..., str]:
+    # The bound `str.format` of the template with its fields numbered in the order
+    # of `fields`, so rendering is one call with positional values. Only plain
+    # fields are allowed, so rendering never reads attributes or items
+    parts = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field_name is None:
+            continue
+        if field_name not in fields or format_spec or conversion is not None:
+            raise ValueError(f"Unsupported field `{{{field_name}}}` in template.")
+        parts.append(f"{{{fields.index(field_name)}}}")
+    return "".join(parts).format
+
+
+class DocstringRenderer:
+    def __init__(self, template: DocstringTemplate):
+        self.summary = template.summary
+        # Separators and headers are joined ahead of time
+        self.args_header = template.summary_separator + (
+            template.args_header + "\n" if len(template.args_header) > 0 else ""
+        )
+        self.render_argument = compile_template(template.argument, ARGUMENT_FIELDS)
+        self.render_untyped_argument = compile_template(
+            template.untyped_argument, UNTYPED_ARGUMENT_FIELDS
+        )
+        self.render_returns_after_summary = compile_template(
+            template.summary_separator + template.returns, RETURN_FIELDS
+        )
+        self.render_returns_after_args = compile_template(
+            template.section_separator + template.returns, RETURN_FIELDS
+        )
+
+    def render(
+        self, arguments: Sequence["FunctionArgument"], return_type_hint: Optional[str]
+    ) -> str:
+        parts = [self.summary]
+        if len(arguments) > 0:
+            render_argument = self.render_argument
+            render_untyped_argument = self.render_untyped_argument
+            parts.append(self.args_header)
+            parts.append(
+                "\n".join(
+                    [
+                        render_argument(a.name, a.type_hint)
+                        if a.type_hint is not None
+                        else render_untyped_argument(a.name)
+                        for a in arguments
+                    ]
+                )
+            )
+        if return_type_hint is not None:
+            if len(arguments) > 0:
+                parts.append(self.render_returns_after_args(return_type_hint))
+            else:
+                parts.append(self.render_returns_after_summary(return_type_hint))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def get_renderer(style: str) -> DocstringRenderer:
+    # Each style is compiled once per process
+    try:
+        return DocstringRenderer(TEMPLATES[style])
+    except KeyError:
+        raise ValueError(f"Unknown docstring style `{style}`.") from None
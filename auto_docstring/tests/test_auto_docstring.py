@@ -1,13 +1,21 @@
 import ast
+import time
+from pathlib import Path
 from typing import List
 
 import pytest
 
 from auto_docstring import (
+    ArgumentKind,
     DocstringFunctionArgument,
+    DocstringParts,
     FunctionArgument,
     FunctionDef,
     FunctionParts,
+    ScopeRules,
+    check_docstring,
+    collect_functions,
+    extract_docstring_parts,
     find_functions_in_ast,
     generate_docstring,
     generate_docstring_argument,
@@ -69,6 +77,161 @@ def test_find_functions_in_ast(python_code: str, expected_n_functions: int):
     assert len(output) == expected_n_functions
 
 
+collect_functions_code = """
+def f():
+    def nested():
+        pass
+
+async def g():
+    pass
+
+class C:
+    def method(self):
+        pass
+
+    async def _private_method(self):
+        pass
+
+    class Inner:
+        def inner_method(self):
+            pass
+
+def _private():
+    class Local:
+        def local_method(self):
+            pass
+
+if True:
+    def conditional():
+        pass
+"""
+
+
+@pytest.mark.parametrize(
+    ",".join(["rules", "expected_qualnames"]),
+    [
+        (
+            ScopeRules(),
+            [
+                "f",
+                "f.<locals>.nested",
+                "g",
+                "C.method",
+                "C._private_method",
+                "C.Inner.inner_method",
+                "_private",
+                "_private.<locals>.Local.local_method",
+                "conditional",
+            ],
+        ),
+        (
+            ScopeRules(include_nested=False),
+            [
+                "f",
+                "g",
+                "C.method",
+                "C._private_method",
+                "C.Inner.inner_method",
+                "_private",
+                "conditional",
+            ],
+        ),
+        (
+            ScopeRules(include_private=False),
+            [
+                "f",
+                "f.<locals>.nested",
+                "g",
+                "C.method",
+                "C.Inner.inner_method",
+                "conditional",
+            ],
+        ),
+        (
+            ScopeRules(include_methods=False),
+            ["f", "f.<locals>.nested", "g", "_private", "conditional"],
+        ),
+    ],
+)
+def test_collect_functions(rules: ScopeRules, expected_qualnames: List[str]):
+    tree = parse_python_code(collect_functions_code)
+    collector = collect_functions(tree, rules)
+    assert [f.qualname for f in collector.functions] == expected_qualnames
+    assert [f.name for f in collector.function_defs] == [
+        q.split(".")[-1] for q in expected_qualnames
+    ]
+
+
+decorated_code = """
+from typing import overload
+import typing
+
+@overload
+def f(x: int) -> int: ...
+@typing.overload
+def f(x: str) -> str: ...
+def f(x):
+    pass
+
+class C:
+    @property
+    def x(self):
+        def helper():
+            pass
+
+    @x.setter
+    def x(self, value):
+        pass
+
+    @staticmethod
+    def static():
+        pass
+"""
+
+
+@pytest.mark.parametrize(
+    ",".join(["rules", "expected_qualnames"]),
+    [
+        (
+            ScopeRules(include_overloads=False),
+            ["f", "C.x", "C.x.<locals>.helper", "C.x", "C.static"],
+        ),
+        (ScopeRules(include_properties=False), ["f", "f", "f", "C.static"]),
+    ],
+)
+def test_collect_functions_exempts_decorated_functions(
+    rules: ScopeRules, expected_qualnames: List[str]
+):
+    functions = collect_functions(parse_python_code(decorated_code), rules).functions
+    assert [f.qualname for f in functions] == expected_qualnames
+
+
+def test_collect_functions_marks_methods():
+    tree = parse_python_code(collect_functions_code)
+    methods = [f.qualname for f in collect_functions(tree).functions if f.is_method]
+    assert methods == [
+        "C.method",
+        "C._private_method",
+        "C.Inner.inner_method",
+        "_private.<locals>.Local.local_method",
+    ]
+
+
+def test_check_docstring_ignores_self():
+    code = '''
+class C:
+    def method(self, x: int):
+        """
+        Summary.
+
+        Args:
+            x (int): An argument.
+        """
+'''
+    function = collect_functions(parse_python_code(code)).functions[0]
+    assert check_docstring(Path("test.py"), function) == []
+
+
 stringify_type_expression_codes = [
     "List[Dict[str, Any]]",
     "Optional[Union[int, MyOtherType]]",
@@ -96,6 +259,82 @@ def test_stringify_type_expression_errors(type_expression: ast.expr):
         stringify_type_expression(type_expression)
 
 
+extract_docstring_parts_input = [
+    "Summary.",
+    "Summary.\n\nDescription.\nMore description.",
+    "Summary.\n\nArgs:\n    x (int): An argument.",
+    "    Summary.\n\nDescription.\n\nArgs:\n    x (int): An argument.\n\nReturns:\n    int: A value.",
+    "Summary.\n\nDescription.\n\nReturns:\n    int: A value.\n\nYields:\n    int: A value.",
+    "Summary.\n\nArgs:\n    x (int): An argument.\n\nRaises:\n    ValueError: An error.\n\nReturns:\n    int: A value.",
+]
+extract_docstring_parts_output = [
+    DocstringParts("Summary.", None, None, None, None, None),
+    DocstringParts(
+        "Summary.", "Description.\nMore description.", None, None, None, None
+    ),
+    DocstringParts("Summary.", None, "    x (int): An argument.", None, None, None),
+    DocstringParts(
+        "Summary.",
+        "Description.",
+        "    x (int): An argument.",
+        None,
+        "    int: A value.",
+        None,
+    ),
+    DocstringParts(
+        "Summary.",
+        "Description.",
+        None,
+        None,
+        "    int: A value.",
+        "    int: A value.",
+    ),
+    DocstringParts(
+        "Summary.",
+        None,
+        "    x (int): An argument.",
+        "    ValueError: An error.",
+        "    int: A value.",
+        None,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ",".join(["docstring", "expected_parts"]),
+    zip(extract_docstring_parts_input, extract_docstring_parts_output),
+)
+def test_extract_docstring_parts(docstring: str, expected_parts: DocstringParts):
+    assert extract_docstring_parts(docstring) == expected_parts
+
+
+@pytest.mark.parametrize("docstring", ["", "\nSummary.", "Summary.\nNo blank line."])
+def test_extract_docstring_parts_errors(docstring: str):
+    with pytest.raises(ValueError):
+        extract_docstring_parts(docstring)
+
+
+n_pathological_lines = 50_000
+extract_docstring_parts_pathological_input = [
+    "Summary.\n\n" + "word " * n_pathological_lines,
+    "Summary.\n\n" + "\n\n".join(["Args:"] * n_pathological_lines),
+    "Summary.\n\n" + "Args:\n\n" * n_pathological_lines + "Yields:",
+    "Summary.\n\nArgs:\n" + "    x (int): An argument.\n" * n_pathological_lines,
+    "Summary.\n\n" + "Returns:\n\nArgs:\n\n" * n_pathological_lines,
+]
+
+
+@pytest.mark.parametrize(
+    "docstring",
+    extract_docstring_parts_pathological_input,
+    ids=range(len(extract_docstring_parts_pathological_input)),
+)
+def test_extract_docstring_parts_is_linear(docstring: str):
+    start = time.perf_counter()
+    extract_docstring_parts(docstring)
+    assert time.perf_counter() - start < 1.0
+
+
 parse_args_from_docstring_input = [
     """
         x (int): This is the description of the first argument.
@@ -134,6 +373,15 @@ parse_args_from_docstring_output = [
 ]
 
 
+def test_parse_args_from_docstring_without_types():
+    docstring_args = "    x: X.\n        See: y.\n    y (int): Y.\n    z: Z."
+    assert parse_args_from_docstring(docstring_args) == [
+        DocstringFunctionArgument("x", None, "X.\nSee: y."),
+        DocstringFunctionArgument("y", "int", "Y."),
+        DocstringFunctionArgument("z", None, "Z."),
+    ]
+
+
 @pytest.mark.skip()
 @pytest.mark.parametrize(
     ",".join(["docstring_args", "expected_args"]),
@@ -174,7 +422,6 @@ def test_generate_docstring_argument(
     assert generate_docstring_argument(arg) == expected_argument_docstring
 
 
-@pytest.mark.skip()
 @pytest.mark.parametrize(
     ",".join(["function_parts", "expected_docstring"]),
     [
@@ -185,17 +432,29 @@ def test_generate_docstring_argument(
                 [FunctionArgument("x", "int"), FunctionArgument("y", "str")],
                 "Optional[int]",
             ),
-            """
-_function_summary_
+            """_function_summary_
 
 Args:
     x (int): _argument_description_
     y (str): _argument_description_
 
-Return:
-    Optional[int]: _return_description_
-""",
-        )
+Returns:
+    Optional[int]: _return_description_""",
+        ),
+        (
+            FunctionParts(
+                "method",
+                None,
+                [FunctionArgument("self", None), FunctionArgument("x", "int")],
+                None,
+                is_method=True,
+            ),
+            """_function_summary_
+
+Args:
+    x (int): _argument_description_""",
+        ),
+        (FunctionParts("f", None, [], None), "_function_summary_"),
     ],
 )
 def test_generate_docstring(function_parts: FunctionParts, expected_docstring: str):
@@ -231,12 +490,22 @@ get_function_arguments_input = [
     "def f(x): pass",
     "def f(x: int): pass",
     "def f(x: str, y: Optional[int]): pass",
+    "async def f(x: int): pass",
+    "def f(a, /, b: int, *args: str, c, **kwargs: Any): pass",
 ]
 get_function_arguments_output = [
     [],
     [FunctionArgument("x", None)],
     [FunctionArgument("x", "int")],
     [FunctionArgument("x", "str"), FunctionArgument("y", "Optional[int]")],
+    [FunctionArgument("x", "int")],
+    [
+        FunctionArgument("a", None, ArgumentKind.POSITIONAL_ONLY),
+        FunctionArgument("b", "int", ArgumentKind.POSITIONAL_OR_KEYWORD),
+        FunctionArgument("args", "str", ArgumentKind.VAR_POSITIONAL),
+        FunctionArgument("c", None, ArgumentKind.KEYWORD_ONLY),
+        FunctionArgument("kwargs", "Any", ArgumentKind.VAR_KEYWORD),
+    ],
 ]
 
 
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from auto_docstring.baseline import BASELINE_HEADER, Baseline, BaselineWriter
+from auto_docstring.docstring_errors import (
+    MissingArgumentError,
+    MissingDocstringError,
+    UndocumentedArgumentError,
+)
+from auto_docstring.engine import FileResult, FunctionResult
+
+
+def make_result(file_path: Path, errors_by_function) -> FileResult:
+    return FileResult(
+        file_path,
+        [FunctionResult(name, errors) for name, errors in errors_by_function],
+    )
+
+
+def get_errors(result: FileResult):
+    return [e for f in result.functions for e in f.errors]
+
+
+def write_baseline(baseline_path: Path, results) -> Baseline:
+    writer = BaselineWriter(baseline_path)
+    for result in results:
+        writer.add(result)
+    writer.write()
+    return Baseline.load(baseline_path)
+
+
+def test_baseline_hides_only_recorded_errors(tmp_path: Path):
+    file_path = tmp_path / "module.py"
+    old_errors = [
+        ("f", [MissingDocstringError(file_path, "f")]),
+        ("g", [MissingArgumentError(file_path, "g", "x")]),
+        ("h", []),
+    ]
+    baseline = write_baseline(
+        tmp_path / "baseline", [make_result(file_path, old_errors)]
+    )
+
+    new_errors = [
+        MissingArgumentError(file_path, "g", "y"),
+        UndocumentedArgumentError(file_path, "g", "x"),
+        MissingDocstringError(file_path, "h"),
+    ]
+    result = make_result(
+        file_path,
+        [
+            ("f", [MissingDocstringError(file_path, "f")]),
+            ("g", [MissingArgumentError(file_path, "g", "x"), *new_errors[:2]]),
+            ("h", new_errors[2:]),
+        ],
+    )
+    assert get_errors(baseline.filter(result)) == new_errors
+    # Errors are recorded per file
+    other = make_result(tmp_path / "other.py", old_errors)
+    assert len(get_errors(baseline.filter(other))) == 2
+
+
+def test_baseline_counts_repeated_errors(tmp_path: Path):
+    file_path = tmp_path / "module.py"
+    error = MissingDocstringError(file_path, "f")
+    baseline = write_baseline(
+        tmp_path / "baseline", [make_result(file_path, [("f", [error])])]
+    )
+    # A second definition with the same name is a new error
+    result = make_result(file_path, [("f", [error]), ("f", [error])])
+    assert get_errors(baseline.filter(result)) == [error]
+
+
+def test_baseline_paths_are_relative_to_the_baseline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    (tmp_path / "sub").mkdir()
+    monkeypatch.chdir(tmp_path)
+    file_path = Path("module.py")
+    result = make_result(file_path, [("f", [MissingDocstringError(file_path, "f")])])
+    baseline = write_baseline(Path("baseline"), [result])
+
+    monkeypatch.chdir(tmp_path / "sub")
+    moved_path = Path("../module.py")
+    moved = make_result(moved_path, [("f", [MissingDocstringError(moved_path, "f")])])
+    assert get_errors(baseline.filter(moved)) == []
+
+
+def test_baseline_file_is_sorted_and_compact(tmp_path: Path):
+    results = [
+        make_result(
+            tmp_path / f"module_{i}.py",
+            [("f", [MissingDocstringError(tmp_path / f"module_{i}.py", "f")])],
+        )
+        for i in range(100)
+    ]
+    baseline_path = tmp_path / "baseline"
+    write_baseline(baseline_path, results)
+    data = baseline_path.read_bytes()
+    assert len(data) == len(BASELINE_HEADER) + 100 * 8
+
+    write_baseline(baseline_path, results[::-1])
+    assert baseline_path.read_bytes() == data
+
+
+@pytest.mark.parametrize("data", [b"", b"{}", BASELINE_HEADER + b"\0\0\0"])
+def test_invalid_baseline_is_an_error(tmp_path: Path, data: bytes):
+    baseline_path = tmp_path / "baseline"
+    baseline_path.write_bytes(data)
+    with pytest.raises(ValueError):
+        Baseline.load(baseline_path)
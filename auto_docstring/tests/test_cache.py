@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+from auto_docstring.cache import ResultCache
+from auto_docstring.engine import FunctionResult, check_file
+
+
+def test_cache_round_trip(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.get_key(b"def f(): pass")
+    assert cache.load(key) is None
+    cache.store(key, [FunctionResult("f", [])])
+    assert cache.load(key) == [FunctionResult("f", [])]
+
+
+def test_cache_key_depends_on_content(tmp_path: Path):
+    cache = ResultCache(tmp_path)
+    assert cache.get_key(b"a") == cache.get_key(b"a")
+    assert cache.get_key(b"a") != cache.get_key(b"b")
+
+
+def test_cache_ignores_corrupt_entries(tmp_path: Path):
+    cache = ResultCache(tmp_path)
+    key = cache.get_key(b"")
+    entry_path = cache.get_entry_path(key)
+    entry_path.parent.mkdir(parents=True)
+    entry_path.write_bytes(b"not a pickle")
+    assert cache.load(key) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ResultCache(tmp_path, max_bytes=0)
+    keys = [cache.get_key(bytes([i])) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.store(key, "x" * 100)
+        os.utime(cache.get_entry_path(key), (i, i))
+    entry_size = cache.get_entry_path(keys[0]).stat().st_size
+    cache.max_bytes = entry_size * 3
+    cache.evict()
+    remaining = [key for key in keys if cache.get_entry_path(key).exists()]
+    assert remaining == keys[2:]
+
+
+def test_check_file_skips_parsing_unchanged_files(tmp_path: Path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache")
+    first_path = tmp_path / "first.py"
+    second_path = tmp_path / "second.py"
+    first_path.write_text("def f():\n    pass\n")
+    second_path.write_text("def f():\n    pass\n")
+    first_result = check_file(first_path, cache)
+
+    def fail(code):
+        raise AssertionError("parsed a cached file")
+
+    monkeypatch.setattr("auto_docstring.engine.parse_python_code", fail)
+    second_result = check_file(second_path, cache)
+    assert [f.name for f in second_result.functions] == ["f"]
+    assert second_result.functions[0].errors[0].file_path == second_path
+    assert first_result.functions[0].errors[0].file_path == first_path
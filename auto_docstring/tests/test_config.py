@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import pytest
+
+from auto_docstring import ScopeRules
+from auto_docstring.cache import ResultCache
+from auto_docstring.config import (
+    find_pyproject,
+    get_path_rules,
+    get_scope_rules,
+    load_config,
+)
+from auto_docstring.discovery import discover_python_files
+from auto_docstring.engine import check_files
+
+
+def write_pyproject(directory: Path, content: str) -> Path:
+    path = directory / "pyproject.toml"
+    path.write_text(content)
+    return path
+
+
+def test_find_pyproject_searches_parent_directories(tmp_path: Path):
+    path = write_pyproject(tmp_path, "")
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    assert find_pyproject(nested) == path
+
+
+def test_load_config_reads_scope_rules(tmp_path: Path):
+    path = write_pyproject(
+        tmp_path,
+        "[tool.black]\nline-length = 88\n\n"
+        "[tool.auto-docstring]\ninclude-methods = false\ninclude-overloads = false\n",
+    )
+    assert get_scope_rules(load_config(path)) == ScopeRules(
+        include_methods=False, include_overloads=False
+    )
+
+
+def test_load_config_without_section(tmp_path: Path):
+    assert load_config(write_pyproject(tmp_path, "[tool.black]\n")) == {}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "[tool.auto-docstring]\ninclude-everything = true\n",
+        '[tool.auto-docstring]\ninclude-nested = "no"\n',
+        "[tool.auto-docstring\n",
+        '[tool.auto-docstring]\nexclude = "build"\n',
+        '[tool.auto-docstring]\nexclude = ["!keep.py"]\n',
+        "[[tool.auto-docstring.overrides]]\ninclude-private = false\n",
+        '[[tool.auto-docstring.overrides]]\npaths = ["a"]\ninclude = ["b"]\n',
+    ],
+)
+def test_load_config_rejects_invalid_files(tmp_path: Path, content: str):
+    with pytest.raises(ValueError):
+        load_config(write_pyproject(tmp_path, content))
+
+
+def test_command_line_rules_can_only_skip_more():
+    rules = ScopeRules(include_private=False)
+    config = {"include-private": True, "include-nested": False}
+    assert get_scope_rules(config, rules) == ScopeRules(
+        include_private=False, include_nested=False
+    )
+
+
+def test_path_rules_override_rules_below_paths(tmp_path: Path):
+    path = write_pyproject(
+        tmp_path,
+        "[tool.auto-docstring]\n"
+        'exclude = ["build/"]\n'
+        "include-private = false\n\n"
+        "[[tool.auto-docstring.overrides]]\n"
+        'paths = ["tests/"]\n'
+        "include-methods = false\n"
+        "include-private = true\n",
+    )
+    path_rules = get_path_rules(
+        load_config(path), tmp_path, ScopeRules(include_nested=False)
+    )
+    assert path_rules is not None
+    assert path_rules.get_rules(tmp_path / "src" / "a.py") == ScopeRules(
+        include_nested=False, include_private=False
+    )
+    assert path_rules.get_rules(tmp_path / "tests" / "a.py") == ScopeRules(
+        include_nested=False, include_methods=False
+    )
+    assert path_rules.get_rules(tmp_path / "build" / "a.py") is None
+
+
+def test_path_rules_are_only_built_when_needed(tmp_path: Path):
+    assert get_path_rules({"include-private": False}, tmp_path) is None
+
+
+def test_check_files_uses_the_rules_of_each_path(tmp_path: Path):
+    source = "class C:\n    def method(self):\n        pass\n"
+    for directory in ["src", "tests", "build"]:
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "module.py").write_text(source)
+    config = {
+        "exclude": ["build/"],
+        "overrides": [{"paths": ["tests/"], "include-methods": False}],
+    }
+    path_rules = get_path_rules(config, tmp_path)
+    assert path_rules is not None
+    cache = ResultCache(tmp_path / "cache")
+    for _ in range(2):
+        # The second run comes from the cache, which keeps the rules apart
+        file_paths = discover_python_files([tmp_path], (), path_rules.classifier)
+        results = check_files(file_paths, cache=cache, path_rules=path_rules)
+        assert [
+            (
+                r.file_path.relative_to(tmp_path).as_posix(),
+                [f.name for f in r.functions],
+            )
+            for r in results
+        ] == [("src/module.py", ["C.method"]), ("tests/module.py", [])]
@@ -0,0 +1,96 @@
+import sys
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from auto_docstring.__main__ import run_client
+from auto_docstring.cli import get_cli_arguments
+from auto_docstring.daemon import DaemonServer, ProjectState, render_results
+from auto_docstring.daemon_client import query_daemon
+
+
+def make_project(tmp_path: Path) -> Path:
+    (tmp_path / "good.py").write_text('def f():\n    """\n    Summary.\n    """\n')
+    (tmp_path / "bad.py").write_text("def g():\n    pass\n")
+    return tmp_path
+
+
+def test_project_state_rechecks_changed_files(tmp_path: Path):
+    state = ProjectState([make_project(tmp_path)])
+    state.refresh_all()
+    results, failures = state.query([])
+    assert [r.file_path.name for r in results] == ["bad.py", "good.py"]
+    assert failures == []
+
+    (tmp_path / "good.py").write_text("def f():\n    pass\n\n\ndef h():\n    pass\n")
+    (tmp_path / "bad.py").unlink()
+    results, _ = state.query([tmp_path / "good.py"])
+    assert [f.name for f in results[0].functions] == ["f", "h"]
+    state.refresh_all()
+    results, _ = state.query([])
+    assert [r.file_path.name for r in results] == ["good.py"]
+
+
+def test_project_state_survives_broken_files(tmp_path: Path):
+    state = ProjectState([make_project(tmp_path)])
+    (tmp_path / "broken.py").write_text("def (")
+    state.refresh_all()
+    results, failures = state.query([])
+    assert len(results) == 2
+    assert len(failures) == 1
+    assert failures[0].startswith(str(tmp_path / "broken.py"))
+
+
+def test_render_results(tmp_path: Path):
+    state = ProjectState([make_project(tmp_path)])
+    state.refresh_all()
+    output, n_errors = render_results(state.query([])[0], "text", False)
+    assert n_errors == 1
+    assert output.endswith("g\nFunction `g` is missing a docstring.\n")
+
+
+def test_daemon_server_round_trip(tmp_path: Path):
+    state = ProjectState([make_project(tmp_path)])
+    state.refresh_all()
+    socket_path = tmp_path / "daemon.sock"
+    server = DaemonServer(socket_path, state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response = query_daemon(
+            socket_path, {"paths": [str(tmp_path / "good.py")], "format": "text"}
+        )
+        assert response == {"output": "", "failures": [], "exit_code": 0}
+        response = query_daemon(socket_path, {"paths": [], "format": "jsonl"})
+        assert response["exit_code"] == 1
+        assert '"function": "g"' in response["output"]
+        assert query_daemon(socket_path, {"command": "stop"})["exit_code"] == 0
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    finally:
+        server.server_close()
+
+
+def test_client_without_daemon_fails_cleanly(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    socket_path = tmp_path / "missing.sock"
+    monkeypatch.setattr(
+        sys, "argv", ["auto_docstring", "--client", "--socket", str(socket_path)]
+    )
+    assert run_client(get_cli_arguments()) == 2
+    assert f"cannot reach a daemon on {socket_path}" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "flag", [["--fix"], ["--diff-base", "HEAD"], ["--baseline", "b.txt"]]
+)
+@pytest.mark.parametrize("mode", ["--daemon", "--client"])
+def test_per_run_flags_are_rejected_with_the_daemon(
+    monkeypatch: pytest.MonkeyPatch, flag: List[str], mode: str
+):
+    monkeypatch.setattr(sys, "argv", ["auto_docstring", mode, *flag, "."])
+    with pytest.raises(SystemExit):
+        get_cli_arguments()
@@ -0,0 +1,198 @@
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from auto_docstring.discovery import (
+    IgnoreMatcher,
+    PathClassifier,
+    discover_python_files,
+    walk_directory,
+)
+
+
+def make_tree(root: Path, file_paths: List[str]):
+    for file_path in file_paths:
+        path = root / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def relative_paths(root: Path, paths) -> List[str]:
+    return [p.relative_to(root).as_posix() for p in paths]
+
+
+def test_discover_python_files(tmp_path: Path):
+    make_tree(
+        tmp_path,
+        [
+            "a.py",
+            "notes.txt",
+            "package/__init__.py",
+            "package/module.py",
+            "package/module_pb2.py",
+            "package/keep_pb2.py",
+            "package/build/generated.py",
+            "package/nested/.gitignore",
+            "package/nested/local.py",
+            "package/nested/ignored_here.py",
+            "top_only.py",
+            "sub/top_only.py",
+            ".git/hooks/hook.py",
+            "__pycache__/cached.py",
+            "env/pyvenv.cfg",
+            "env/lib/site.py",
+            "excluded/thing.py",
+        ],
+    )
+    (tmp_path / ".gitignore").write_text(
+        "# Comment\n\nbuild/\n*_pb2.py\n!keep_pb2.py\n/top_only.py\n"
+    )
+    (tmp_path / "package/nested/.gitignore").write_text("ignored_here.py\n")
+    output = discover_python_files([tmp_path], exclude=["excluded"])
+    assert relative_paths(tmp_path, output) == [
+        "a.py",
+        "package/__init__.py",
+        "package/keep_pb2.py",
+        "package/module.py",
+        "package/nested/local.py",
+        "sub/top_only.py",
+    ]
+
+
+def test_discover_python_files_keeps_explicit_files(tmp_path: Path):
+    make_tree(tmp_path, ["script", "directory/module.py"])
+    output = discover_python_files([tmp_path / "script", tmp_path / "directory"])
+    assert relative_paths(tmp_path, output) == ["script", "directory/module.py"]
+
+
+def test_walk_directory_is_lazy(tmp_path: Path):
+    make_tree(tmp_path, ["a.py", "sub/b.py"])
+    walker = walk_directory(str(tmp_path), [])
+    assert next(walker) == tmp_path / "a.py"
+    (tmp_path / "sub" / "c.py").write_text("")
+    assert relative_paths(tmp_path, walker) == ["sub/b.py", "sub/c.py"]
+
+
+@pytest.mark.parametrize(
+    ",".join(["patterns", "relative_path", "is_directory", "expected_output"]),
+    [
+        (["*.py"], "a.py", False, True),
+        (["*.py"], "deep/path/a.py", False, True),
+        (["/a.py"], "deep/a.py", False, False),
+        (["deep/a.py"], "deep/a.py", False, True),
+        (["build/"], "build", True, True),
+        (["build/"], "build", False, False),
+        (["**/gen/*.py"], "x/y/gen/a.py", False, True),
+        (["gen/**"], "gen/x/y", True, True),
+        (["file?.py"], "file1.py", False, True),
+        (["file[!0-9].py"], "file1.py", False, False),
+        (["*.py", "!keep.py"], "keep.py", False, False),
+    ],
+)
+def test_ignore_matcher(
+    patterns: List[str], relative_path: str, is_directory: bool, expected_output: bool
+):
+    matcher = IgnoreMatcher(patterns)
+    assert matcher.matches(relative_path, is_directory) == expected_output
+
+
+@pytest.mark.parametrize(
+    ",".join(["include", "exclude", "groups", "relative_path", "expected_output"]),
+    [
+        ([], [], [], "a.py", 0),
+        ([], ["build/"], [], "build/a.py", None),
+        ([], ["build/"], [], "src/build/a.py", None),
+        ([], ["build/"], [], "build.py", 0),
+        ([], ["/gen"], [], "gen/deep/a.py", None),
+        ([], ["/gen"], [], "src/gen/a.py", 0),
+        (["src/"], [], [], "src/a.py", 0),
+        (["src/"], [], [], "scripts/a.py", None),
+        (["src/"], ["*_pb2.py"], [], "src/a_pb2.py", None),
+        ([], [], [["tests/"]], "tests/test_a.py", 1),
+        ([], [], [["tests/"]], "src/a.py", 0),
+        # Later groups win, exclusion wins over every group
+        ([], [], [["tests/"], ["test_*.py"]], "tests/test_a.py", 2),
+        ([], ["tests/"], [["tests/"]], "tests/test_a.py", None),
+        # Groups do not include paths by themselves
+        (["src/"], [], [["tests/"]], "tests/test_a.py", None),
+        (["src/", "tests/"], [], [["tests/"]], "tests/test_a.py", 1),
+    ],
+)
+def test_path_classifier(
+    tmp_path: Path,
+    include: List[str],
+    exclude: List[str],
+    groups: List[List[str]],
+    relative_path: str,
+    expected_output: Optional[int],
+):
+    classifier = PathClassifier(tmp_path, include, exclude, groups)
+    assert classifier.classify(str(tmp_path / relative_path)) == expected_output
+
+
+def test_path_classifier_ignores_paths_outside_root(tmp_path: Path):
+    classifier = PathClassifier(tmp_path / "project", ["src/"], ["*.py"])
+    assert classifier.classify(str(tmp_path / "other" / "a.py")) == 0
+    assert not classifier.excludes_directory(str(tmp_path / "other"))
+
+
+def test_discover_python_files_with_classifier(tmp_path: Path):
+    make_tree(
+        tmp_path,
+        ["src/a.py", "src/gen/b.py", "scripts/c.py", "tests/test_d.py", "e.py"],
+    )
+    classifier = PathClassifier(tmp_path, ["src/", "tests/", "e.py"], ["gen/"])
+    assert classifier.excludes_directory(str(tmp_path / "src" / "gen"))
+    assert not classifier.excludes_directory(str(tmp_path / "scripts"))
+    output = discover_python_files(
+        [tmp_path, tmp_path / "scripts/c.py"], (), classifier
+    )
+    assert relative_paths(tmp_path, output) == ["e.py", "src/a.py", "tests/test_d.py"]
+
+
+@pytest.mark.parametrize(
+    ",".join(["include", "relative_path", "expected_output"]),
+    [
+        (["/src/"], "src", False),
+        (["/src/"], "src/pkg", False),
+        (["/src/"], "docs", True),
+        (["src/pkg/*.py"], "src", False),
+        (["src/pkg/*.py"], "src/pkg", False),
+        (["src/pkg/*.py"], "src/other", True),
+        (["src/**/test_*.py"], "src/a/b", False),
+        (["src/**/test_*.py"], "docs", True),
+        (["src/p*/"], "src/pkg/deep", False),
+        (["src/p*/"], "src/other", True),
+        # Without a slash a pattern matches at any depth, so nothing can be skipped
+        (["src/"], "docs", False),
+        (["*.py"], "docs", False),
+        (["**/src/"], "docs", False),
+    ],
+)
+def test_path_classifier_skips_directories_outside_include(
+    tmp_path: Path, include: List[str], relative_path: str, expected_output: bool
+):
+    classifier = PathClassifier(tmp_path, include)
+    assert classifier.excludes_directory(str(tmp_path / relative_path)) == (
+        expected_output
+    )
+
+
+def test_discovery_does_not_walk_directories_outside_include(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    make_tree(tmp_path, ["src/pkg/a.py", "src/other/b.py", "docs/deep/c.py"])
+    classifier = PathClassifier(tmp_path, ["src/pkg/"])
+    scanned = []
+    scandir = os.scandir
+
+    def record_scandir(path: str):
+        scanned.append(os.path.relpath(path, tmp_path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", record_scandir)
+    output = discover_python_files([tmp_path], (), classifier)
+    assert relative_paths(tmp_path, output) == ["src/pkg/a.py"]
+    assert sorted(scanned) == [".", "src", "src/pkg"]
@@ -0,0 +1,148 @@
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from auto_docstring.docstring_errors import MissingDocstringError
+from auto_docstring.engine import (
+    BATCH_SIZE,
+    PIPELINE_DEPTH_PER_JOB,
+    FunctionResult,
+    check_file,
+    check_files,
+    get_chunksize,
+    may_define_functions,
+    rebind_file_path,
+    resolve_jobs,
+)
+
+
+def write_test_files(directory: Path, n_files: int) -> List[Path]:
+    file_paths = []
+    for i in range(n_files):
+        file_path = directory / f"module_{i}.py"
+        file_path.write_text(
+            "\n\n".join(f"def f_{i}_{j}():\n    pass" for j in range(i % 3 + 1))
+        )
+        file_paths.append(file_path)
+    return file_paths
+
+
+@pytest.mark.parametrize("jobs", [1, 2, 3])
+def test_check_files_keeps_input_order(tmp_path: Path, jobs: int):
+    file_paths = write_test_files(tmp_path, 12)
+    results = list(check_files(file_paths, jobs=jobs))
+    assert [r.file_path for r in results] == file_paths
+    for i, result in enumerate(results):
+        assert [f.name for f in result.functions] == [
+            f"f_{i}_{j}" for j in range(i % 3 + 1)
+        ]
+        for function in result.functions:
+            assert len(function.errors) == 1
+            assert isinstance(function.errors[0], MissingDocstringError)
+
+
+@pytest.mark.parametrize("read_threads", [1, 2])
+def test_check_files_reads_ahead_a_bounded_number_of_files(
+    tmp_path: Path, read_threads: int
+):
+    file_paths = write_test_files(tmp_path, 3)
+    n_pulled = 0
+
+    def generate_file_paths() -> Iterator[Path]:
+        nonlocal n_pulled
+        for i in range(10_000):
+            n_pulled += 1
+            yield file_paths[i % len(file_paths)]
+
+    results = check_files(generate_file_paths(), read_threads=read_threads)
+    for _ in range(100):
+        next(results)
+    max_pending = (read_threads + PIPELINE_DEPTH_PER_JOB + 1) * BATCH_SIZE
+    assert n_pulled <= 100 + max_pending
+    results.close()
+
+
+def test_check_files_parallel_matches_serial(tmp_path: Path):
+    file_paths = write_test_files(tmp_path, 8)
+    serial = list(check_files(file_paths, jobs=1))
+    parallel = list(check_files(file_paths, jobs=2))
+    assert [(r.file_path, [f.name for f in r.functions]) for r in serial] == [
+        (r.file_path, [f.name for f in r.functions]) for r in parallel
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_check_files_reports_broken_files_and_goes_on(tmp_path: Path, jobs: int):
+    file_paths = write_test_files(tmp_path, 2)
+    broken = tmp_path / "broken.py"
+    broken.write_text("def f(:\n    pass\n")
+    rejected = tmp_path / "rejected.py"
+    rejected.write_text(
+        'def f(x):\n    """Summary.\n\n    Args:\n        X.\n    """\n'
+    )
+    results = list(
+        check_files([broken, file_paths[0], rejected, file_paths[1]], jobs=jobs)
+    )
+    assert [r.file_path for r in results] == [
+        broken,
+        file_paths[0],
+        rejected,
+        file_paths[1],
+    ]
+    assert [r.failure is not None for r in results] == [True, False, True, False]
+    assert str(results[0].failure).startswith(f"{broken}: ")
+    assert [f.name for f in results[1].functions] == ["f_0_0"]
+
+
+@pytest.mark.parametrize(
+    ",".join(["jobs", "expected_at_least"]), [(1, 1), (4, 4), (0, 1), (-1, 1)]
+)
+def test_resolve_jobs(jobs: int, expected_at_least: int):
+    assert resolve_jobs(jobs) >= expected_at_least
+
+
+@pytest.mark.parametrize(
+    ",".join(["n_files", "jobs", "expected_chunksize"]),
+    [(0, 4, 1), (10, 4, 1), (1600, 4, 100)],
+)
+def test_get_chunksize(n_files: int, jobs: int, expected_chunksize: int):
+    assert get_chunksize(n_files, jobs) == expected_chunksize
+
+
+def test_rebind_file_path_leaves_shared_results_untouched():
+    error = MissingDocstringError(Path("original.py"), "f")
+    functions = [FunctionResult("f", [error])]
+    rebound = rebind_file_path(functions, Path("copy.py"))
+    assert rebound[0].errors[0].file_path == Path("copy.py")
+    assert error.file_path == Path("original.py")
+
+
+def test_errors_are_slotted():
+    error = MissingDocstringError(Path("test.py"), "f")
+    assert not hasattr(error, "__dict__")
+
+
+@pytest.mark.parametrize(
+    ",".join(["source", "expected_output"]),
+    [
+        (b"", False),
+        (b"X = 1\nfrom a import b\n", False),
+        (b"def f():\n    pass\n", True),
+        (b"async def f():\n    pass\n", True),
+        (b"# -*- coding: latin-1 -*-\nX = '\xe9'\n", False),
+        (b"# -*- coding: utf-16 -*-\nX = 1\n", True),
+        (b"# -*- coding: not-a-codec -*-\nX = 1\n", True),
+    ],
+)
+def test_may_define_functions(source: bytes, expected_output: bool):
+    assert may_define_functions(source) == expected_output
+
+
+@pytest.mark.parametrize("source", ["", "X = 1\n", "X = (\n"])
+def test_check_file_skips_files_without_functions(tmp_path: Path, source: str):
+    file_path = tmp_path / "constants.py"
+    file_path.write_text(source)
+    result = check_file(file_path, collect_stats=True)
+    assert result.functions == []
+    assert result.stats is not None and result.stats.skipped
@@ -0,0 +1,171 @@
+import ast
+import os
+from pathlib import Path
+
+import pytest
+
+from auto_docstring import check_docstring, collect_functions, parse_python_code
+from auto_docstring.engine import check_files
+from auto_docstring.fixer import Edit, apply_edits, fix_file, fix_files, fix_source
+
+
+def test_apply_edits():
+    edits = [Edit(4, 4, "b"), Edit(0, 1, "x"), Edit(6, 8, "")]
+    assert apply_edits("abcdefgh", edits) == "xbcdbef"
+
+
+fix_source_input = [
+    "def f(x: int) -> str:\n    return ''\n",
+    "def f(): pass\n",
+    "class C:\n    @property\n    def p(self):\n        pass\n",
+    "def f():\n    @decorator\n    def g():\n        pass\n",
+    'def f(x: int, y: int):\n    """\n    Summary.\n\n    Args:\n        x (int): X.\n    """\n',
+    # Entries indented by two spaces, and a line with only whitespace
+    'def f(x: int, y: int, z):\n    """Summary.\n\n    Args:\n      y (int): Y.\n'
+    '          More.\n    \n    Returns:\n      int: R.\n    """\n',
+    'def f(a, b) -> int:\n    """Summary.\n\n    Returns:\n        int: R."""\n',
+]
+fix_source_output = [
+    "def f(x: int) -> str:\n"
+    '    """\n'
+    "    _function_summary_\n"
+    "\n"
+    "    Args:\n"
+    "        x (int): _argument_description_\n"
+    "\n"
+    "    Returns:\n"
+    "        str: _return_description_\n"
+    '    """\n'
+    "    return ''\n",
+    'def f():\n    """\n    _function_summary_\n    """\n    pass\n',
+    "class C:\n"
+    "    @property\n"
+    "    def p(self):\n"
+    '        """\n'
+    "        _function_summary_\n"
+    '        """\n'
+    "        pass\n",
+    "def f():\n"
+    '    """\n'
+    "    _function_summary_\n"
+    '    """\n'
+    "    @decorator\n"
+    "    def g():\n"
+    '        """\n'
+    "        _function_summary_\n"
+    '        """\n'
+    "        pass\n",
+    "def f(x: int, y: int):\n"
+    '    """\n'
+    "    Summary.\n"
+    "\n"
+    "    Args:\n"
+    "        x (int): X.\n"
+    "        y (int): _argument_description_\n"
+    '    """\n',
+    "def f(x: int, y: int, z):\n"
+    '    """Summary.\n'
+    "\n"
+    "    Args:\n"
+    "      x (int): _argument_description_\n"
+    "      y (int): Y.\n"
+    "          More.\n"
+    "      z: _argument_description_\n"
+    "    \n"
+    "    Returns:\n"
+    "      int: R.\n"
+    '    """\n',
+    "def f(a, b) -> int:\n"
+    '    """Summary.\n'
+    "\n"
+    "    Args:\n"
+    "        a: _argument_description_\n"
+    "        b: _argument_description_\n"
+    "\n"
+    "    Returns:\n"
+    '        int: R."""\n',
+]
+
+
+@pytest.mark.parametrize(
+    ",".join(["source", "expected_source"]), zip(fix_source_input, fix_source_output)
+)
+def test_fix_source(source: str, expected_source: str):
+    fixed = fix_source(source.encode()).decode()
+    assert fixed == expected_source
+    # Fixing is idempotent and leaves no errors behind
+    assert fix_source(fix_source(source.encode())) == fixed.encode()
+    for function in collect_functions(parse_python_code(fixed)).functions:
+        assert check_docstring(Path("test.py"), function) == []
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'def f(x):\n    r"""\n    Summary.\n    """\n',
+        'def f(x):\n    """\n    Summary \\\\ escaped.\n    """\n',
+        'def f():\n    """\n    Summary.\n    """\n',
+    ],
+)
+def test_fix_source_leaves_unfixable_docstrings(source: str):
+    assert fix_source(source.encode()).decode() == source
+
+
+def test_fix_source_keeps_encoding_and_newlines():
+    source = "# -*- coding: latin-1 -*-\r\ndef f():\r\n    return 'é'\r\n"
+    fixed = fix_source(source.encode("latin-1"))
+    assert fixed.decode("latin-1") == (
+        "# -*- coding: latin-1 -*-\r\n"
+        "def f():\r\n"
+        '    """\r\n'
+        "    _function_summary_\r\n"
+        '    """\r\n'
+        "    return 'é'\r\n"
+    )
+
+
+def test_fix_source_handles_non_ascii_columns():
+    source = 'def f(): x = "ü"; return x\n'
+    fixed = fix_source(source.encode()).decode()
+    ast.parse(fixed)
+    assert fixed.endswith('    """\n    x = "ü"; return x\n')
+
+
+def test_fix_file_writes_only_changed_files(tmp_path: Path):
+    changed_path = tmp_path / "changed.py"
+    unchanged_path = tmp_path / "unchanged.py"
+    changed_path.write_text("def f():\n    pass\n")
+    unchanged_path.write_text("x = 1\n")
+    os.chmod(changed_path, 0o640)
+    modified_time = unchanged_path.stat().st_mtime_ns
+    assert fix_file(changed_path)
+    assert not fix_file(unchanged_path)
+    assert '"""' in changed_path.read_text()
+    assert changed_path.stat().st_mode & 0o777 == 0o640
+    assert unchanged_path.stat().st_mtime_ns == modified_time
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["changed.py", "unchanged.py"]
+
+
+def test_fixed_files_pass_the_check(tmp_path: Path):
+    # What `--fix` does before checking, with arguments that have no annotations
+    file_path = tmp_path / "module.py"
+    file_path.write_text(
+        "def f(x, y: int):\n    pass\n\n\n"
+        'def g(a, b):\n    """\n    Summary.\n\n    Args:\n        a: A.\n    """\n\n\n'
+        # Only a later argument is documented, like `f` in test-bad.py
+        'def h(x: int, y):\n    """\n    Summary.\n\n    Args:\n        y: Y.\n    """\n'
+    )
+    assert list(fix_files([file_path])) == [
+        (file_path, [(2, 1, 8), (10, 1, 2), (18, 1, 2)])
+    ]
+    assert "        x: _argument_description_\n" in file_path.read_text()
+    assert "        b: _argument_description_\n" in file_path.read_text()
+    assert "        x (int): _argument_description_\n        y: Y.\n" in (
+        file_path.read_text()
+    )
+    (result,) = check_files([file_path])
+    assert [(f.name, f.errors) for f in result.functions] == [
+        ("f", []),
+        ("g", []),
+        ("h", []),
+    ]
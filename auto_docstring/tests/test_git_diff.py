@@ -0,0 +1,159 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from auto_docstring.engine import check_files
+from auto_docstring.fixer import fix_file
+from auto_docstring.git_diff import get_changed_lines, parse_diff
+from auto_docstring.positions import (
+    merge_line_ranges,
+    overlaps_line_ranges,
+    shift_line_ranges,
+)
+
+DIFF = """\
+diff --git a/changed.py b/changed.py
+index 1111111..2222222 100644
+--- a/changed.py
++++ b/changed.py
+@@ -3,0 +4,2 @@ def f():
++    x = 1
++    y = 2
+@@ -10 +12 @@ def g():
+-    return 1
++    return 2
+@@ -20,3 +21,0 @@ def h():
+-    a
+-    b
+-    c
+diff --git a/deleted.py b/deleted.py
+deleted file mode 100644
+--- a/deleted.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-def f():
+-    pass
+diff --git "a/caf\\303\\251.py" "b/caf\\303\\251.py"
+--- "a/caf\\303\\251.py"
++++ "b/caf\\303\\251.py"
+@@ -1 +1 @@
+-X = 1
++X = 2
+"""
+
+
+def test_parse_diff():
+    root = os.path.realpath("/repo")
+    assert parse_diff(DIFF, root) == {
+        os.path.join(root, "changed.py"): [(4, 5), (12, 12), (21, 21)],
+        os.path.join(root, "café.py"): [(1, 1)],
+    }
+
+
+def test_merge_line_ranges():
+    assert merge_line_ranges([(10, 12), (1, 2), (3, 4), (11, 20), (30, 30)]) == [
+        (1, 4),
+        (10, 20),
+        (30, 30),
+    ]
+
+
+@pytest.mark.parametrize(
+    ",".join(["start", "end", "expected_output"]),
+    [
+        (1, 3, False),
+        (4, 9, True),
+        (5, 6, True),
+        (7, 9, False),
+        (11, 11, False),
+        (12, 12, True),
+        (21, 30, True),
+    ],
+)
+def test_overlaps_line_ranges(start: int, end: int, expected_output: bool):
+    ranges = [(4, 5), (12, 12), (20, 21)]
+    assert overlaps_line_ranges(ranges, start, end) == expected_output
+
+
+def git(*arguments: str) -> None:
+    subprocess.run(["git", *arguments], check=True, capture_output=True)
+
+
+ORIGINAL = """\
+def unchanged(x):
+    return x
+
+
+@decorator
+def edited(x):
+    return x
+"""
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+@pytest.mark.parametrize("engine", ["ast", "scanner"])
+def test_only_changed_functions_are_checked(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, engine: str
+):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    Path("module.py").write_text(ORIGINAL)
+    Path("other.py").write_text("def untouched():\n    pass\n")
+    git("add", "module.py", "other.py")
+    git("commit", "-q", "-m", "Initial")
+    Path("module.py").write_text(ORIGINAL.replace("@decorator", "@other_decorator"))
+    Path("new.py").write_text("def added():\n    pass\n")
+
+    changed_lines = get_changed_lines("HEAD")
+    assert changed_lines == {
+        os.path.realpath("module.py"): [(5, 5)],
+        os.path.realpath("new.py"): None,
+    }
+    file_paths = [Path("module.py"), Path("new.py")]
+    results = check_files(file_paths, engine=engine, changed_lines=changed_lines)
+    assert [[f.name for f in r.functions] for r in results] == [["edited"], ["added"]]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_unknown_revision_is_an_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    with pytest.raises(RuntimeError):
+        get_changed_lines("not-a-revision")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_fixed_lines_are_shifted_like_git_reports_them(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    original = (
+        'def documented(a):\n    """Summary.\n\n    Args:\n        a: A.\n    """\n\n\n'
+        "def undocumented(x):\n    return x\n\n\n"
+        "def last(y):\n    return y\n"
+    )
+    Path("module.py").write_text(original)
+    git("add", "module.py")
+    git("commit", "-q", "-m", "Initial")
+    Path("module.py").write_text(
+        original.replace("(a)", "(a, b)").replace("return y", "return -y")
+    )
+
+    file_path = os.path.realpath("module.py")
+    assert get_changed_lines("HEAD") == {file_path: [(1, 1), (14, 14)]}
+    shifted = shift_line_ranges([(1, 1), (14, 14)], fix_file(Path("module.py")))
+    # The lines the insertions follow are counted as changed too
+    assert shifted == [(1, 1), (5, 6), (11, 17), (21, 27)]
+    git_ranges = get_changed_lines("HEAD")[file_path]
+    assert git_ranges is not None
+    assert merge_line_ranges(shifted + git_ranges) == shifted
+    (result,) = check_files([Path("module.py")], changed_lines={file_path: shifted})
+    assert [f.name for f in result.functions] == ["documented", "undocumented", "last"]
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from auto_docstring.engine import ENGINES, check_source
+from auto_docstring.positions import LineOffsetTable, SourceSpan
+
+source = '''\
+x = "é"
+
+async def missing(a):
+    pass
+
+
+def f(x: int, y: str) -> bool:
+    """Summary mentions y.
+
+    Args:
+        x (int): X.
+        y (int): Y.
+
+    Returns:
+        bool: Result.
+    """
+
+
+def g(a, b):
+    """Summary.
+
+    Args:
+        b (int): B.
+    """
+'''
+
+
+def test_line_offset_table():
+    positions = LineOffsetTable("é = 1\r\nx\ry\n")
+    assert positions.line_offsets == [0, 7, 9, 11, 12]
+    # `ast` counts the two bytes of `é`, spans count one character
+    assert positions.get_offset(1, 3) == 2
+    assert positions.get_offset(2, 1) == 8
+    assert positions.get_position(0) == (1, 1)
+    assert positions.get_position(6) == (1, 7)
+    assert positions.get_position(7) == (2, 1)
+    assert positions.get_position(11) == (4, 1)
+    assert positions.get_span(2, 10) == SourceSpan(1, 3, 3, 2)
+    assert positions.get_position_offset(3, 2) == 10
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_errors_point_at_their_source(engine: str, newline: str):
+    result = check_source(
+        Path("test.py"), source.replace("\n", newline).encode(), engine=engine
+    )
+    assert [(type(e).__name__, e.span) for f in result.functions for e in f.errors] == [
+        # The head of the function up to its name
+        ("MissingDocstringError", SourceSpan(3, 1, 3, 18)),
+        # The docstring entry of the argument, not the summary that mentions it
+        ("IncorrectArgumentTypehintError", SourceSpan(12, 9, 12, 10)),
+        # The entry found where the argument was expected
+        ("MissingArgumentError", SourceSpan(23, 9, 23, 10)),
+    ]
@@ -0,0 +1,104 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from auto_docstring.docstring_errors import MissingArgumentError, MissingDocstringError
+from auto_docstring.engine import FileResult, FunctionResult
+from auto_docstring.positions import SourceSpan
+from auto_docstring.reporters import (
+    JsonLinesReporter,
+    SarifReporter,
+    TextReporter,
+)
+
+file_path = Path("module.py")
+results = [
+    FileResult(
+        file_path,
+        [
+            FunctionResult("good", []),
+            FunctionResult(
+                "bad",
+                [MissingDocstringError(file_path, "bad", span=SourceSpan(3, 1, 3, 8))],
+            ),
+            FunctionResult("worse", [MissingArgumentError(file_path, "worse", "x")]),
+        ],
+    ),
+    FileResult(Path("clean.py"), [FunctionResult("good", [])]),
+]
+
+
+def run_reporter(reporter_type, show_passing: bool = False) -> str:
+    stream = io.StringIO()
+    reporter = reporter_type(stream, show_passing=show_passing)
+    for result in results:
+        reporter.report(result)
+    reporter.finish()
+    assert reporter.n_errors == 2
+    return stream.getvalue()
+
+
+def test_text_reporter_omits_passing_functions():
+    assert run_reporter(TextReporter) == "\n".join(
+        [
+            "module.py",
+            "bad",
+            "Function `bad` is missing a docstring.",
+            "worse",
+            "Function `worse` argument `x` did not have a type hint.",
+            "",
+        ]
+    )
+
+
+def test_text_reporter_show_passing():
+    output = run_reporter(TextReporter, show_passing=True)
+    assert output.startswith("module.py\ngood\nFunction `good` is good!\nbad\n")
+    assert output.endswith("clean.py\ngood\nFunction `good` is good!\n")
+
+
+@pytest.mark.parametrize(
+    ",".join(["show_passing", "expected_n_lines"]), [(False, 2), (True, 4)]
+)
+def test_json_lines_reporter(show_passing: bool, expected_n_lines: int):
+    lines = run_reporter(JsonLinesReporter, show_passing).splitlines()
+    assert len(lines) == expected_n_lines
+    records = [json.loads(line) for line in lines]
+    errors = [r for r in records if r["error"] is not None]
+    assert errors[0] == {
+        "file": "module.py",
+        "function": "bad",
+        "error": "MissingDocstringError",
+        "argument": None,
+        "message": "Function `bad` is missing a docstring.",
+        "line": 3,
+        "column": 1,
+        "end_line": 3,
+        "end_column": 8,
+    }
+    assert errors[1]["argument"] == "x"
+    assert errors[1]["line"] is None
+
+
+def test_sarif_reporter():
+    log = json.loads(run_reporter(SarifReporter))
+    run = log["runs"][0]
+    assert [r["id"] for r in run["tool"]["driver"]["rules"]] == [
+        "MissingArgumentError",
+        "MissingDocstringError",
+    ]
+    assert [r["ruleId"] for r in run["results"]] == [
+        "MissingDocstringError",
+        "MissingArgumentError",
+    ]
+    location = run["results"][0]["locations"][0]
+    assert location["physicalLocation"]["artifactLocation"]["uri"] == "module.py"
+    assert location["physicalLocation"]["region"] == {
+        "startLine": 3,
+        "startColumn": 1,
+        "endLine": 3,
+        "endColumn": 8,
+    }
+    assert "region" not in run["results"][1]["locations"][0]["physicalLocation"]
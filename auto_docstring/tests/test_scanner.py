@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+
+from auto_docstring import ScopeRules, collect_functions, parse_python_code
+from auto_docstring.engine import check_source
+from auto_docstring.positions import SourcePositions
+from auto_docstring.scanner import scan_functions
+
+package_folder = Path(__file__).parent.parent
+corpus_file_paths = sorted(
+    [*package_folder.glob("*.py"), *(package_folder / "tests").glob("**/*.py")]
+)
+
+tricky_sources = [
+    # Definitions hidden in strings and comments
+    'X = """\ndef not_a_function():\n    pass\n"""\n# def nor_this():\ndef f(): pass\n',
+    "s = 'def g(): pass'\ndef f(x='):', y=\")\"):\n    '''Doc.'''\n",
+    # Blocks that end without another definition
+    "def outer():\n    pass\nif True:\n        def f(): pass\n",
+    "class A:\n    x = f(\n1)\n    def method(self): pass\n",
+    "try:\n    def a(): pass\nexcept E:\n    def b(): pass\nelse:\n    def c(): pass\n",
+    # Docstring forms
+    'def f(): "Doc."\n',
+    'def f():\n    # comment\n\n    r"""Raw \\d."""\n',
+    'def f():\n    ("Doc "\n     "continued.")\n',
+    'def f():\n    "Doc " \\\n    "continued."\n',
+    'def f():\n    "Doc."; x = 1\n',
+    'def f():\n    b"Bytes."\n',
+    'def f():\n    f"{x}"\n',
+    'def f():\n    "Not a docstring".format(x)\n',
+    'def f():\n\tdef g():\n\t\t"""Tabs."""\n',
+    'x = "é"; def_ = 1\nasync  def f():\n    U"Ünïcode."\ndef é(): Rb"Raw"\n',
+    # Signatures
+    "async def f(a, /, b: int = 1, *args: str, c: 'Optional[int]', **kw) -> None:\n"
+    "    pass\n",
+    "def f(\n    a: Dict[str, int],  # comment\n    b=lambda: {'a': (1, 2)},\n) -> int:\n"
+    "    return 1\n",
+    "class A(Base, metaclass=M):\n    @property\n    def f(self): pass\n"
+    "    class B:\n        def g(self): pass\n",
+    "def f():\n    class _A:\n        def g(self): pass\n    def _h(): pass\n",
+    "def f(): pass\r\nclass A:\r\n    def g(self):\r\n        '''Doc.'''\r\n",
+    # Decorators
+    "@overload\ndef f(x: int) -> int: ...\n@typing.overload\ndef f(x: str) -> str: ...\n"
+    "def f(x): pass\n",
+    "class A:\n    @property  # comment\n    def x(self): pass\n"
+    "    @x.setter\n    def x(self, value): pass\n"
+    "    @functools.cached_property()\n    def y(self):\n        def z(): pass\n",
+    "@buttons[0].clicked.connect\ndef f(): pass\n@ staticmethod\ndef g(): pass\n",
+]
+
+
+def assert_engines_agree(source: bytes) -> None:
+    tree = parse_python_code(source)
+    positions = SourcePositions(source)
+    for rules in [
+        ScopeRules(),
+        ScopeRules(include_nested=False, include_private=False),
+        ScopeRules(include_methods=False),
+        ScopeRules(include_overloads=False, include_properties=False),
+    ]:
+        assert scan_functions(source, rules) == collect_functions(tree, rules).functions
+    # Spans too, which include the exact bounds of every docstring
+    assert [
+        (f.span, f.docstring_span)
+        for f in scan_functions(source, ScopeRules(), None, positions)
+    ] == [
+        (f.span, f.docstring_span)
+        for f in collect_functions(tree, ScopeRules(), None, positions).functions
+    ]
+
+
+@pytest.mark.parametrize("source", tricky_sources, ids=range(len(tricky_sources)))
+def test_scanner_matches_ast_on_tricky_sources(source: str):
+    assert_engines_agree(source.encode())
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    corpus_file_paths,
+    ids=lambda p: p.relative_to(package_folder).as_posix(),
+)
+def test_scanner_matches_ast_on_corpus(file_path: Path):
+    assert_engines_agree(file_path.read_bytes())
+
+
+def test_scanner_honours_encoding_cookie():
+    source = "# -*- coding: latin-1 -*-\ndef f():\n    'Caf\xe9.'\n".encode("latin-1")
+    assert_engines_agree(source)
+
+
+@pytest.mark.parametrize("engine", ["ast", "scanner"])
+def test_check_source_engines_give_same_results(engine: str):
+    source = (
+        b'def f(x: int):\n    """Summary.\n\n    Args:\n        x (str): X.\n    """\n'
+    )
+    result = check_source(Path("test.py"), source, engine=engine)
+    assert [
+        (f.name, [type(e).__name__ for e in f.errors]) for f in result.functions
+    ] == [("f", ["IncorrectArgumentTypehintError"])]
+
+
+@pytest.mark.parametrize(
+    "line_ranges", [[], [(1, 60)], [(75, 75), (140, 160)], [(200, 10_000)]]
+)
+def test_scanner_matches_ast_with_line_ranges(line_ranges):
+    source = (package_folder / "engine.py").read_bytes()
+    rules = ScopeRules()
+    tree = parse_python_code(source)
+    assert (
+        scan_functions(source, rules, line_ranges)
+        == collect_functions(tree, rules, line_ranges).functions
+    )
@@ -0,0 +1,136 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from auto_docstring.docstring_errors import MissingArgumentError, MissingDocstringError
+from auto_docstring.engine import FileResult, FunctionResult
+from auto_docstring.positions import SourceSpan
+from auto_docstring.shards import (
+    ResultsWriter,
+    get_file_weights,
+    get_shard_indices,
+    load_timings,
+    merge_results,
+)
+from auto_docstring.stats import FileStats
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shards_partition_every_file_once(count: int):
+    weights = [float((i * 37) % 11) for i in range(50)]
+    shards = [get_shard_indices(weights, (k, count)) for k in range(1, count + 1)]
+    assert sorted(i for shard in shards for i in shard) == list(range(50))
+    assert all(shard == sorted(shard) for shard in shards)
+    loads = [sum(weights[i] for i in shard) for shard in shards]
+    # Greedy assignment is never off by more than the heaviest file
+    assert max(loads) - min(loads) <= max(weights)
+
+
+def test_shards_are_balanced_by_weight():
+    weights = [10.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    assert get_shard_indices(weights, (1, 2)) == [0]
+    assert get_shard_indices(weights, (2, 2)) == list(range(1, 11))
+
+
+def test_get_file_weights(tmp_path: Path):
+    file_paths = [tmp_path / "a.py", tmp_path / "b.py", tmp_path / "missing.py"]
+    file_paths[0].write_bytes(b"x" * 100)
+    file_paths[1].write_bytes(b"x" * 300)
+    assert get_file_weights(file_paths) == [100.0, 300.0, 0.0]
+    # Untimed files are estimated from the timed ones
+    timings = {str(file_paths[0]): 2.0}
+    assert get_file_weights(file_paths, timings) == [2.0, 6.0, 0.0]
+
+
+def write_results(path: Path, shard, results) -> Path:
+    writer = ResultsWriter(path, shard)
+    for index, result in results:
+        writer.add(result, index)
+    writer.write()
+    return path
+
+
+def test_merge_results_restores_the_unsharded_order(tmp_path: Path):
+    a, b, c = Path("a.py"), Path("b.py"), Path("c.py")
+    stats = FileStats(stage_seconds={"read": 0.5, "check": 1.0})
+    span = SourceSpan(4, 9, 4, 10)
+    first = write_results(
+        tmp_path / "1.json",
+        (1, 2),
+        [
+            (0, FileResult(a, [FunctionResult("f", [MissingDocstringError(a, "f")])])),
+            (2, FileResult(c, [], stats)),
+        ],
+    )
+    second = write_results(
+        tmp_path / "2.json",
+        (2, 2),
+        [
+            (
+                1,
+                FileResult(
+                    b,
+                    [
+                        FunctionResult(
+                            "g", [MissingArgumentError(b, "g", "x", span=span)]
+                        )
+                    ],
+                ),
+            )
+        ],
+    )
+    merged = merge_results([second, first])
+    assert merged == [
+        FileResult(a, [FunctionResult("f", [MissingDocstringError(a, "f")])]),
+        FileResult(b, [FunctionResult("g", [MissingArgumentError(b, "g", "x")])]),
+        FileResult(c, []),
+    ]
+    # Spans are left out of comparisons, so they are checked on their own
+    assert [e.span for r in merged for f in r.functions for e in f.errors] == [
+        None,
+        span,
+    ]
+    assert load_timings([first, second]) == {"c.py": 1.5}
+
+
+@pytest.mark.parametrize(
+    "shards", [[(1, 2)], [(1, 2), (1, 2)], [(1, 2), (2, 3)]], ids=str
+)
+def test_merge_results_needs_every_shard_once(tmp_path: Path, shards):
+    paths = [
+        write_results(tmp_path / f"{i}.json", shard, [])
+        for i, shard in enumerate(shards)
+    ]
+    with pytest.raises(ValueError):
+        merge_results(paths)
+
+
+@pytest.mark.parametrize("indices", [[[0, 1], [1]], [[0], [2]]], ids=str)
+def test_merge_results_needs_every_file_once(tmp_path: Path, indices):
+    # Shards whose runners computed different partitions
+    paths = [
+        write_results(
+            tmp_path / f"{i}.json",
+            (i + 1, len(indices)),
+            [(index, FileResult(Path(f"{index}.py"), [])) for index in shard],
+        )
+        for i, shard in enumerate(indices)
+    ]
+    with pytest.raises(ValueError):
+        merge_results(paths)
+
+
+def test_cached_files_are_not_timed(tmp_path: Path):
+    stats = FileStats(stage_seconds={"read": 0.001}, from_cache=True)
+    path = write_results(
+        tmp_path / "results.json", (1, 1), [(0, FileResult(Path("a.py"), [], stats))]
+    )
+    assert load_timings([path]) == {}
+
+
+def test_merge_results_rejects_other_files(tmp_path: Path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({"version": 0, "shard": [1, 1], "files": []}))
+    with pytest.raises(ValueError):
+        merge_results([path])
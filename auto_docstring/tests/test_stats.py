@@ -0,0 +1,79 @@
+import io
+import json
+from pathlib import Path
+
+from auto_docstring.engine import check_file
+from auto_docstring.stats import FileStats, RunStats
+
+test_code = '''
+def f(x: int):
+    """
+    Summary.
+
+    Args:
+        x (int): An argument.
+    """
+
+
+def g():
+    pass
+'''
+
+
+def test_check_file_collects_stats(tmp_path: Path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text(test_code)
+    result = check_file(file_path, collect_stats=True)
+    assert result.stats is not None
+    assert result.stats.n_bytes == len(test_code.encode())
+    assert set(result.stats.stage_seconds) == {
+        "read",
+        "parse",
+        "collect",
+        "check",
+        "docstring_parsing",
+    }
+    assert [name for name, _ in result.stats.function_seconds] == ["f", "g"]
+
+
+def test_check_file_without_stats(tmp_path: Path):
+    file_path = tmp_path / "module.py"
+    file_path.write_text(test_code)
+    assert check_file(file_path).stats is None
+
+
+def test_run_stats_keeps_slowest():
+    stats = RunStats(n_slowest=2)
+    for i in range(5):
+        file_stats = FileStats(n_bytes=10, stage_seconds={"parse": float(i)})
+        file_stats.function_seconds.append(("f", float(i)))
+        stats.add_file(Path(f"{i}.py"), 1, i % 2, file_stats)
+    stats.finish()
+    output = stats.to_dict()
+    assert output["files"] == 5
+    assert output["bytes"] == 50
+    assert output["errors"] == 2
+    assert output["stage_seconds"] == {"parse": 10.0}
+    assert [f["file"] for f in output["slowest_files"]] == ["4.py", "3.py"]
+    assert [f["function"] for f in output["slowest_functions"]] == [
+        "4.py::f",
+        "3.py::f",
+    ]
+
+
+def test_run_stats_output():
+    stats = RunStats()
+    stats.add_file(Path("a.py"), 2, 1, FileStats(stage_seconds={"parse": 1.5}))
+    summary = io.StringIO()
+    stats.write_summary(summary)
+    assert "Functions: 2" in summary.getvalue()
+    assert "parse                    1.500" in summary.getvalue()
+    exported = io.StringIO()
+    stats.write_json(exported)
+    assert json.loads(exported.getvalue())["functions"] == 2
+
+
+def test_time_iterator_passes_items_through():
+    stats = RunStats()
+    assert list(stats.time_iterator("discover", range(3))) == [0, 1, 2]
+    assert "discover" in stats.stage_seconds
@@ -0,0 +1,117 @@
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from auto_docstring import iter_functions, parse_python_code
+from auto_docstring.config import get_path_rules
+from auto_docstring.discovery import discover_python_files
+from auto_docstring.engine import check_files
+from auto_docstring.streaming import iter_errors, iter_file_errors
+
+source = '''\
+def documented(x: int):
+    """Summary.
+
+    Args:
+        x (int): X.
+    """
+
+
+def undocumented():
+    pass
+
+
+class A:
+    def method(self, y):
+        """Summary.
+
+        Args:
+            z (int): Z.
+        """
+'''
+
+
+def write_files(directory: Path, n_files: int) -> List[Path]:
+    file_paths = []
+    for i in range(n_files):
+        file_path = directory / f"module_{i}.py"
+        file_path.write_text(source)
+        file_paths.append(file_path)
+    (directory / "constants.py").write_text("X = 1\n")
+    return file_paths
+
+
+@pytest.mark.parametrize("engine", ["ast", "scanner"])
+def test_iter_errors_matches_check_files(tmp_path: Path, engine: str):
+    file_paths = write_files(tmp_path, 3)
+    streamed = [
+        (file_path, function.qualname, error)
+        for file_path, function, error in iter_errors([tmp_path], engine=engine)
+    ]
+    checked = [
+        (r.file_path, f.name, e)
+        for r in check_files(sorted(tmp_path.glob("*.py")), engine=engine)
+        for f in r.functions
+        for e in f.errors
+    ]
+    assert sorted(streamed, key=str) == sorted(checked, key=str)
+    assert {p for p, _, _ in streamed} == set(file_paths)
+
+
+def test_iter_errors_uses_the_rules_of_each_path(tmp_path: Path):
+    write_files(tmp_path, 3)
+    config = {
+        "exclude": ["module_2.py"],
+        "overrides": [{"paths": ["module_1.py"], "include-methods": False}],
+    }
+    path_rules = get_path_rules(config, tmp_path)
+    assert path_rules is not None
+    streamed = [
+        (file_path.name, function.qualname)
+        for file_path, function, _ in iter_errors([tmp_path], path_rules=path_rules)
+    ]
+    checked = [
+        (r.file_path.name, f.name)
+        for r in check_files(
+            discover_python_files([tmp_path], (), path_rules.classifier),
+            path_rules=path_rules,
+        )
+        for f in r.functions
+        if len(f.errors) > 0
+    ]
+    assert sorted(streamed) == sorted(checked)
+    assert sorted(streamed) == [
+        ("module_0.py", "A.method"),
+        ("module_0.py", "undocumented"),
+        ("module_1.py", "undocumented"),
+    ]
+
+
+def test_iter_file_errors_reads_one_file_at_a_time(tmp_path: Path):
+    file_paths = write_files(tmp_path, 5)
+    n_pulled = 0
+
+    def generate_file_paths() -> Iterator[Path]:
+        nonlocal n_pulled
+        for file_path in file_paths:
+            n_pulled += 1
+            yield file_path
+
+    errors = iter_file_errors(generate_file_paths())
+    file_path, function, _ = next(errors)
+    assert (file_path, function.qualname, n_pulled) == (
+        file_paths[0],
+        "undocumented",
+        1,
+    )
+    next(errors)
+    assert n_pulled == 1
+    next(errors)
+    assert n_pulled == 2
+
+
+def test_iter_functions_is_lazy():
+    functions = iter_functions(parse_python_code(source))
+    assert next(functions).qualname == "documented"
+    assert [f.qualname for f in functions] == ["undocumented", "A.method"]
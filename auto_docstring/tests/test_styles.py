@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+
+from auto_docstring import (
+    DocstringFunctionArgument,
+    parse_numpy_docstring_args,
+    parse_sphinx_docstring_args,
+)
+from auto_docstring.docstring_errors import IncorrectArgumentTypehintError
+from auto_docstring.engine import check_source
+from auto_docstring.fixer import fix_source
+from auto_docstring.styles import detect_docstring_style
+
+google_module = '''\
+def f(x: int, y: str) -> bool:
+    """Summary.
+
+    Args:
+        x (int): X.
+        y (int): Y.
+
+    Returns:
+        bool: Result.
+    """
+'''
+
+numpy_module = '''\
+def f(x: int, y: str) -> bool:
+    """Summary.
+
+    Parameters
+    ----------
+    x : int
+        X, which has
+        two lines.
+    y : int, optional
+        Y.
+
+    Returns
+    -------
+    bool
+        Result.
+    """
+'''
+
+sphinx_module = '''\
+def f(x: int, y: str) -> bool:
+    """Summary.
+
+    :param x: X, which has
+        two lines.
+    :type x: int
+    :param int y: Y.
+    :returns: Result.
+    :rtype: bool
+    """
+'''
+
+
+@pytest.mark.parametrize(
+    ",".join(["source", "expected_style"]),
+    [
+        (google_module, "google"),
+        (numpy_module, "numpy"),
+        (sphinx_module, "sphinx"),
+        ("def f():\n    pass\n", "google"),
+        ("# ---\ndef f():\n    pass\n", "google"),
+        # The style most sections use wins
+        (numpy_module + google_module + numpy_module, "numpy"),
+        (google_module.replace("\n", "\r\n") + numpy_module, "google"),
+    ],
+)
+def test_detect_docstring_style(source: str, expected_style: str):
+    assert detect_docstring_style(source.encode()) == expected_style
+
+
+def test_parse_numpy_docstring_args():
+    docstring = (
+        "Summary.\n\nParameters\n----------\nx : int\n    X, which has\n"
+        "    two lines.\ny, z : int, optional\n    Y and Z.\n*args\n    Rest.\n\n"
+        "Returns\n-------\nbool\n    Result.\n"
+    )
+    assert parse_numpy_docstring_args(docstring) == [
+        DocstringFunctionArgument("x", "int", "X, which has\ntwo lines."),
+        DocstringFunctionArgument("y", "int", ""),
+        DocstringFunctionArgument("z", "int", "Y and Z."),
+        DocstringFunctionArgument("args", None, "Rest."),
+    ]
+
+
+def test_parse_sphinx_docstring_args():
+    docstring = (
+        "Summary.\n\n:param x: X, which has\n    two lines.\n:type x: int\n"
+        ":param Dict[str, int] y: Y.\n:param **kwargs: Rest.\n:returns: Result.\n"
+    )
+    assert parse_sphinx_docstring_args(docstring) == [
+        DocstringFunctionArgument("x", "int", "X, which has\ntwo lines."),
+        DocstringFunctionArgument("y", "Dict[str, int]", "Y."),
+        DocstringFunctionArgument("kwargs", None, "Rest."),
+    ]
+
+
+@pytest.mark.parametrize("source", [google_module, numpy_module, sphinx_module])
+def test_each_style_finds_the_same_errors(source: str):
+    result = check_source(Path("test.py"), source.encode())
+    errors = [e for f in result.functions for e in f.errors]
+    assert all(isinstance(e, IncorrectArgumentTypehintError) for e in errors)
+    assert [
+        e.argument_name for e in errors if isinstance(e, IncorrectArgumentTypehintError)
+    ] == ["y"]
+
+
+def test_forced_style_skips_detection():
+    result = check_source(
+        Path("test.py"), numpy_module.encode(), docstring_style="sphinx"
+    )
+    assert [f.errors for f in result.functions] == [[]]
+
+
+@pytest.mark.parametrize(
+    ",".join(["docstring_style", "expected_docstring"]),
+    [
+        (
+            "auto",
+            "    _function_summary_\n\n    Parameters\n    ----------\n    x : int\n",
+        ),
+        ("sphinx", "    _function_summary_\n\n    :param x: _argument_description_\n"),
+    ],
+)
+def test_fixer_writes_the_module_style(docstring_style: str, expected_docstring: str):
+    source = numpy_module + "\n\ndef g(x: int):\n    pass\n"
+    fixed = fix_source(source.encode(), docstring_style=docstring_style).decode()
+    # Only Google docstrings are completed, so `f` is left alone
+    assert fixed.startswith(numpy_module)
+    assert expected_docstring in fixed[len(numpy_module) :]
@@ -0,0 +1,192 @@
+import ast
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from auto_docstring import parse_python_code
+from auto_docstring import symbols as symbols_module
+from auto_docstring.cache import ResultCache
+from auto_docstring.engine import check_file, check_files
+from auto_docstring.symbols import (
+    ModuleSymbols,
+    collect_module_symbols,
+    get_module_name,
+    load_symbol_index,
+)
+
+
+def test_collect_module_symbols():
+    tree = parse_python_code(
+        "import os.path\n"
+        "import typing as t\n"
+        "from typing import TYPE_CHECKING, TypeAlias\n"
+        "from . import sibling\n"
+        "from ..models import User as Account\n"
+        "if TYPE_CHECKING:\n"
+        "    from collections.abc import Sequence\n"
+        "Users = t.List[Account]\n"
+        "MaybeUser: TypeAlias = 'Account | None'\n"
+        "UserId = int\n"
+        "DEFAULT_LIMIT = 10\n"
+        "Id = NewType('Id', int)\n"
+    )
+    assert isinstance(tree, ast.Module)
+    assert collect_module_symbols(tree, "app.api.views") == ModuleSymbols(
+        imports={
+            "os": "os",
+            "t": "typing",
+            "TYPE_CHECKING": "typing.TYPE_CHECKING",
+            "TypeAlias": "typing.TypeAlias",
+            "sibling": "app.api.sibling",
+            "Account": "app.models.User",
+            "Sequence": "collections.abc.Sequence",
+        },
+        aliases={
+            "Users": "t.List[Account]",
+            "MaybeUser": "'Account | None'",
+            "UserId": "int",
+        },
+    )
+
+
+def write_files(root: Path, files: Dict[str, str]) -> None:
+    for file_path, content in files.items():
+        (root / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / file_path).write_text(content)
+
+
+def test_get_module_name(tmp_path: Path):
+    write_files(
+        tmp_path,
+        {"app/__init__.py": "", "app/api/__init__.py": "", "app/api/views.py": ""},
+    )
+    assert get_module_name(str(tmp_path / "app/api/views.py")) == (
+        "app.api.views",
+        False,
+    )
+    assert get_module_name(str(tmp_path / "app/api/__init__.py")) == ("app.api", True)
+
+
+project_files = {
+    "app/__init__.py": "from .models import User\n",
+    "app/models.py": "class User:\n    pass\n\nclass Group:\n    pass\n",
+    "app/types.py": "from typing import List\nfrom app import User\n\nUsers = List['User']\n",
+    "app/service.py": '''\
+import typing as t
+from app import models
+from app.types import Users
+
+def f(user: t.Optional[models.User], users: Users, group: models.Group):
+    """Summary.
+
+    Args:
+        user (Optional[User]): The user.
+        users (List[app.User]): More users.
+        group (Optional[Group]): Not the same type.
+    """
+''',
+}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    write_files(tmp_path, project_files)
+    return tmp_path
+
+
+def get_wrong_hints(result):
+    return [e.argument_name for f in result.functions for e in f.errors]
+
+
+def test_hints_are_compared_after_resolving_names(project: Path):
+    file_path = project / "app" / "service.py"
+    assert get_wrong_hints(check_file(file_path)) == ["user", "users", "group"]
+    symbols = load_symbol_index(sorted(project.rglob("*.py")))
+    assert get_wrong_hints(check_file(file_path, symbols=symbols)) == ["group"]
+    # Worker processes receive the index when they start
+    results = check_files([file_path], jobs=2, symbols=symbols)
+    assert [get_wrong_hints(r) for r in results] == [["group"]]
+
+
+def test_symbol_index_is_only_updated_for_changed_files(
+    project: Path, monkeypatch: pytest.MonkeyPatch
+):
+    collected = []
+    collect_file_symbols = symbols_module.collect_file_symbols
+
+    def collect_and_record(file_path, module_name, is_package):
+        collected.append(module_name)
+        return collect_file_symbols(file_path, module_name, is_package)
+
+    monkeypatch.setattr(symbols_module, "collect_file_symbols", collect_and_record)
+    index_path = project / "cache" / "symbols.pickle"
+    file_paths = sorted(project.rglob("*.py"))
+    first = load_symbol_index(file_paths, index_path)
+    assert len(collected) == 4
+
+    collected.clear()
+    assert load_symbol_index(file_paths, index_path).modules == first.modules
+    assert collected == []
+
+    (project / "app" / "types.py").write_text("Users = list\n")
+    second = load_symbol_index(file_paths, index_path)
+    assert collected == ["app.types"]
+    assert second.modules["app.types"] == ModuleSymbols(aliases={"Users": "list"})
+    assert second.get_module_digest("app.types") != first.get_module_digest("app.types")
+    assert second.get_module_digest("app") == first.get_module_digest("app")
+
+
+def check_cached(file_paths, cache: ResultCache, root: Path):
+    symbols = load_symbol_index(sorted(root.rglob("*.py")))
+    results = list(
+        check_files(file_paths, cache=cache, collect_stats=True, symbols=symbols)
+    )
+    return [
+        (get_wrong_hints(r), r.stats is not None and r.stats.from_cache)
+        for r in results
+    ]
+
+
+def test_results_are_cached_until_a_module_they_use_changes(
+    project: Path, tmp_path: Path
+):
+    write_files(project, {"app/other.py": "import os\n"})
+    cache = ResultCache(tmp_path / "cache")
+    file_path = project / "app" / "service.py"
+    assert check_cached([file_path], cache, project) == [(["group"], False)]
+    assert check_cached([file_path], cache, project) == [(["group"], True)]
+    # Modules the check never looked at do not matter
+    write_files(project, {"app/other.py": "import sys\n"})
+    assert check_cached([file_path], cache, project) == [(["group"], True)]
+    write_files(project, {"app/types.py": "Users = list\n"})
+    assert check_cached([file_path], cache, project) == [(["users", "group"], False)]
+
+
+def test_cached_results_are_not_shared_between_modules(tmp_path: Path):
+    # The same source, where a relative import names a different type
+    views = '''\
+from .models import User
+
+def f(user: User):
+    """Summary.
+
+    Args:
+        user (int): The user.
+    """
+'''
+    root = tmp_path / "project"
+    write_files(
+        root,
+        {
+            "a/__init__.py": "",
+            "a/models.py": "class User:\n    pass\n",
+            "a/views.py": views,
+            "b/__init__.py": "",
+            "b/models.py": "User = int\n",
+            "b/views.py": views,
+        },
+    )
+    cache = ResultCache(tmp_path / "cache")
+    file_paths = [root / "a" / "views.py", root / "b" / "views.py"]
+    assert check_cached(file_paths, cache, root) == [(["user"], False), ([], False)]
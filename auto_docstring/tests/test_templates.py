@@ -0,0 +1,100 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from auto_docstring import (
+    FunctionArgument,
+    FunctionParts,
+    check_docstring,
+    extract_docstring_parts,
+    generate_docstring,
+    generate_docstrings,
+    parse_args_from_docstring,
+)
+from auto_docstring.templates import TEMPLATES, compile_template, get_renderer
+
+functions = [
+    FunctionParts(
+        "f", None, [FunctionArgument("x", "int"), FunctionArgument("y", "str")], "bool"
+    ),
+    FunctionParts("g", None, [FunctionArgument("x", "int")], None),
+    FunctionParts("h", None, [], "int"),
+    FunctionParts("i", None, [], None),
+]
+
+expected_docstrings = {
+    "numpy": [
+        "_function_summary_\n\nParameters\n----------\n"
+        "x : int\n    _argument_description_\ny : str\n    _argument_description_\n\n"
+        "Returns\n-------\nbool\n    _return_description_",
+        "_function_summary_\n\nParameters\n----------\n"
+        "x : int\n    _argument_description_",
+        "_function_summary_\n\nReturns\n-------\nint\n    _return_description_",
+        "_function_summary_",
+    ],
+    "sphinx": [
+        "_function_summary_\n\n"
+        ":param x: _argument_description_\n:type x: int\n"
+        ":param y: _argument_description_\n:type y: str\n"
+        ":returns: _return_description_\n:rtype: bool",
+        "_function_summary_\n\n:param x: _argument_description_\n:type x: int",
+        "_function_summary_\n\n:returns: _return_description_\n:rtype: int",
+        "_function_summary_",
+    ],
+}
+
+
+@pytest.mark.parametrize("style", sorted(expected_docstrings))
+def test_generate_docstrings(style: str):
+    assert generate_docstrings(functions, style) == expected_docstrings[style]
+
+
+@pytest.mark.parametrize("style", sorted(TEMPLATES))
+def test_generate_docstrings_matches_generate_docstring(style: str):
+    assert generate_docstrings(functions, style) == [
+        generate_docstring(f, style) for f in functions
+    ]
+
+
+def test_google_docstrings_parse():
+    parts = extract_docstring_parts(generate_docstring(functions[0]))
+    assert parts.args is not None
+    assert [(a.name, a.type_hint) for a in parse_args_from_docstring(parts.args)] == [
+        ("x", "int"),
+        ("y", "str"),
+    ]
+    assert parts.returns == "    bool: _return_description_"
+
+
+@pytest.mark.parametrize(
+    "template", ["{name.__class__}", "{type_hint!r}", "{name:>10}", "{other}"]
+)
+def test_compile_template_only_allows_plain_fields(template: str):
+    with pytest.raises(ValueError):
+        compile_template(template, ("name", "type_hint"))
+
+
+def test_compile_template():
+    render = compile_template("{{{name}}} '\"\\ {type_hint}", ("name", "type_hint"))
+    assert render("x", "int") == "{x} '\"\\ int"
+
+
+@pytest.mark.parametrize("style", sorted(TEMPLATES))
+def test_unannotated_arguments_have_no_type(style: str):
+    function = FunctionParts(
+        "f", None, [FunctionArgument("x", "int"), FunctionArgument("c", None)], None
+    )
+    docstring = generate_docstring(function, style)
+    assert "None" not in docstring
+    assert (
+        check_docstring(
+            Path("test.py"), replace(function, docstring=docstring), None, style
+        )
+        == []
+    )
+
+
+def test_unknown_style():
+    with pytest.raises(ValueError):
+        get_renderer("unknown")
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from auto_docstring import (
+    check_docstring,
+    extract_parts_of_function_def,
+    parse_python_code,
+)
+from auto_docstring.docstring_errors import IncorrectArgumentTypehintError
+from auto_docstring.tests.utils import get_first_statement_as_expr
+from auto_docstring.type_hints import normalize_type_expression, normalize_type_hint
+
+normalize_type_hint_cases = [
+    ("str", "str"),
+    ("Optional[Union[str,int]]", "Optional[Union[str, int]]"),
+    ("  Dict[ str ,  List[int] ] ", "Dict[str, List[int]]"),
+    ("str | None", "Optional[str]"),
+    ("None | str | int", "Optional[Union[str, int]]"),
+    ("Union[int, None]", "Optional[int]"),
+    ("Union[int, Union[str, int]]", "Union[int, str]"),
+    ("Optional[Optional[int]]", "Optional[int]"),
+    ("typing.Optional[str]", "Optional[str]"),
+    ("np.ndarray", "np.ndarray"),
+    ("'MyType'", "MyType"),
+    ("List['Optional[int]']", "List[Optional[int]]"),
+    ("Literal['a', 'b']", "Literal['a', 'b']"),
+    ("Callable[[int,str], bool]", "Callable[[int, str], bool]"),
+    ("Tuple[int, ...]", "Tuple[int, ...]"),
+    ("None", "None"),
+    ("not  valid (", "not valid ("),
+]
+
+
+@pytest.mark.parametrize("type_hint,expected_output", normalize_type_hint_cases)
+def test_normalize_type_hint(type_hint: str, expected_output: str):
+    assert normalize_type_hint(type_hint) == expected_output
+
+
+@pytest.mark.parametrize("type_hint,expected_output", normalize_type_hint_cases[:-1])
+def test_normalize_type_expression_matches_text(type_hint: str, expected_output: str):
+    expression = get_first_statement_as_expr(type_hint.strip())
+    assert normalize_type_expression(expression) == expected_output
+
+
+def test_normalize_type_hint_is_interned_and_memoized():
+    normalize_type_hint.cache_clear()
+    first = normalize_type_hint("Optional[Union[str,int]]")
+    second = normalize_type_hint("Optional[Union[str, int]]")
+    assert first is second
+    normalize_type_hint("Optional[Union[str,int]]")
+    assert normalize_type_hint.cache_info().hits == 1
+
+
+def check_code(code: str):
+    function_def = parse_python_code(code).body[0]  # type: ignore
+    return check_docstring(Path("test.py"), extract_parts_of_function_def(function_def))
+
+
+def test_check_docstring_compares_normalized_hints():
+    code = '''
+def f(x: Optional[Union[str, int]], y: "np.ndarray") -> None:
+    """Summary.
+
+    Args:
+        x (str|int|None): An argument.
+        y (np.ndarray): Another argument.
+    """
+'''
+    assert check_code(code) == []
+
+
+def test_check_docstring_reports_different_hints():
+    code = '''
+def f(x: Optional[str]):
+    """Summary.
+
+    Args:
+        x (str): An argument.
+    """
+'''
+    errors = check_code(code)
+    assert [type(e) for e in errors] == [IncorrectArgumentTypehintError]
@@ -0,0 +1,107 @@
+import ast
+import sys
+from functools import lru_cache
+from typing import List
+
+# Distinct hints are few even in large projects, this bounds memory on pathological input
+TYPE_HINT_CACHE_SIZE = 1 << 16
+UNION_NAMES = frozenset({"Union"})
+OPTIONAL_NAMES = frozenset({"Optional"})
+# Subscripts whose arguments are values rather than types
+LITERAL_NAMES = frozenset({"Literal"})
+
+
+def get_subscript_name(expression: ast.expr) -> str:
+    if isinstance(expression, ast.Name):
+        return expression.id
+    if isinstance(expression, ast.Attribute):
+        return expression.attr
+    return ""
+
+
+def get_slice_elements(expression: ast.Subscript) -> List[ast.expr]:
+    if isinstance(expression.slice, ast.Tuple):
+        return expression.slice.elts
+    return [expression.slice]
+
+
+def collect_union_members(expression: ast.expr, members: List[str]) -> None:
+    # Flattens `Union[...]`, `Optional[...]` and `X | Y` into one list of members
+    if isinstance(expression, ast.BinOp) and isinstance(expression.op, ast.BitOr):
+        collect_union_members(expression.left, members)
+        collect_union_members(expression.right, members)
+    elif isinstance(expression, ast.Subscript) and (
+        get_subscript_name(expression.value) in UNION_NAMES | OPTIONAL_NAMES
+    ):
+        for element in get_slice_elements(expression):
+            collect_union_members(element, members)
+        if get_subscript_name(expression.value) in OPTIONAL_NAMES:
+            members.append("None")
+    else:
+        member = render_type_expression(expression)
+        if member not in members:
+            members.append(member)
+
+
+def render_union(expression: ast.expr) -> str:
+    members: List[str] = []
+    collect_union_members(expression, members)
+    others = list(dict.fromkeys(m for m in members if m != "None"))
+    if len(others) == 0:
+        return "None"
+    union = others[0] if len(others) == 1 else f"Union[{', '.join(others)}]"
+    return f"Optional[{union}]" if "None" in members else union
+
+
+def render_type_expression(expression: ast.expr) -> str:
+    if isinstance(expression, ast.Name):
+        return expression.id
+    elif isinstance(expression, ast.Attribute):
+        return render_type_expression(expression.value) + "." + expression.attr
+    elif isinstance(expression, ast.Constant):
+        if isinstance(expression.value, str):
+            # A forward reference like `"MyType"`
+            return normalize_type_hint(expression.value)
+        if expression.value is Ellipsis:
+            return "..."
+        return repr(expression.value)
+    elif isinstance(expression, ast.BinOp) and isinstance(expression.op, ast.BitOr):
+        return render_union(expression)
+    elif isinstance(expression, ast.Subscript):
+        name = get_subscript_name(expression.value)
+        if name in UNION_NAMES | OPTIONAL_NAMES:
+            return render_union(expression)
+        elements = get_slice_elements(expression)
+        if name in LITERAL_NAMES:
+            arguments = [ast.unparse(e) for e in elements]
+        else:
+            arguments = [render_type_expression(e) for e in elements]
+        return f"{render_type_expression(expression.value)}[{', '.join(arguments)}]"
+    elif isinstance(expression, ast.Tuple):
+        return ", ".join(render_type_expression(e) for e in expression.elts)
+    elif isinstance(expression, ast.List):
+        # The argument list of `Callable[[int, str], bool]`
+        return "[" + ", ".join(render_type_expression(e) for e in expression.elts) + "]"
+    else:
+        return ast.unparse(expression)
+
+
+@lru_cache(maxsize=TYPE_HINT_CACHE_SIZE)
+def normalize_type_hint(source: str) -> str:
+    # The canonical, interned form of a hint written as text, each distinct text is
+    # only parsed once
+    try:
+        expression = ast.parse(source.strip(), mode="eval").body
+    except SyntaxError:
+        # Not valid Python, so only the whitespace can be normalised
+        return sys.intern(" ".join(source.split()))
+    return sys.intern(render_type_expression(expression))
+
+
+def normalize_type_expression(expression: ast.expr) -> str:
+    # Annotations are already parsed along with the module, so only need rendering
+    if not isinstance(expression, ast.expr):
+        raise ValueError(f"did not recognise type {type(expression)}.")
+    if isinstance(expression, ast.Name):
+        return sys.intern(expression.id)
+    return sys.intern(render_type_expression(expression))
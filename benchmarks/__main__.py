@@ -0,0 +1,87 @@
+import argparse
+import json
+import platform
+import subprocess
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from benchmarks.corpus import CORPORA, generate_corpus
+from benchmarks.stages import time_stages
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    # Ratios above 1 mean this run is slower than the baseline
+    print(f"{'corpus':<20} {'stage':<30} {'seconds':>9} {'ratio':>7}")
+    for corpus_name, corpus in results["corpora"].items():
+        baseline_stages = baseline["corpora"].get(corpus_name, {}).get("stages", {})
+        for stage, seconds in corpus["stages"].items():
+            baseline_seconds = baseline_stages.get(stage)
+            ratio = (
+                f"{seconds / baseline_seconds:>7.2f}"
+                if baseline_seconds
+                else f"{'-':>7}"
+            )
+            print(f"{corpus_name:<20} {stage:<30} {seconds:>9.4f} {ratio}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time every pipeline stage on reproducible synthetic corpora."
+    )
+    parser.add_argument("--corpus", choices=sorted(CORPORA), action="append")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply the number of modules in each corpus, for quick runs.",
+    )
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument(
+        "--compare", type=Path, help="Results JSON of an earlier run to compare to."
+    )
+    arguments = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": arguments.seed,
+        "corpora": {},
+    }
+    for corpus_name in arguments.corpus or sorted(CORPORA):
+        spec = CORPORA[corpus_name]
+        spec = replace(spec, n_modules=max(1, round(spec.n_modules * arguments.scale)))
+        modules = generate_corpus(spec, arguments.seed)
+        results["corpora"][corpus_name] = {
+            "spec": asdict(spec),
+            "bytes": sum(len(m.encode()) for m in modules),
+            "stages": time_stages(modules, arguments.repeat),
+        }
+
+    if arguments.output is not None:
+        arguments.output.write_text(json.dumps(results, indent=2) + "\n")
+    baseline = (
+        json.loads(arguments.compare.read_text())
+        if arguments.compare is not None
+        else {"corpora": {}}
+    )
+    print_comparison(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+TYPE_NAMES = ["int", "str", "float", "bool", "bytes", "MyType", "OtherType"]
+GENERIC_NAMES = ["List", "Optional", "Set", "Sequence"]
+WORDS = (
+    "the a value of for to is in and with this that each item returned given".split()
+)
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    n_modules: int
+    n_functions: int
+    n_arguments: int
+    type_hint_depth: int
+    n_description_lines: int
+    # Statements after the docstring, most real functions have more than `pass`
+    n_body_lines: int = 0
+
+
+# Each corpus stresses a different dimension of the pipeline
+CORPORA: Dict[str, CorpusSpec] = {
+    "many_small_modules": CorpusSpec(
+        n_modules=500,
+        n_functions=5,
+        n_arguments=2,
+        type_hint_depth=1,
+        n_description_lines=2,
+    ),
+    "huge_modules": CorpusSpec(
+        n_modules=3,
+        n_functions=2000,
+        n_arguments=3,
+        type_hint_depth=2,
+        n_description_lines=3,
+    ),
+    "deep_type_hints": CorpusSpec(
+        n_modules=20,
+        n_functions=50,
+        n_arguments=4,
+        type_hint_depth=12,
+        n_description_lines=1,
+    ),
+    "long_docstrings": CorpusSpec(
+        n_modules=20,
+        n_functions=20,
+        n_arguments=6,
+        type_hint_depth=2,
+        n_description_lines=400,
+    ),
+    "realistic_bodies": CorpusSpec(
+        n_modules=50,
+        n_functions=40,
+        n_arguments=3,
+        type_hint_depth=1,
+        n_description_lines=2,
+        n_body_lines=25,
+    ),
+}
+
+
+def generate_type_hint(rng: random.Random, depth: int) -> str:
+    if depth <= 0:
+        return rng.choice(TYPE_NAMES)
+    if rng.random() < 0.25:
+        key = rng.choice(TYPE_NAMES)
+        return f"Dict[{key}, {generate_type_hint(rng, depth - 1)}]"
+    if rng.random() < 0.25:
+        left = generate_type_hint(rng, depth - 1)
+        return f"Union[{left}, {rng.choice(TYPE_NAMES)}]"
+    return f"{rng.choice(GENERIC_NAMES)}[{generate_type_hint(rng, depth - 1)}]"
+
+
+def generate_sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(4, 12))]
+    return " ".join(words).capitalize() + "."
+
+
+def generate_body(rng: random.Random, n_lines: int, n_arguments: int) -> List[str]:
+    # Blocks of three statements, then a return
+    lines = []
+    n_blocks = max(1, n_lines // 3)
+    for i in range(n_blocks):
+        argument = f"argument_{rng.randrange(max(1, n_arguments))}"
+        lines.extend(
+            [
+                f"    value_{i} = [item for item in range({i}) if item % {i % 5 + 2}]",
+                f"    if {argument} is not None and len(value_{i}) > {i % 7}:",
+                f'        value_{i} = call_{i}({argument}, key="{rng.choice(WORDS)}", '
+                f"extra={{'a': {i}, 'b': ({i}, {i + 1})}})",
+            ]
+        )
+    lines.append(f"    return value_{n_blocks - 1}")
+    return lines
+
+
+def generate_function(rng: random.Random, name: str, spec: CorpusSpec) -> str:
+    arguments = [
+        (f"argument_{i}", generate_type_hint(rng, rng.randint(0, spec.type_hint_depth)))
+        for i in range(spec.n_arguments)
+    ]
+    return_type_hint = generate_type_hint(rng, spec.type_hint_depth)
+    signature = ", ".join(f"{a}: {t}" for a, t in arguments)
+    lines = [
+        f"def {name}({signature}) -> {return_type_hint}:",
+        '    """',
+        f"    {generate_sentence(rng)}",
+        "",
+    ]
+    lines.extend(
+        f"    {generate_sentence(rng)}" for _ in range(spec.n_description_lines)
+    )
+    lines.extend(["", "    Args:"])
+    for argument_name, type_hint in arguments:
+        lines.append(f"        {argument_name} ({type_hint}): {generate_sentence(rng)}")
+        lines.append(f"            {generate_sentence(rng)}")
+    lines.extend(
+        [
+            "",
+            "    Returns:",
+            f"        {return_type_hint}: {generate_sentence(rng)}",
+            '    """',
+        ]
+    )
+    if spec.n_body_lines > 0:
+        lines.extend(generate_body(rng, spec.n_body_lines, spec.n_arguments))
+    else:
+        lines.append("    pass")
+    lines.extend(["", ""])
+    return "\n".join(lines)
+
+
+def generate_module(rng: random.Random, spec: CorpusSpec) -> str:
+    return "\n".join(
+        generate_function(rng, f"function_{i}", spec) for i in range(spec.n_functions)
+    )
+
+
+def generate_corpus(spec: CorpusSpec, seed: int = 0) -> List[str]:
+    # The same spec and seed always give the same modules
+    rng = random.Random(seed)
+    return [generate_module(rng, spec) for _ in range(spec.n_modules)]
+
+
+def write_corpus(directory: Path, modules: List[str]) -> List[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    file_paths = [directory / f"module_{i}.py" for i in range(len(modules))]
+    for file_path, module in zip(file_paths, modules):
+        file_path.write_text(module)
+    return file_paths
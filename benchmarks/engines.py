@@ -0,0 +1,76 @@
+import argparse
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List
+
+from auto_docstring import ScopeRules, parse_python_code
+from auto_docstring.engine import ENGINES
+from benchmarks.corpus import CORPORA, generate_corpus
+from benchmarks.stages import time_best
+
+
+def time_engines(modules: List[bytes], repeat: int) -> Dict[str, float]:
+    rules = ScopeRules()
+    return {
+        name: time_best(
+            lambda: [list(engine(m, rules, None, None, None)) for m in modules], repeat
+        )
+        for name, engine in ENGINES.items()
+    }
+
+
+def read_modules(directory: Path) -> List[bytes]:
+    # Real trees contain test data that is not valid Python
+    modules = []
+    for file_path in sorted(directory.rglob("*.py")):
+        source = file_path.read_bytes()
+        try:
+            parse_python_code(source)
+        except (SyntaxError, ValueError):
+            continue
+        modules.append(source)
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the front ends that find functions in a module."
+    )
+    parser.add_argument("--corpus", choices=sorted(CORPORA), action="append")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument(
+        "--path",
+        type=Path,
+        action="append",
+        default=[],
+        help="Also time the `.py` files under a directory of real code.",
+    )
+    arguments = parser.parse_args()
+
+    inputs: Dict[str, List[bytes]] = {}
+    for corpus_name in arguments.corpus or sorted(CORPORA):
+        spec = CORPORA[corpus_name]
+        spec = replace(spec, n_modules=max(1, round(spec.n_modules * arguments.scale)))
+        inputs[corpus_name] = [
+            m.encode() for m in generate_corpus(spec, arguments.seed)
+        ]
+    for path in arguments.path:
+        inputs[str(path)] = read_modules(path)
+
+    names = list(ENGINES)
+    print(f"{'input':<30}" + "".join(f" {n:>9}" for n in names) + f" {'speedup':>8}")
+    for input_name, modules in inputs.items():
+        timings = time_engines(modules, arguments.repeat)
+        # How much faster the last engine is than the first
+        speedup = timings[names[0]] / timings[names[-1]]
+        print(
+            f"{input_name:<30}"
+            + "".join(f" {timings[n]:>9.3f}" for n in names)
+            + f" {speedup:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from auto_docstring.engine import check_files
+from benchmarks.corpus import CORPORA, generate_corpus, write_corpus
+
+
+def time_run(file_paths: List[Path], jobs: int) -> float:
+    start = time.perf_counter()
+    for _ in check_files(file_paths, jobs=jobs):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure how `--jobs` scales on a synthetic corpus."
+    )
+    parser.add_argument(
+        "--corpus", choices=sorted(CORPORA), default="many_small_modules"
+    )
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        modules = generate_corpus(CORPORA[arguments.corpus])
+        file_paths = write_corpus(Path(directory), modules)
+        baseline = time_run(file_paths, jobs=1)
+        print(f"{'jobs':>4} {'seconds':>8} {'speedup':>8}")
+        print(f"{1:>4} {baseline:>8.3f} {1.0:>8.2f}")
+        for jobs in range(2, arguments.max_jobs + 1):
+            seconds = time_run(file_paths, jobs=jobs)
+            print(f"{jobs:>4} {seconds:>8.3f} {baseline / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import gc
+import re
+import tempfile
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple, TypeVar
+
+from auto_docstring import collect_functions, parse_python_code
+from auto_docstring.engine import FileResult, check_files, check_source
+from auto_docstring.streaming import iter_file_errors
+from benchmarks.corpus import CORPORA, generate_corpus, write_corpus
+
+T = TypeVar("T")
+
+DOCSTRING_PATTERN = re.compile(r'^    """.*?"""\n', re.MULTILINE | re.DOTALL)
+
+
+def measure_retained(build: Callable[[], T]) -> Tuple[T, int]:
+    # Bytes still allocated once `build` returns, i.e. the cost of keeping its result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained
+
+
+def measure_peak(run: Callable[[], object]) -> int:
+    # Most bytes allocated at any one time while `run` works
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def drain(iterator: Iterator[object]) -> None:
+    for _ in iterator:
+        pass
+
+
+def check_modules(file_paths: List[Path], modules: List[bytes]) -> List[FileResult]:
+    return [check_source(p, m) for p, m in zip(file_paths, modules)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the memory kept by records and the peak of a whole run."
+    )
+    parser.add_argument("--corpus", choices=sorted(CORPORA), action="append")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.0)
+    arguments = parser.parse_args()
+
+    print(
+        f"{'corpus':<20} {'functions':>9} {'bytes/function':>14}"
+        f" {'errors':>7} {'bytes/error':>11}"
+        f" {'list KiB':>11} {'stream KiB':>11}"
+    )
+    for corpus_name in arguments.corpus or sorted(CORPORA):
+        spec = CORPORA[corpus_name]
+        spec = replace(spec, n_modules=max(1, round(spec.n_modules * arguments.scale)))
+        modules = generate_corpus(spec, arguments.seed)
+        file_paths = [Path(f"module_{i}.py") for i in range(len(modules))]
+
+        # Trees are built beforehand, so only the extracted records are counted
+        trees = [parse_python_code(m) for m in modules]
+        functions, function_bytes = measure_retained(
+            lambda trees=trees: [
+                f for t in trees for f in collect_functions(t).functions
+            ]
+        )
+        # The lambda holds its own reference, which goes away with it
+        del trees
+
+        # Without docstrings every function reports exactly one error
+        undocumented = [DOCSTRING_PATTERN.sub("", m).encode() for m in modules]
+        results, result_bytes = measure_retained(
+            lambda: check_modules(file_paths, undocumented)
+        )
+        n_errors = sum(len(f.errors) for r in results for f in r.functions)
+
+        # Reading from disk, so the corpus itself is not counted
+        with tempfile.TemporaryDirectory() as directory:
+            undocumented_paths = write_corpus(
+                Path(directory), [m.decode() for m in undocumented]
+            )
+            list_peak = measure_peak(lambda: list(check_files(undocumented_paths)))
+            stream_peak = measure_peak(
+                lambda: drain(iter_file_errors(undocumented_paths))
+            )
+
+        print(
+            f"{corpus_name:<20} {len(functions):>9}"
+            f" {function_bytes / max(1, len(functions)):>14.1f}"
+            f" {n_errors:>7} {result_bytes / max(1, n_errors):>11.1f}"
+            f" {list_peak / 1024:>11.0f} {stream_peak / 1024:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
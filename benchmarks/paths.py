@@ -0,0 +1,76 @@
+import argparse
+import fnmatch
+import os
+import random
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from auto_docstring.discovery import PathClassifier
+from benchmarks.stages import time_best
+
+ROOT = os.path.abspath("project")
+
+
+def generate_paths(n_paths: int, seed: int) -> List[str]:
+    random.seed(seed)
+    directories = ["src", "tests", "build", "docs", "scripts", "vendor", "gen"]
+    return [
+        "/".join(
+            [ROOT]
+            + random.choices(directories, k=random.randint(1, 4))
+            + [f"module_{i}{random.choice(['', '_pb2', '_test'])}.py"]
+        )
+        for i in range(n_paths)
+    ]
+
+
+def generate_patterns(n_patterns: int) -> List[str]:
+    patterns = ["build/", "vendor/", "*_pb2.py"]
+    return patterns + [f"gen/module_{i}.py" for i in range(n_patterns - len(patterns))]
+
+
+def classify_with_fnmatch(
+    path: str, exclude: Sequence[str], overrides: Sequence[str]
+) -> Optional[int]:
+    # What wrapper scripts do, one pattern after the other
+    relative_path = os.path.relpath(path, ROOT)
+    if any(
+        fnmatch.fnmatch(relative_path, p) or fnmatch.fnmatch(relative_path, f"*/{p}*")
+        for p in exclude
+    ):
+        return None
+    return next((1 for p in overrides if fnmatch.fnmatch(relative_path, f"*{p}*")), 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare pattern-by-pattern path filtering with one compiled matcher."
+    )
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--patterns", type=int, action="append")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    paths = generate_paths(arguments.paths, arguments.seed)
+    overrides = ["tests/"]
+    print(f"{len(paths)} paths")
+    print(f"{'patterns':>8} {'fnmatch us':>11} {'compiled us':>12} {'speedup':>8}")
+    for n_patterns in arguments.patterns or [3, 30, 300]:
+        exclude = generate_patterns(n_patterns)
+        classifier = PathClassifier(Path(ROOT), (), exclude, [overrides])
+        by_pattern = time_best(
+            lambda: [classify_with_fnmatch(p, exclude, overrides) for p in paths],
+            arguments.repeat,
+        )
+        compiled = time_best(
+            lambda: [classifier.classify(p) for p in paths], arguments.repeat
+        )
+        print(
+            f"{n_patterns:>8} {by_pattern / len(paths) * 1e6:>11.2f}"
+            f" {compiled / len(paths) * 1e6:>12.2f} {by_pattern / compiled:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from auto_docstring import engine
+from auto_docstring.engine import check_file, check_files
+from benchmarks.corpus import CORPORA, generate_corpus, write_corpus
+from benchmarks.stages import time_best
+
+
+def add_read_latency(seconds: float) -> Callable[[Path], Optional[bytes]]:
+    # Stands in for a network filesystem, where every read waits for a round trip
+    read_checkable_source = engine.read_checkable_source
+
+    def read_slowly(file_path: Path) -> Optional[bytes]:
+        time.sleep(seconds)
+        return read_checkable_source(file_path)
+
+    return read_slowly
+
+
+def check_in_order(file_paths: List[Path]) -> None:
+    for file_path in file_paths:
+        check_file(file_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare reading in the checking loop with the read-ahead pipeline."
+    )
+    parser.add_argument(
+        "--corpus", choices=sorted(CORPORA), default="many_small_modules"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        action="append",
+        help="Simulated delay of every read in milliseconds, can be repeated.",
+    )
+    arguments = parser.parse_args()
+
+    read_checkable_source = engine.read_checkable_source
+    with tempfile.TemporaryDirectory() as directory:
+        modules = generate_corpus(CORPORA[arguments.corpus])
+        file_paths = write_corpus(Path(directory), modules)
+        print(f"{'latency ms':>10} {'in loop':>8} {'pipeline':>8} {'speedup':>8}")
+        for latency_ms in arguments.latency_ms or [0.0, 0.5, 2.0]:
+            engine.read_checkable_source = add_read_latency(latency_ms / 1000)
+            try:
+                in_loop = time_best(
+                    lambda: check_in_order(file_paths), arguments.repeat
+                )
+                pipeline = time_best(
+                    lambda: list(check_files(file_paths)), arguments.repeat
+                )
+            finally:
+                engine.read_checkable_source = read_checkable_source
+            print(
+                f"{latency_ms:>10.1f} {in_loop:>8.3f} {pipeline:>8.3f}"
+                f" {in_loop / pipeline:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
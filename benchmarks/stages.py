@@ -0,0 +1,70 @@
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from auto_docstring import (
+    FunctionParts,
+    check_docstring,
+    extract_docstring_parts,
+    extract_parts_of_function_def,
+    find_functions_in_ast,
+    generate_docstring,
+    parse_args_from_docstring,
+    parse_python_code,
+)
+from auto_docstring.engine import check_files
+from benchmarks.corpus import write_corpus
+
+FILE_PATH = Path("benchmark.py")
+
+
+def time_best(function: Callable[[], object], repeat: int) -> float:
+    # The minimum is the least noisy estimate of the cost on an idle machine
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def time_stages(modules: List[str], repeat: int) -> Dict[str, float]:
+    # Inputs for every stage are prepared up front, so each timing covers one stage
+    trees = [parse_python_code(m) for m in modules]
+    function_defs = [f for t in trees for f in find_functions_in_ast(t)]
+    functions: List[FunctionParts] = [
+        extract_parts_of_function_def(f) for f in function_defs
+    ]
+    docstrings = [f.docstring for f in functions if f.docstring is not None]
+    args_sections = [
+        p.args for p in map(extract_docstring_parts, docstrings) if p.args is not None
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_paths = write_corpus(Path(directory), modules)
+        return {
+            "parse_python_code": time_best(
+                lambda: [parse_python_code(m) for m in modules], repeat
+            ),
+            "find_functions_in_ast": time_best(
+                lambda: [find_functions_in_ast(t) for t in trees], repeat
+            ),
+            "extract_parts_of_function_def": time_best(
+                lambda: [extract_parts_of_function_def(f) for f in function_defs],
+                repeat,
+            ),
+            "extract_docstring_parts": time_best(
+                lambda: [extract_docstring_parts(d) for d in docstrings], repeat
+            ),
+            "parse_args_from_docstring": time_best(
+                lambda: [parse_args_from_docstring(a) for a in args_sections], repeat
+            ),
+            "check_docstring": time_best(
+                lambda: [check_docstring(FILE_PATH, f) for f in functions], repeat
+            ),
+            "generate_docstring": time_best(
+                lambda: [generate_docstring(f) for f in functions], repeat
+            ),
+            "end_to_end": time_best(lambda: list(check_files(file_paths)), repeat),
+        }
@@ -0,0 +1,90 @@
+import argparse
+from dataclasses import replace
+from typing import List
+
+from auto_docstring import (
+    FunctionParts,
+    collect_functions,
+    generate_docstring,
+    generate_docstring_argument,
+    generate_docstrings,
+    get_documented_arguments,
+    indent,
+    parse_python_code,
+)
+from auto_docstring.templates import TEMPLATES
+from benchmarks.corpus import CORPORA, generate_corpus
+from benchmarks.stages import time_best
+
+
+def generate_docstring_with_joins(function: FunctionParts) -> str:
+    # The implementation before templates, kept as the reference point
+    docstring_parts = ["_function_summary_"]
+    arguments = get_documented_arguments(function)
+    if len(arguments) > 0:
+        docstring_parts.append(
+            "\n".join(
+                ["Args:"]
+                + [indent(generate_docstring_argument(a), 1) for a in arguments]
+            )
+        )
+    if function.return_type_hint is not None:
+        docstring_parts.append(
+            "\n".join(
+                [
+                    "Returns:",
+                    indent(f"{function.return_type_hint}: _return_description_", 1),
+                ]
+            )
+        )
+    return "\n\n".join(docstring_parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare compiled docstring templates with string joins."
+    )
+    parser.add_argument(
+        "--corpus", choices=sorted(CORPORA), default="many_small_modules"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    arguments = parser.parse_args()
+
+    spec = CORPORA[arguments.corpus]
+    spec = replace(spec, n_modules=max(1, round(spec.n_modules * arguments.scale)))
+    functions: List[FunctionParts] = [
+        f
+        for m in generate_corpus(spec, arguments.seed)
+        for f in collect_functions(parse_python_code(m)).functions
+    ]
+    assert [generate_docstring_with_joins(f) for f in functions] == generate_docstrings(
+        functions
+    )
+
+    timings = {
+        "joins": time_best(
+            lambda: [generate_docstring_with_joins(f) for f in functions],
+            arguments.repeat,
+        ),
+        "generate_docstring": time_best(
+            lambda: [generate_docstring(f) for f in functions], arguments.repeat
+        ),
+    }
+    for style in TEMPLATES:
+        timings[f"generate_docstrings[{style}]"] = time_best(
+            lambda: generate_docstrings(functions, style), arguments.repeat
+        )
+
+    print(f"{len(functions)} functions")
+    print(f"{'implementation':<30} {'us/function':>12} {'speedup':>8}")
+    for name, seconds in timings.items():
+        print(
+            f"{name:<30} {seconds / len(functions) * 1e6:>12.2f}"
+            f" {timings['joins'] / seconds:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()